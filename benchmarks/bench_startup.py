@@ -0,0 +1,36 @@
+"""
+Measure how long the rxnrlx command line entry point takes to start up.
+
+    python benchmarks/bench_startup.py [num_runs]
+
+Every subcommand is timed with --help (which parses arguments without running any job)
+alongside the bare interpreter and an import of pymatgen for reference.
+"""
+import statistics, subprocess, sys, time
+
+COMMANDS = {
+    "python (bare interpreter)": [sys.executable, "-c", "pass"],
+    "rxnrlx --help": [sys.executable, "-m", "rxnrlx", "--help"],
+    "rxnrlx status --help": [sys.executable, "-m", "rxnrlx", "status", "--help"],
+    "rxnrlx harvest --help": [sys.executable, "-m", "rxnrlx", "harvest", "--help"],
+    "import pymatgen Molecule": [sys.executable, "-c", "from pymatgen.core.structure import Molecule"],
+}
+
+
+def time_command(command:list, num_runs:int) -> list[float]:
+    """ Run a command several times and return the wall time of each run """
+    durations = list()
+    for _ in range(num_runs):
+        start_time = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        durations.append(time.perf_counter() - start_time)
+    return durations
+
+
+if __name__ == "__main__":
+    num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print(f"{'command':<30s} {'median (ms)':>12s} {'min (ms)':>10s}")
+    for name, command in COMMANDS.items():
+        durations = time_command(command, num_runs)
+        print(f"{name:<30s} {1000*statistics.median(durations):>12.1f} {1000*min(durations):>10.1f}")
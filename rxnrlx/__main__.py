@@ -0,0 +1,3 @@
+from rxnrlx.cli import main
+
+main()
@@ -0,0 +1,123 @@
+"""
+Compress the Jaguar outputs of finished job folders in a campaign
+
+Every output file (*.out and the failed attempts *.out.N kept by the retry policy) of a job folder
+without running jobs is compressed in place with gzip or zstd. With pack=True, the compressed
+outputs of each reaction are moved into a single file (rxnrlx_outputs.tar) in the reaction folder
+so the parallel filesystem holds one file per reaction instead of dozens.
+
+The small files the other commands need (energy.yaml, XYZ structures, inputs) are left as they
+are, and all readers in rxnrlx read archived outputs transparently (see rxnrlx.common.compression).
+"""
+import gzip, os, re, shutil, tarfile
+
+from rxnrlx.common.compression import PACK_FILENAME, zstd_module
+from rxnrlx.status import job_state
+
+# Outputs and the failed attempts kept by the retry logic ({name}.out.1, ...), but not files
+# that were already compressed ({name}.out.1.gz)
+ARCHIVED_PATTERN = re.compile(r"\.out(\.\d+)?$")
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 10}
+
+
+def compress_file(path:str, method:str="gzip", level:int=None) -> str:
+    """
+    Compress a file in place (path -> path.gz or path.zst), keeping its modification time
+
+    Output:
+    - (str): Path of the compressed file
+    """
+    level = level if level is not None else DEFAULT_LEVELS[method]
+    compressed_path = path + COMPRESSION_SUFFIXES[method]
+
+    with open(path, "rb") as f_in, open(compressed_path + ".tmp", "wb") as f_out:
+        if method == "gzip":
+            with gzip.GzipFile(filename=os.path.basename(path), mode="wb", fileobj=f_out, compresslevel=level) as writer:
+                shutil.copyfileobj(f_in, writer)
+        else:
+            with zstd_module().ZstdCompressor(level=level).stream_writer(f_out, closefd=False) as writer:
+                shutil.copyfileobj(f_in, writer)
+
+    shutil.copystat(path, compressed_path + ".tmp")
+    os.replace(compressed_path + ".tmp", compressed_path)
+    os.remove(path)
+
+    return compressed_path
+
+
+def finished_outputs(folder:str, filenames:list[str]) -> list[str]:
+    """
+    Outputs of a job folder that can be archived, or nothing if one of its jobs is still running
+    """
+    outputs = sorted(
+        filename for filename in filenames
+        if ARCHIVED_PATTERN.search(filename)
+    )
+    for filename in outputs:
+        if filename.endswith(".out") and job_state(os.path.join(folder, filename)) == "running":
+            return []
+
+    return outputs
+
+
+def archive_reaction(reaction_folder:str, method:str="gzip", level:int=None, pack:bool=False) -> dict:
+    """
+    Compress (and optionally pack) the outputs of every finished job folder of a reaction
+
+    Output:
+    - (dict): Number of archived files and their total size before and after compression (bytes)
+    """
+    summary = {"files": 0, "original_size": 0, "archived_size": 0}
+    compressed = list()
+
+    for dirpath, _, filenames in os.walk(reaction_folder):
+        for filename in finished_outputs(dirpath, filenames):
+            path = os.path.join(dirpath, filename)
+            summary["original_size"] += os.path.getsize(path)
+            compressed.append(compress_file(path, method, level))
+            summary["archived_size"] += os.path.getsize(compressed[-1])
+            summary["files"] += 1
+
+    if pack and compressed:
+        # appending keeps the outputs packed by a previous run of the archive command
+        with tarfile.open(os.path.join(reaction_folder, PACK_FILENAME), "a:") as tar:
+            for path in compressed:
+                tar.add(path, arcname=os.path.relpath(path, reaction_folder))
+        for path in compressed:
+            os.remove(path)
+
+    return summary
+
+
+def archive(campaign_root:str, method:str="gzip", level:int=None, pack:bool=False) -> dict:
+    """
+    Archive the finished job folders of every reaction in a campaign folder
+
+    Inputs:
+    - campaign_root (str): Folder holding one subfolder per reaction (the ts2rxn job folders)
+    - method (str): Compression method, "gzip" or "zstd" (requires the zstandard package)
+    - level (int): Compression level (default: 6 for gzip, 10 for zstd)
+    - pack (bool): Move the compressed outputs of each reaction into one pack file
+
+    Output:
+    - (dict): Summary of the archived files of each reaction
+    """
+    if method not in COMPRESSION_SUFFIXES:
+        raise Exception(f"Unrecognized compression method: '{method}', please choose 'gzip' or 'zstd'")
+    if method == "zstd":
+        zstd_module()
+
+    results = dict()
+    for reaction in sorted(os.listdir(campaign_root)):
+        reaction_folder = os.path.join(campaign_root, reaction)
+        if os.path.isdir(reaction_folder):
+            results[reaction] = archive_reaction(reaction_folder, method, level, pack)
+
+    num_files = sum(summary["files"] for summary in results.values())
+    original_size = sum(summary["original_size"] for summary in results.values())
+    archived_size = sum(summary["archived_size"] for summary in results.values())
+    print(f"Archived {num_files} outputs from {len(results)} reactions in {campaign_root}: "
+          f"{original_size / 1e6:.1f} MB -> {archived_size / 1e6:.1f} MB")
+
+    return results
@@ -0,0 +1,326 @@
+"""
+Single command line entry point for rxnrlx
+
+    rxnrlx ts2rxn <config_file.yaml> [<config_file.yaml> ...] [-j MAX_CONCURRENT]
+    rxnrlx refine <config_file.yaml> [<config_file.yaml> ...] [-j MAX_CONCURRENT]
+    rxnrlx diagram <config_file.yaml>
+    rxnrlx harvest <campaign_folder> [-o summary.yaml]
+    rxnrlx thermo <campaign_folder> [-t 250:400:10] [--qrrho grimme] [-o sweep.yaml]
+    rxnrlx kinetics <campaign_folder> [-t 250:400:10] [--tunneling wigner] [-o rates.yaml]
+    rxnrlx microkinetics <network.yaml> [-o profiles.npz]
+    rxnrlx status <campaign_folder> [--watch SECONDS] [--no-cache]
+    rxnrlx archive <campaign_folder> [--method zstd] [--pack]
+    rxnrlx enqueue <queue_folder> {ts2rxn,refine} <config_file.yaml> [<config_file.yaml> ...]
+    rxnrlx worker <queue_folder> [--max-tasks N] [--lease-timeout SECONDS]
+    rxnrlx runtime <campaign_folder> [<campaign_folder> ...] [-o model.json]
+    rxnrlx efficiency <campaign_folder> [-o usage.yaml]
+    rxnrlx irc <irc.out> [-o trajectory.npz|.h5|.xyz]
+    rxnrlx symmetry <campaign_folder> [-t 0.1] [--reuse-tolerance 0.001] [-o species.yaml]
+
+Heavy dependencies (pymatgen, numpy, matplotlib, energydiagram) are only imported inside the
+subcommand that needs them so that short-lived driver processes start quickly.
+Keep the module-level imports of this file limited to the standard library.
+"""
+import argparse, sys, time
+
+
+def run_workflows(workflow, config_files:list[str], max_concurrent:int):
+    """
+    Run a workflow for each config file, several at a time in threads of this process
+    (each workflow works in its own job folder, so they do not interfere with each other)
+
+    Each workflow launches its Jaguar jobs with its own info.ntasks, so max_concurrent reactions
+    use up to max_concurrent times that many cores
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from rxnrlx.common.context import JobContext
+    from rxnrlx.common.utils import load_config
+
+    configs = [load_config(config_file) for config_file in config_files]
+    if len(configs) == 1:
+        workflow(configs[0], JobContext())
+        return
+
+    num_concurrent = min(max_concurrent, len(configs))
+    if num_concurrent > 1:
+        cores = max(config["info"].get("ntasks", 1) for config in configs) * num_concurrent
+        print(f"WARNING: running {num_concurrent} reactions at once, each with its own info.ntasks "
+              f"(up to {cores} cores); lower info.ntasks or -j to stay within the allocation")
+
+    failed = list()
+    with ThreadPoolExecutor(max_workers=max_concurrent) as pool:
+        futures = [pool.submit(workflow, config, JobContext()) for config in configs]
+        for config_file, future in zip(config_files, futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"{config_file} failed: {e}")
+                failed.append(config_file)
+
+    if failed:
+        raise Exception(f"{len(failed)} of {len(configs)} workflows failed: {', '.join(failed)}")
+
+
+def run_ts2rxn(args):
+    from rxnrlx.ts2rxn import ts2rxn
+
+    run_workflows(ts2rxn, args.config, args.max_concurrent)
+
+
+def run_refine(args):
+    from rxnrlx.refine import refine
+
+    run_workflows(refine, args.config, args.max_concurrent)
+
+
+def run_diagram(args):
+    from rxnrlx.common.utils import load_config
+    from rxnrlx.diagram import create_diagram
+
+    create_diagram(load_config(args.config))
+
+
+def run_harvest(args):
+    from rxnrlx.harvest import harvest
+
+    harvest(args.campaign_root, args.output)
+
+
+def parse_temperatures(value:str) -> list[float]:
+    """
+    Read a temperature grid given either as a list (273.15,298.15) or a range start:stop:step (inclusive)
+    """
+    if ":" in value:
+        start, stop, step = (float(part) for part in value.split(":"))
+        num_points = int(round((stop - start) / step)) + 1
+        return [start + i * step for i in range(num_points)]
+
+    return [float(part) for part in value.split(",")]
+
+
+def run_thermo(args):
+    from rxnrlx.thermo import campaign_thermo
+
+    campaign_thermo(
+        args.campaign_root, args.temperatures, pressure=args.pressure,
+        qrrho=args.qrrho, cutoff=args.cutoff, output_file=args.output
+    )
+
+
+def run_kinetics(args):
+    from rxnrlx.kinetics import reaction_rates, rank_reactions
+    from rxnrlx.thermo import to_builtin
+
+    rates = reaction_rates(
+        args.campaign_root, args.temperatures, tunneling=args.tunneling,
+        use_thermo=args.use_thermo, qrrho=args.qrrho
+    )
+
+    print(f"{'reaction':<30s} {'forward k (1/s)':>16s} {'reverse k (1/s)':>16s}   at T = {args.temperatures[0]} K")
+    for reaction, forward_rate in rank_reactions(rates):
+        print(f"{reaction:<30s} {forward_rate:>16.4e} {rates[reaction]['reverse'][0]:>16.4e}")
+
+    if args.output is not None:
+        import yaml
+
+        with open(args.output, "w") as f:
+            yaml.dump(to_builtin(rates), f, default_flow_style=None)
+
+
+def run_microkinetics(args):
+    import yaml
+    from rxnrlx.kinetics import run_network
+
+    with open(args.network, "r") as f:
+        network_config = yaml.safe_load(f)["network"]
+
+    result = run_network(network_config)
+
+    print(f"Concentrations after {result['time'][-1]} s:")
+    for name, concentration in zip(result["species"], result["concentrations"][:, -1]):
+        print(f"{name:<30s} {concentration:.6e}")
+
+    if args.output is not None:
+        import numpy as np
+
+        np.savez_compressed(args.output, **result)
+
+
+def run_status(args):
+    from rxnrlx.status import campaign_status, print_status
+
+    while True:
+        print_status(campaign_status(args.campaign_root, use_cache=not args.no_cache))
+        if args.watch is None:
+            break
+        time.sleep(args.watch)
+        print()
+
+
+def run_archive(args):
+    from rxnrlx.archive import archive
+
+    archive(args.campaign_root, method=args.method, level=args.level, pack=args.pack)
+
+
+def run_enqueue(args):
+    from rxnrlx.workqueue import enqueue
+
+    enqueue(args.queue, args.workflow, args.config)
+
+
+def run_worker(args):
+    from rxnrlx.workqueue import work
+
+    work(args.queue, max_tasks=args.max_tasks, heartbeat=args.heartbeat, lease_timeout=args.lease_timeout)
+
+
+def run_runtime(args):
+    from rxnrlx.runtime_model import train
+
+    train(args.campaign_root, output_file=args.output, test_fraction=args.test_fraction)
+
+
+def run_efficiency(args):
+    from rxnrlx.efficiency import efficiency
+
+    efficiency(args.campaign_root, output_file=args.output)
+
+
+def run_irc(args):
+    from rxnrlx.jaguar.trajectory import read_irc_trajectory, write_trajectory
+
+    trajectory = read_irc_trajectory(args.outfile)
+    write_trajectory(trajectory, args.output)
+    print(f"Wrote {len(trajectory['energies'])} IRC points to {args.output}")
+
+
+def run_symmetry(args):
+    from rxnrlx.symmetry import symmetry
+
+    symmetry(args.campaign_root, tolerance=args.tolerance, output_file=args.output, reuse_tolerance=args.reuse_tolerance)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Create the argument parser holding every rxnrlx subcommand
+    """
+    parser = argparse.ArgumentParser(prog="rxnrlx", description="Reaction pathway relaxation workflows")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, func, description in [
+        ("ts2rxn", run_ts2rxn, "Relax a TS guess into a full reaction pathway"),
+        ("refine", run_refine, "Re-optimize a pathway and calculate Gibbs free energies"),
+    ]:
+        subparser = subparsers.add_parser(name, help=description, description=description)
+        subparser.add_argument("config", nargs="+", help="YAML configuration file(s), one per reaction")
+        subparser.add_argument("-j", "--max-concurrent", type=int, default=1,
+                               help="Number of reactions run at the same time when several configs are given; "
+                                    "each uses its full info.ntasks, so the allocation needs N times that many cores")
+        subparser.set_defaults(func=func)
+
+    subparser = subparsers.add_parser("diagram", help="Splice refined reactions together into a reaction diagram")
+    subparser.add_argument("config", help="YAML configuration file")
+    subparser.set_defaults(func=run_diagram)
+
+    subparser = subparsers.add_parser("harvest", help="Collect energy.yaml results from a campaign folder")
+    subparser.add_argument("campaign_root", help="Folder holding one subfolder per reaction")
+    subparser.add_argument("-o", "--output", default=None, help="YAML file to write the summary to")
+    subparser.set_defaults(func=run_harvest)
+
+    subparser = subparsers.add_parser("thermo", help="Recompute reaction free energies over a temperature grid")
+    subparser.add_argument("campaign_root", help="Folder holding one subfolder per reaction")
+    subparser.add_argument("-t", "--temperatures", type=parse_temperatures, default=[298.15],
+                           help="Temperatures in K, as a list (273.15,298.15) or a range (250:400:10)")
+    subparser.add_argument("-p", "--pressure", type=float, default=1.0, help="Pressure in atm")
+    subparser.add_argument("--qrrho", choices=["truhlar", "grimme", "harmonic"], default="truhlar",
+                           help="Quasi-RRHO treatment of low frequency modes (truhlar, as in energy.yaml, by default)")
+    subparser.add_argument("--cutoff", type=float, default=100.0, help="Quasi-RRHO cutoff frequency in cm^-1")
+    subparser.add_argument("-o", "--output", default=None, help="YAML file to write the results to")
+    subparser.set_defaults(func=run_thermo)
+
+    subparser = subparsers.add_parser("kinetics", help="Rank the reactions of a campaign by Eyring rate constant")
+    subparser.add_argument("campaign_root", help="Folder holding one subfolder per reaction")
+    subparser.add_argument("-t", "--temperatures", type=parse_temperatures, default=[298.15],
+                           help="Temperatures in K, as a list (273.15,298.15) or a range (250:400:10)")
+    subparser.add_argument("--tunneling", choices=["wigner", "bell"], default=None, help="Tunneling correction")
+    subparser.add_argument("--use-thermo", action="store_true",
+                           help="Recompute the barriers at each temperature from the frequency jobs")
+    subparser.add_argument("--qrrho", choices=["truhlar", "grimme", "harmonic"], default="truhlar",
+                           help="Quasi-RRHO treatment of low frequency modes with --use-thermo (truhlar by default)")
+    subparser.add_argument("-o", "--output", default=None, help="YAML file to write the rate constants to")
+    subparser.set_defaults(func=run_kinetics)
+
+    subparser = subparsers.add_parser("microkinetics", help="Integrate a microkinetic model of a reaction network")
+    subparser.add_argument("network", help="YAML file with a network section (see rxnrlx.kinetics)")
+    subparser.add_argument("-o", "--output", default=None, help="NumPy .npz file to write the concentration profiles to")
+    subparser.set_defaults(func=run_microkinetics)
+
+    subparser = subparsers.add_parser("status", help="Report the progress of every reaction in a campaign folder")
+    subparser.add_argument("campaign_root", help="Folder holding one subfolder per reaction")
+    subparser.add_argument("--watch", type=float, default=None, metavar="SECONDS",
+                           help="Repeat the scan every SECONDS seconds")
+    subparser.add_argument("--no-cache", action="store_true",
+                           help="Re-read every output file instead of using the results of the previous scan")
+    subparser.set_defaults(func=run_status)
+
+    subparser = subparsers.add_parser("archive", help="Compress the outputs of the finished jobs in a campaign folder")
+    subparser.add_argument("campaign_root", help="Folder holding one subfolder per reaction")
+    subparser.add_argument("--method", choices=["gzip", "zstd"], default="gzip",
+                           help="Compression method (zstd requires the zstandard package)")
+    subparser.add_argument("--level", type=int, default=None, help="Compression level")
+    subparser.add_argument("--pack", action="store_true",
+                           help="Pack the compressed outputs of each reaction into a single file")
+    subparser.set_defaults(func=run_archive)
+
+    subparser = subparsers.add_parser("enqueue", help="Add reactions to a work queue on the shared filesystem")
+    subparser.add_argument("queue", help="Folder of the work queue (created if needed)")
+    subparser.add_argument("workflow", choices=["ts2rxn", "refine"], help="Workflow to run on each config file")
+    subparser.add_argument("config", nargs="+", help="YAML configuration file(s), one per reaction")
+    subparser.set_defaults(func=run_enqueue)
+
+    subparser = subparsers.add_parser("worker", help="Claim and run reactions from a work queue until it is drained")
+    subparser.add_argument("queue", help="Folder of the work queue")
+    subparser.add_argument("--max-tasks", type=int, default=None, help="Stop after this many tasks")
+    subparser.add_argument("--heartbeat", type=float, default=60, metavar="SECONDS",
+                           help="Seconds between heartbeats of the running task")
+    subparser.add_argument("--lease-timeout", type=float, default=900, metavar="SECONDS",
+                           help="Seconds without heartbeat after which the task of a crashed worker is released")
+    subparser.set_defaults(func=run_worker)
+
+    subparser = subparsers.add_parser("runtime", help="Fit a job runtime model to the finished jobs of campaigns")
+    subparser.add_argument("campaign_root", nargs="+", help="Folders holding one subfolder per reaction")
+    subparser.add_argument("--test-fraction", type=float, default=0.2,
+                           help="Fraction of the jobs held out to report the accuracy of the model")
+    subparser.add_argument("-o", "--output", default=None, help="JSON file to write the model to")
+    subparser.set_defaults(func=run_runtime)
+
+    subparser = subparsers.add_parser("efficiency", help="Report the parallel efficiency of the sampled jobs of a campaign")
+    subparser.add_argument("campaign_root", help="Folder holding one subfolder per reaction")
+    subparser.add_argument("-o", "--output", default=None, help="YAML file to write the usage of every job to")
+    subparser.set_defaults(func=run_efficiency)
+
+    subparser = subparsers.add_parser("irc", help="Extract every point of an IRC output as a trajectory")
+    subparser.add_argument("outfile", help="Jaguar IRC output (irc.out)")
+    subparser.add_argument("-o", "--output", default="irc_trajectory.npz",
+                           help="Trajectory file: .npz, .h5 (requires h5py) or multi-frame .xyz")
+    subparser.set_defaults(func=run_irc)
+
+    subparser = subparsers.add_parser("symmetry", help="Point groups of the final structures and species shared by reactions")
+    subparser.add_argument("campaign_root", help="Folder holding one subfolder per reaction")
+    subparser.add_argument("-t", "--tolerance", type=float, default=0.1, help="Symmetry tolerance (Angstrom)")
+    subparser.add_argument("--reuse-tolerance", type=float, default=1e-3,
+                           help="Largest difference of interatomic distances between equivalent species (Angstrom)")
+    subparser.add_argument("-o", "--output", default=None, help="Optional YAML file to write the report to")
+    subparser.set_defaults(func=run_symmetry)
+
+    return parser
+
+
+def main(argv:list=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,188 @@
+"""
+Transparent reading of compressed and packed job outputs (written by rxnrlx.archive)
+
+A file {path} can be stored as:
+- {path} itself
+- {path}.gz or {path}.zst (compressed in place)
+- a member of the pack file (rxnrlx_outputs.tar) of one of its parent folders, stored under its
+  path relative to that folder (compressed as well)
+
+Readers open files through open_text, which decompresses while streaming instead of unpacking
+to disk, so reading an archived output only reads the (much smaller) compressed data.
+"""
+import contextlib, gzip, io, os, tarfile
+
+COMPRESSED_SUFFIXES = [".zst", ".gz"]
+PACK_FILENAME = "rxnrlx_outputs.tar"
+
+# Size of the chunks streamed when only the end of a compressed file is needed
+CHUNK_SIZE = 1 << 20
+
+# Member index of each pack file, keyed by path and refreshed when the pack changes
+_pack_index = dict()
+
+
+def zstd_module():
+    """ zstandard is optional, only needed for .zst files """
+    try:
+        import zstandard
+    except ImportError:
+        raise Exception("Reading or writing .zst files requires zstandard (pip install zstandard)")
+    return zstandard
+
+
+def strip_suffix(filename:str) -> str:
+    """ Name of a file without its compression suffix """
+    for suffix in COMPRESSED_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+
+def pack_members(pack:str) -> dict:
+    """
+    Members of a pack file by name (the last copy of a member wins, like tar itself)
+    """
+    mtime = os.stat(pack).st_mtime_ns
+    cached = _pack_index.get(pack)
+    if cached is None or cached[0] != mtime:
+        with tarfile.open(pack, "r:") as tar:
+            cached = (mtime, {member.name: member for member in tar.getmembers() if member.isfile()})
+        _pack_index[pack] = cached
+
+    return cached[1]
+
+
+def locate(path:str) -> tuple[str, str, str]:
+    """
+    Find where a file is stored
+
+    Output:
+    - (str): The file holding the data (the file itself, its compressed version or a pack file)
+    - (str): Name of the member within the pack file (None if not packed)
+    - (str): Compression suffix of the data ("" if uncompressed)
+
+    Raises:
+    - FileNotFoundError if the file is not stored in any form
+    """
+    if os.path.exists(path):
+        return path, None, ""
+    for suffix in COMPRESSED_SUFFIXES:
+        if os.path.exists(path + suffix):
+            return path + suffix, None, suffix
+
+    path = os.path.abspath(path)
+    folder = os.path.dirname(path)
+    while True:
+        pack = os.path.join(folder, PACK_FILENAME)
+        if os.path.exists(pack):
+            members = pack_members(pack)
+            name = os.path.relpath(path, folder)
+            for suffix in [""] + COMPRESSED_SUFFIXES:
+                if name + suffix in members:
+                    return pack, name + suffix, suffix
+
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            raise FileNotFoundError(f"No such file (or compressed/packed version of it): '{path}'")
+        folder = parent
+
+
+def exists(path:str) -> bool:
+    """ Check whether a file is stored in any form (plain, compressed or packed) """
+    try:
+        locate(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def file_stat(path:str) -> os.stat_result:
+    """ os.stat of the file actually holding the data (changes whenever the data does) """
+    return os.stat(locate(path)[0])
+
+
+@contextlib.contextmanager
+def open_binary(path:str):
+    """ Open a file for streaming binary reading, whichever way it is stored """
+    location, member, suffix = locate(path)
+
+    with contextlib.ExitStack() as stack:
+        if member is None:
+            raw = stack.enter_context(open(location, "rb"))
+        else:
+            tar = stack.enter_context(tarfile.open(location, "r:"))
+            raw = stack.enter_context(tar.extractfile(pack_members(location)[member]))
+
+        if suffix == ".gz":
+            raw = stack.enter_context(gzip.GzipFile(fileobj=raw, mode="rb"))
+        elif suffix == ".zst":
+            raw = stack.enter_context(zstd_module().ZstdDecompressor().stream_reader(raw))
+
+        yield raw
+
+
+@contextlib.contextmanager
+def open_text(path:str):
+    """ Open a file for streaming text reading (a drop-in replacement of open(path, "r")) """
+    with open_binary(path) as raw:
+        yield io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+
+
+def read_tail_bytes(path:str, num_bytes:int) -> tuple[bytes, int]:
+    """
+    Read the last num_bytes of a file: seeking for plain files, streaming through compressed ones
+
+    Output:
+    - (bytes): End of the (decompressed) file
+    - (int): Total (decompressed) size of the file
+    """
+    location, member, suffix = locate(path)
+    if member is None and not suffix:
+        with open(location, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(size - num_bytes, 0))
+            return f.read(), size
+
+    tail = b""
+    size = 0
+    with open_binary(path) as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            tail = (tail + chunk)[-num_bytes:]
+
+    return tail, size
+
+
+def list_files(folder:str) -> dict:
+    """
+    List the files below a folder like os.walk does, with the names they are read by: compression
+    suffixes are removed and the members of pack files are listed in the folders they came from
+
+    Output:
+    - (dict): Set of filenames in each (absolute) directory path
+    """
+    listing = dict()
+    for dirpath, _, filenames in os.walk(os.path.abspath(folder)):
+        names = listing.setdefault(dirpath, set())
+        for filename in filenames:
+            if filename == PACK_FILENAME:
+                for member in pack_members(os.path.join(dirpath, filename)):
+                    member_dir = os.path.normpath(os.path.join(dirpath, os.path.dirname(member)))
+                    listing.setdefault(member_dir, set()).add(strip_suffix(os.path.basename(member)))
+            else:
+                names.add(strip_suffix(filename))
+
+    return listing
+
+
+def read_molecule(path:str):
+    """ Read a structure file (e.g. XYZ) into a pymatgen Molecule, whichever way it is stored """
+    from pymatgen.core.structure import Molecule
+
+    with open_text(path) as f:
+        return Molecule.from_str(f.read(), fmt=os.path.splitext(path)[1][1:].lower())
@@ -2,4 +2,8 @@
 # Final Structure filenames
 FWD_FILENAME = "FORWARD.xyz"
 REV_FILENAME = "REVERSE.xyz"
-TS_FILENAME = "TRANSITION_STATE.xyz"
\ No newline at end of file
+TS_FILENAME = "TRANSITION_STATE.xyz"
+
+# Energy conversions (from Hartrees)
+HARTREE_TO_EV = 27.2114
+HARTREE_TO_KCAL = 627.5095
@@ -0,0 +1,43 @@
+""" Explicit working directories for job stages """
+import os
+
+
+class JobContext:
+    """
+    Folder a job stage works in
+
+    Stages build absolute paths from the context and launch subprocesses with cwd=context.folder
+    instead of changing the working directory of the whole process (os.chdir), so several
+    reactions can be run from threads of the same driver process.
+
+    If a scratch folder is set (e.g. $TMPDIR on the compute node), jobs are staged there and only
+    their results are copied back to the context folder (see rxnrlx.jaguar.executor).
+    If a sample interval is set, the CPU, memory and I/O usage of every job is sampled every
+    sample_interval seconds and saved next to its output ({name}.resources.npz).
+    """
+
+    def __init__(self, folder:str=None, scratch:str=None, sample_interval:float=None):
+        self.folder = os.path.abspath(folder if folder is not None else os.getcwd())
+        self.scratch = scratch
+        self.sample_interval = sample_interval
+
+    def path(self, *parts:str) -> str:
+        """ Absolute path of a file or folder inside this context (absolute parts are kept as they are) """
+        return os.path.join(self.folder, *parts)
+
+    def subcontext(
+            self, name:str, create:bool=True, exist_ok:bool=False, scratch:str=None, sample_interval:float=None
+        ) -> "JobContext":
+        """ Context for a subfolder (sharing the settings of this context unless others are given), creating the folder unless create is False """
+        if create:
+            os.makedirs(self.path(name), exist_ok=exist_ok)
+        return JobContext(
+            self.path(name),
+            scratch if scratch is not None else self.scratch,
+            sample_interval if sample_interval is not None else self.sample_interval
+        )
+
+    def __repr__(self):
+        if self.scratch is not None:
+            return f"JobContext({self.folder!r}, scratch={self.scratch!r})"
+        return f"JobContext({self.folder!r})"
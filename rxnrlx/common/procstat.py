@@ -0,0 +1,132 @@
+"""
+Sample the CPU time, memory and I/O of a process and all of its children from /proc (Linux only)
+
+Jaguar runs as a tree of processes (the jaguar run driver, the jobcontrol launcher and the MPI/OpenMP
+executables), so each sample sums over every live descendant of the launched process. CPU time of
+children that already exited is included through the cutime/cstime of their parents.
+"""
+import os, threading, time
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Columns of the time series of each job
+SAMPLE_FIELDS = ["time", "cpu_seconds", "rss_bytes", "read_bytes", "write_bytes", "num_processes"]
+
+
+def read_stat(pid:int) -> dict:
+    """ State, parent, CPU time (seconds) and resident memory (bytes) of a process from /proc/<pid>/stat """
+    with open(f"/proc/{pid}/stat", "r") as f:
+        # the command name may hold spaces, the other fields come after its closing parenthesis
+        fields = f.read().rsplit(")", 1)[1].split()
+
+    return {
+        "state": fields[0],
+        "ppid": int(fields[1]),
+        "cpu_seconds": sum(int(value) for value in fields[11:15]) / CLOCK_TICKS,
+        "rss_bytes": int(fields[21]) * PAGE_SIZE,
+    }
+
+
+def read_io(pid:int) -> dict:
+    """ Bytes read from and written to storage by a process (zero if /proc/<pid>/io is not readable) """
+    io = {"read_bytes": 0, "write_bytes": 0}
+    try:
+        with open(f"/proc/{pid}/io", "r") as f:
+            for line in f:
+                key, value = line.split(":")
+                if key in io:
+                    io[key] = int(value)
+    except OSError:
+        pass
+    return io
+
+
+def process_tree(root_pid:int) -> dict:
+    """ /proc/<pid>/stat of the root process and all of its live descendants """
+    stats = dict()
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                stats[int(entry)] = read_stat(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+
+    children = dict()
+    for pid, stat in stats.items():
+        children.setdefault(stat["ppid"], []).append(pid)
+
+    tree = dict()
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        if pid in stats:
+            tree[pid] = stats[pid]
+            pending.extend(children.get(pid, []))
+
+    return tree
+
+
+def sample(root_pid:int) -> dict:
+    """ Resource usage summed over a process tree, or None if the root process is gone (or a zombie) """
+    tree = process_tree(root_pid)
+    if not tree or tree[root_pid]["state"] == "Z":
+        return None
+
+    total = {"time": time.time(), "cpu_seconds": 0.0, "rss_bytes": 0, "read_bytes": 0, "write_bytes": 0,
+             "num_processes": len(tree)}
+    for pid, stat in tree.items():
+        total["cpu_seconds"] += stat["cpu_seconds"]
+        total["rss_bytes"] += stat["rss_bytes"]
+        for key, value in read_io(pid).items():
+            total[key] += value
+
+    return total
+
+
+class ResourceSampler:
+    """
+    Background thread sampling a process tree every interval seconds until stopped
+
+    The totals are cumulative, so CPU time and I/O are kept at their largest value seen
+    (descendants exiting without being waited for would otherwise make them drop).
+    """
+
+    def __init__(self, pid:int, interval:float):
+        self.pid = pid
+        self.interval = interval
+        self.samples = list()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while True:
+            current = sample(self.pid)
+            if current is not None:
+                if self.samples:
+                    for key in ["cpu_seconds", "read_bytes", "write_bytes"]:
+                        current[key] = max(current[key], self.samples[-1][key])
+                self.samples.append(current)
+            if self.stopped.wait(self.interval):
+                return
+
+    def start(self) -> "ResourceSampler":
+        self.thread.start()
+        return self
+
+    def stop(self) -> list[dict]:
+        self.stopped.set()
+        self.thread.join()
+        return self.samples
+
+
+def save_samples(samples:list[dict], output_file:str, **metadata):
+    """
+    Write a time series of samples to a compressed NumPy file (one array per field, plus metadata
+    such as the number of cores the job was given)
+    """
+    import numpy as np
+
+    arrays = {field: np.array([sample[field] for sample in samples], dtype=float) for field in SAMPLE_FIELDS}
+    with open(output_file, "wb") as f:
+        np.savez_compressed(f, **arrays, **{key: np.asarray(value) for key, value in metadata.items()})
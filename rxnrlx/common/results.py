@@ -0,0 +1,139 @@
+"""
+In-memory results of the workflows, so ts2rxn, refine and diagram can be chained from Python
+without reading back the files written by the previous stage
+
+    writer = ResultWriter()                                   # files are written by a background thread
+    reaction = ts2rxn(ts2rxn_config, context, writer=writer)
+    reaction = refine(refine_config, context, reaction=reaction, writer=writer)
+    create_diagram(diagram_config, context, reactions={"rxn1": reaction}, writer=writer)
+    writer.close()                                            # wait for the files (raises if one failed)
+
+The final structures, energy.yaml and diagram structures are the persistence layer: they are written
+right away by default (as from the command line), in the background through a ResultWriter, or not
+at all with ResultWriter(enabled=False). The Jaguar jobs themselves always run from their folders.
+"""
+import os, queue, threading, yaml
+
+from rxnrlx.common.constants import FWD_FILENAME, REV_FILENAME, TS_FILENAME
+
+# File name of each structure of a reaction
+STRUCTURE_FILENAMES = {
+    "forward": FWD_FILENAME,
+    "reverse": REV_FILENAME,
+    "transition_state": TS_FILENAME,
+}
+
+
+class ReactionResult:
+    """
+    Structures, energies, timings and paths of one reaction
+
+    - structures (dict): Molecule of the "forward", "reverse" and "transition_state" structures
+    - energies (dict): Energy information as written to energy.yaml (None until refine has run)
+    - timings (dict): Wall time (seconds) of each stage, e.g. "ts2rxn/irc" or "refine/calculate_gibbs"
+    - paths (dict): Folders and files of the reaction (job_folder, final_structures, energy_file, ...)
+    - context (JobContext): Job folder of the reaction (where refine creates refine_structures)
+    """
+
+    def __init__(self, structures:dict, context, energies:dict=None, timings:dict=None, paths:dict=None):
+        self.structures = structures
+        self.context = context
+        self.energies = energies
+        self.timings = timings if timings is not None else dict()
+        self.paths = paths if paths is not None else dict()
+
+    def require_energies(self) -> dict:
+        """ Energy information of the reaction, raising a clear error if refine has not run on it yet """
+        if self.energies is None:
+            raise Exception(f"Has refine been run? Reaction '{self.context.folder}' has no energies yet, "
+                            "pass the result of refine rather than the one of ts2rxn.")
+        return self.energies
+
+    def __repr__(self):
+        stages = ", ".join(self.timings)
+        return f"ReactionResult({self.context.folder!r}, stages=[{stages}])"
+
+
+class ResultWriter:
+    """
+    Background thread writing the files of the stages in the order they were submitted
+
+    Errors are kept and raised by flush (or close), so a failed write is not silently lost.
+    """
+
+    def __init__(self, background:bool=True, enabled:bool=True):
+        self.background = background
+        self.enabled = enabled
+        self.errors = list()
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def submit(self, function, *args):
+        """ Write a file with function(*args), in the background unless background is False """
+        if not self.enabled:
+            return
+        if not self.background:
+            function(*args)
+            return
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        self.queue.put((function, args))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                function, args = item
+                function(*args)
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """ Wait for every submitted file to be written """
+        if self.thread is not None:
+            self.queue.join()
+        if self.errors:
+            errors, self.errors = self.errors, list()
+            raise Exception(f"{len(errors)} result file(s) could not be written: {errors[0]}")
+
+    def close(self):
+        """ Write the remaining files and stop the background thread """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save(writer:ResultWriter, function, *args):
+    """ Write a result file through the writer, or right away if there is none """
+    if writer is None:
+        function(*args)
+    else:
+        writer.submit(function, *args)
+
+
+def write_structures(structures:dict, folder:str):
+    """ Write the structures of a reaction (by name: forward, reverse, transition_state) to XYZ files """
+    os.makedirs(folder, exist_ok=True)
+    for name, molecule in structures.items():
+        molecule.to(os.path.join(folder, STRUCTURE_FILENAMES.get(name, f"{name}.xyz")))
+
+
+def write_energy_file(energies:dict, energy_file:str):
+    """ Write the energy information of a reaction (energy.yaml) """
+    os.makedirs(os.path.dirname(energy_file), exist_ok=True)
+    with open(energy_file, "w") as f:
+        yaml.dump(energies, f, default_flow_style=False)
@@ -38,4 +38,20 @@ def create_submit_script(account_info:dict, command:str):
     submit_script.append(command)
 
     with open("submit.script", "w") as f: 
-        f.write("\n".join(submit_script))
\ No newline at end of file
+        f.write("\n".join(submit_script))
+
+
+def load_config(config_file:str) -> dict:
+    """
+    Read a YAML configuration file specified on the command line
+    """
+    print(f"Configuration File: {config_file}")
+    import yaml
+
+    try:
+        with open(config_file, "r") as f:
+            config = yaml.safe_load(f)
+    except:
+        raise Exception("Invalid File Specified")
+
+    return config
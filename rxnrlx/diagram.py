@@ -6,14 +6,21 @@ similar to what refine.py outputs and output a reaction diagram.
 It should be possible to chain reactions together as well
 """
 import os, sys, yaml
-from pymatgen.core.structure import Molecule
 from typing import Union
 
 import matplotlib.pyplot as plt
+import numpy as np
 from energydiagram import ED
 
+from rxnrlx.common.compression import exists, open_text, read_molecule
+from rxnrlx.common.constants import HARTREE_TO_EV, HARTREE_TO_KCAL
+from rxnrlx.common.context import JobContext
+from rxnrlx.common.results import ResultWriter, save
+from rxnrlx.common.utils import load_config
+from rxnrlx.harvest import find_energy_file
 
-def create_diagram(config:dict):
+
+def create_diagram(config:dict, context:JobContext=None, reactions:dict=None, writer:ResultWriter=None):
     """
     --- Example Config File ---
     info:
@@ -27,6 +34,7 @@ def create_diagram(config:dict):
             subfolder2: []
         use_refined_structures: True    # default is True (if available)
         energy_unit: eV           # accepted options: [eV, kcal]
+        irc_profile: True         # also draw the energy along the IRC of each reaction (default is False)
     """
 
     """
@@ -34,28 +42,43 @@ def create_diagram(config:dict):
     The exact way they they are spliced together is to be speicified in the config file
     
     At the end, write a reaction diagram PNG and save the structures with their new names and ordering
+    The subfolders are relative to the context folder (default: current working directory)
+
+    Results of refine (by subfolder name) can be passed as reactions to use their structures and
+    energies instead of reading them (without subfolders in the config, every reaction is used in order)
     """
+    context = context if context is not None else JobContext()
 
     # Get list of dictionaries from specified information
-    structure_list = prepare_path(config.get("info", {}))
+    structure_list = prepare_path(config.get("info", {}), context, reactions)
 
 
     # Create a new directory to save this information in
-    os.makedirs(f"./full_path")
-    os.chdir(f"./full_path")
+    full_path = context.subcontext("full_path")
 
     # Create energy plot and save it to a .png
-    draw_diagram(structure_list)
+    draw_diagram(structure_list, full_path.path("reaction_diagram.png"))
+
+    # Optionally draw the continuous energy profile along the IRC of every reaction
+    if config.get("info", {}).get("irc_profile", False):
+        draw_irc_profile(
+            structure_list, full_path.path("irc_profile.png"), config["info"].get("energy_unit", "eV"), context
+        )
 
     # Save all of the molecules with their new names
-    os.makedirs(f"./structures")
-    os.chdir(f"./structures")
-    
+    save(writer, write_path_structures, structure_list, full_path.path("structures"))
+
+
+def write_path_structures(structure_list, folder:str):
+    """
+    Save the molecules of the pathway with their new names
+    """
+    os.makedirs(folder)
     for mol_dict in structure_list:
-        mol_dict["molecule"].to(f"{mol_dict['name']}.xyz")
+        mol_dict["molecule"].to(os.path.join(folder, f"{mol_dict['name']}.xyz"))
 
 
-def draw_diagram(structure_list):
+def draw_diagram(structure_list, output_file:str="./reaction_diagram.png"):
 
     diagram = ED()
     #diagram.dimension = 100
@@ -77,11 +100,66 @@ def draw_diagram(structure_list):
     diagram.plot(ylabel="Energy [$eV$]")
     #diagram.fig.set_figheight(10)
     #plt.show()
-    plt.savefig(f"./reaction_diagram.png", dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+
+
+
+def load_irc_profile(folder:str, context:JobContext=None) -> dict:
+    """
+    Get the IRC trajectory of a reaction folder (written by the irc stage, or read from irc.out)
+    """
+    from rxnrlx.jaguar.trajectory import TRAJECTORY_FILENAME, load_trajectory, read_irc_trajectory
+
+    context = context if context is not None else JobContext()
+    irc_folder = context.path(folder, "irc_calculation")
 
+    if os.path.exists(os.path.join(irc_folder, TRAJECTORY_FILENAME)):
+        return load_trajectory(os.path.join(irc_folder, TRAJECTORY_FILENAME))
+    if exists(os.path.join(irc_folder, "irc.out")):
+        return read_irc_trajectory(os.path.join(irc_folder, "irc.out"))
 
+    raise Exception(f"No IRC trajectory found for '{folder}': '{irc_folder}/irc.out' does not exist.")
 
-def prepare_path(info:dict) -> list[dict]:
+
+def draw_irc_profile(structure_list, output_file:str="./irc_profile.png", energy_unit:str="eV", context:JobContext=None):
+    """
+    Draw the energy along the IRC of every reaction in the pathway, chained in the same order and
+    direction as the reaction diagram (energies relative to the start of the pathway)
+    """
+    conversion = energy_conversion(energy_unit)
+
+    reactions = list()
+    for mol_dict in structure_list:
+        if (mol_dict["folder"], mol_dict["direction"]) not in reactions:
+            reactions.append((mol_dict["folder"], mol_dict["direction"]))
+
+    fig, ax = plt.subplots(figsize=(2 + 3 * len(reactions), 4))
+    end_x, end_y = 0.0, 0.0
+    for i, (folder, direction) in enumerate(reactions):
+        trajectory = load_irc_profile(folder, context)
+        x = np.asarray(trajectory["reaction_coordinate"], dtype=float)
+        y = np.asarray(trajectory["energies"], dtype=float) * conversion
+        ts_index = int(np.argmin(np.abs(x)))
+
+        # the diagram runs from the reverse to the forward structure unless the reaction is reversed
+        if direction == "reverse":
+            x, y, ts_index = -x[::-1], y[::-1], len(x) - 1 - ts_index
+
+        # each reaction starts where the previous one ended
+        x = x - x[0] + end_x
+        y = y - y[0] + end_y
+        ax.plot(x, y, color="black")
+        ax.annotate(f"TS{i+1}", (x[ts_index], y[ts_index]), textcoords="offset points", xytext=(0, 6), ha="center")
+        end_x, end_y = x[-1], y[-1]
+
+    ax.set_xlabel("Reaction coordinate")
+    ax.set_ylabel(f"Energy [{energy_unit}]")
+    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+
+
+def prepare_path(info:dict, context:JobContext=None, reactions:dict=None) -> list[dict]:
+    context = context if context is not None else JobContext()
+    reactions = reactions if reactions is not None else dict()
 
     # initialize full path list to be added to
     full_path = list()
@@ -90,19 +168,31 @@ def prepare_path(info:dict) -> list[dict]:
     stable_counter = 0
 
     # open the subfolders in order
-    for folder in info.get("subfolder", {}):
+    for folder in info.get("subfolder", list(reactions)):
+
+        # reactions computed in this process are used as they are
+        if folder in reactions:
+            structure_dir, backup_structure_dir = None, None
+            structures = reactions[folder].structures
+            energy_dict = dict(reactions[folder].require_energies())
 
-        # get the path to the structures of interest
-        if os.path.exists(f"./{folder}/refine_structures/final_structures") and info.get("use_refined_structures", True):
-            structure_dir = f"./{folder}/refine_structures/final_structures"
-            backup_structure_dir = f"./{folder}/final_structures"
         else:
-            structure_dir = f"./{folder}/final_structures"
-            backup_structure_dir = None
+            structures = None
+
+            # get the path to the structures of interest
+            if os.path.exists(context.path(folder, "refine_structures", "final_structures")) and info.get("use_refined_structures", True):
+                structure_dir = context.path(folder, "refine_structures", "final_structures")
+                backup_structure_dir = context.path(folder, "final_structures")
+            else:
+                structure_dir = context.path(folder, "final_structures")
+                backup_structure_dir = None
 
-        # get energy dict
-        with open(f"./{folder}/refined_structures/energy.yaml", "r") as f:
-            energy_dict = yaml.safe_load(f)
+            # get energy dict (refine writes it next to the refined structures if it re-optimized them)
+            energy_file = find_energy_file(context.path(folder))
+            if energy_file is None:
+                raise Exception(f"Has refine been run? No energy.yaml found in '{context.path(folder)}'.")
+            with open_text(energy_file) as f:
+                energy_dict = yaml.safe_load(f)
 
         # change energy values to requested 
         energy_dict = convert_energy_units(energy_dict, info.get("energy_unit", "eV"))
@@ -121,9 +211,12 @@ def prepare_path(info:dict) -> list[dict]:
                 structure_dir=structure_dir, 
                 backup_structure_dir=backup_structure_dir,
                 energy_dict=energy_dict,
-                filename=filename
+                filename=filename,
+                structures=structures
             )
             mol_dict["name"], ts_counter, stable_counter = get_name(mol_dict, ts_counter, stable_counter)
+            mol_dict["folder"] = reactions[folder].context.folder if folder in reactions else folder
+            mol_dict["direction"] = get_direction(info.get("order"), energy_dict, folder)
             
             full_path.append(mol_dict)
             
@@ -135,12 +228,7 @@ def convert_energy_units(energy_dict, units):
     Convert energy values from Hartrees to a more human interpretable unit 
     """
 
-    if units == "eV": 
-        conversion = 27.2114
-    elif units == "kcal":
-        conversion = 627.5095
-    else:
-        raise Exception("Unrecognized Energy Unit: Please choose between: 'eV' and 'kcal'")
+    conversion = energy_conversion(units)
     
     for mol in ["forward", "reverse", "transition_state"]:
         energy_dict[mol] = energy_dict[mol] * conversion
@@ -148,6 +236,18 @@ def convert_energy_units(energy_dict, units):
     return energy_dict
 
 
+def energy_conversion(units) -> float:
+    """
+    Factor converting Hartrees to the requested energy unit
+    """
+    if units == "eV": 
+        return HARTREE_TO_EV
+    elif units == "kcal":
+        return HARTREE_TO_KCAL
+    else:
+        raise Exception("Unrecognized Energy Unit: Please choose between: 'eV' and 'kcal'")
+
+
 def get_name(mol_dict:dict, ts_counter:int, stable_counter:int):
     """
     Creates the name of the structure
@@ -161,11 +261,11 @@ def get_name(mol_dict:dict, ts_counter:int, stable_counter:int):
 
     return name, ts_counter, stable_counter
 
-def get_order(order_parameter, omit_parameter, energy_dict, folder) -> list:
+def get_direction(order_parameter, energy_dict, folder) -> str:
     """
-    Get the order in which the molecules will be added to the reaction flow diagram
-    Remove any molecules that have been specified to be omitted
+    Get the direction ('forward' or 'reverse') in which a reaction runs in the reaction flow diagram
     """
+    direction = None
 
     if isinstance(order_parameter, dict):
         # if it is a dictionary, the user has specified the order of each reaction step
@@ -187,6 +287,15 @@ def get_order(order_parameter, omit_parameter, energy_dict, folder) -> list:
         else: 
             raise Exception(f"Unrecognized Request: '{order_parameter}' is not a valid option, please select 'exergonic' or 'endergonic'.")
 
+    return direction
+
+
+def get_order(order_parameter, omit_parameter, energy_dict, folder) -> list:
+    """
+    Get the order in which the molecules will be added to the reaction flow diagram
+    Remove any molecules that have been specified to be omitted
+    """
+    direction = get_direction(order_parameter, energy_dict, folder)
     
     if direction == "forward":
         structure_order = ["REVERSE.xyz", "TRANSITION_STATE.xyz", "FORWARD.xyz"]
@@ -197,7 +306,7 @@ def get_order(order_parameter, omit_parameter, energy_dict, folder) -> list:
     
 
     # check if any of the files should be omitted
-    omit_files = omit_parameter.get(folder, [])
+    omit_files = (omit_parameter or {}).get(folder, [])
     for file in omit_files:
         if file in structure_order:
             structure_order.remove(file)
@@ -208,21 +317,28 @@ def get_order(order_parameter, omit_parameter, energy_dict, folder) -> list:
     return structure_order
 
 
-def prepare_structure_dict(structure_dir:str, backup_structure_dir:Union[str, None], energy_dict:dict, filename:str) -> dict:
+def prepare_structure_dict(
+        structure_dir:Union[str, None], backup_structure_dir:Union[str, None], energy_dict:dict, filename:str,
+        structures:dict=None
+    ) -> dict:
     """
     Create the dictionary that will be passed into the structures list
+    (from the in-memory structures of a reaction by name if given, else from the structure files)
     """
+    molecule_name, _ = filename.split(".")
+    molecule_name = molecule_name.lower()
+
     # Check if the file exists with the main path
-    if os.path.exists(f"{structure_dir}/{filename}"):
-        mol = Molecule.from_file(f"{structure_dir}/{filename}")
-    elif (backup_structure_dir is not None) and os.path.exists(f"{backup_structure_dir}/{filename}"):
+    if structures is not None:
+        mol = structures[molecule_name]
+    elif exists(f"{structure_dir}/{filename}"):
+        mol = read_molecule(f"{structure_dir}/{filename}")
+    elif (backup_structure_dir is not None) and exists(f"{backup_structure_dir}/{filename}"):
         print(f"\nWARNING: Defaulting to pre-refined structure because file: '{structure_dir}/{filename}' does not exist.\n")
-        mol = Molecule.from_file(f"{backup_structure_dir}/{filename}")
+        mol = read_molecule(f"{backup_structure_dir}/{filename}")
     else:
         raise Exception(f"Have all structures been optimized? '{structure_dir}/{filename}' does not exist.")
 
-    molecule_name, _ = filename.split(".")
-
     # get type of structure (stable geometry or transition state)
     if molecule_name == "forward" or molecule_name == "reverse":
         molecule_type = "stable"
@@ -246,18 +362,11 @@ def prepare_structure_dict(structure_dir:str, backup_structure_dir:Union[str, No
 
 
 if __name__ == "__main__":
-    """ Read in Command Line Arguments """
-    if len(sys.argv) == 2:
-        print(f"Configuration File: {sys.argv[1]}")
-        try:
-            with open(sys.argv[1], "r") as f:
-                config = yaml.safe_load(f)
-        except:
-            raise Exception("Invalid File Specified")
-    else:
+    """ Read in Command Line Arguments (equivalent to `rxnrlx diagram <config_file.yaml>`) """
+    if len(sys.argv) != 2:
         error_message = [f"Invalid number of arguments ({len(sys.argv)}).",
-                         "Use format: ts2rxn.py <config_file.yaml>"]
+                         "Use format: diagram.py <config_file.yaml>"]
         raise Exception("\n".join(error_message))
-        
+
     # Run main code
-    create_diagram(config)
\ No newline at end of file
+    create_diagram(load_config(sys.argv[1]))
\ No newline at end of file
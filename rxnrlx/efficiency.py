@@ -0,0 +1,130 @@
+"""
+Report how efficiently Jaguar jobs used the cores they were given, from the resource time series
+sampled while they ran ({name}.resources.npz, written when info: resource_interval is set)
+
+The parallel efficiency of a job is its CPU time divided by (wall time x cores given). Jobs are
+grouped by job type, system size (number of basis functions) and number of cores, so the core
+count at which each kind of job stops scaling can be read off the report.
+"""
+import glob, os
+import numpy as np
+
+from rxnrlx.common.compression import exists
+from rxnrlx.jaguar.read_files import get_job_info_from_file
+from rxnrlx.runtime_model import job_type
+
+RESOURCES_SUFFIX = ".resources.npz"
+
+# Upper limits of the system size bins (number of basis functions)
+SIZE_BINS = [100, 250, 500, 1000, 2000]
+
+
+def size_bin(num_basis_functions) -> str:
+    """ Label of the size bin of a job """
+    if num_basis_functions is None:
+        return "unknown"
+    lower = 0
+    for upper in SIZE_BINS:
+        if num_basis_functions < upper:
+            return f"{lower}-{upper}"
+        lower = upper
+    return f">{SIZE_BINS[-1]}"
+
+
+# Order of the size bins in the report
+SIZE_ORDER = {size_bin(upper - 1): i for i, upper in enumerate(SIZE_BINS + [float("inf")])}
+
+
+def job_usage(resources_file:str) -> dict:
+    """
+    Summarize the resource time series of one job (and the size of the job from its output file)
+    """
+    with np.load(resources_file) as data:
+        samples = {key: data[key] for key in data.files}
+
+    num_tasks = int(samples["num_tasks"])
+    wall = float(samples["time"][-1] - samples["time"][0]) if len(samples["time"]) > 1 else 0.0
+    cpu = float(samples["cpu_seconds"][-1] - samples["cpu_seconds"][0])
+
+    usage = {
+        "num_tasks": num_tasks,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "efficiency": cpu / (wall * num_tasks) if wall > 0 else None,
+        "peak_rss_gb": float(samples["rss_bytes"].max()) / 1e9,
+        "read_gb": float(samples["read_bytes"][-1] - samples["read_bytes"][0]) / 1e9,
+        "write_gb": float(samples["write_bytes"][-1] - samples["write_bytes"][0]) / 1e9,
+        "job_type": "unknown",
+        "num_basis_functions": None,
+    }
+
+    outfile = resources_file[:-len(RESOURCES_SUFFIX)] + ".out"
+    if exists(outfile):
+        info = get_job_info_from_file(outfile)
+        usage["job_type"] = job_type(info["keywords"])
+        usage["num_basis_functions"] = info["num_basis_functions"]
+
+    return usage
+
+
+def campaign_efficiency(campaign_root:str) -> dict:
+    """
+    Resource usage of every sampled job in a campaign folder and the mean efficiency of each group
+    of jobs (job type, size bin, number of cores)
+
+    Output:
+    - (dict): "jobs" (usage of each job by path) and "groups" (summary of each group)
+    """
+    jobs = dict()
+    for resources_file in sorted(glob.glob(os.path.join(campaign_root, "**", f"*{RESOURCES_SUFFIX}"), recursive=True)):
+        jobs[os.path.relpath(resources_file, campaign_root)] = job_usage(resources_file)
+
+    groups = dict()
+    for usage in jobs.values():
+        if usage["efficiency"] is None:
+            continue
+        key = (usage["job_type"], size_bin(usage["num_basis_functions"]), usage["num_tasks"])
+        groups.setdefault(key, []).append(usage)
+
+    summary = dict()
+    for key in sorted(groups, key=lambda key: (key[0], SIZE_ORDER.get(key[1], len(SIZE_ORDER)), key[2])):
+        members = groups[key]
+        summary[key] = {
+            "num_jobs": len(members),
+            "efficiency": float(np.mean([usage["efficiency"] for usage in members])),
+            "wall_hours": float(np.mean([usage["wall_seconds"] for usage in members])) / 3600,
+            "core_hours": float(np.sum([usage["wall_seconds"] * usage["num_tasks"] for usage in members])) / 3600,
+            "peak_rss_gb": float(np.max([usage["peak_rss_gb"] for usage in members])),
+        }
+
+    return {"jobs": jobs, "groups": summary}
+
+
+def print_efficiency(report:dict):
+    """ Print the parallel efficiency of each group of jobs """
+    print(f"{'job type':<16s} {'basis functions':>15s} {'cores':>6s} {'jobs':>5s} {'efficiency':>11s} "
+          f"{'wall (h)':>9s} {'core-hours':>11s} {'peak RSS (GB)':>14s}")
+    for (job, size, num_tasks), info in report["groups"].items():
+        print(f"{job:<16s} {size:>15s} {num_tasks:>6d} {info['num_jobs']:>5d} {info['efficiency']:>11.0%} "
+              f"{info['wall_hours']:>9.2f} {info['core_hours']:>11.1f} {info['peak_rss_gb']:>14.2f}")
+
+    total = sum(info["core_hours"] for info in report["groups"].values())
+    used = sum(info["core_hours"] * info["efficiency"] for info in report["groups"].values())
+    if total > 0:
+        print(f"\n{len(report['jobs'])} sampled jobs: {used:.1f} of {total:.1f} allocated core-hours used ({used / total:.0%})")
+
+
+def efficiency(campaign_root:str, output_file:str=None) -> dict:
+    """
+    Print the parallel efficiency report of a campaign, optionally writing the usage of every job to YAML
+    """
+    report = campaign_efficiency(campaign_root)
+    print_efficiency(report)
+
+    if output_file is not None:
+        import yaml
+
+        with open(output_file, "w") as f:
+            yaml.dump(report["jobs"], f, default_flow_style=False)
+
+    return report
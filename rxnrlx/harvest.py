@@ -0,0 +1,60 @@
+"""
+Collect the energetics written by refine.py (energy.yaml) from every reaction in a campaign
+folder into a single summary file
+"""
+import os, yaml
+
+ENERGY_FILENAME = "energy.yaml"
+
+
+def harvest(campaign_root:str, output_file:str=None) -> dict:
+    """
+    Walk a campaign folder and gather the energy.yaml file of every reaction found in it
+
+    Inputs:
+    - campaign_root (str): Folder holding one subfolder per reaction (the ts2rxn job folders)
+    - output_file (str): Optional YAML file to write the collected results to
+
+    Output:
+    - (dict): Dictionary mapping each reaction folder to its energy information
+    """
+    results = dict()
+
+    for reaction in sorted(os.listdir(campaign_root)):
+        reaction_folder = os.path.join(campaign_root, reaction)
+        if not os.path.isdir(reaction_folder):
+            continue
+
+        energy_file = find_energy_file(reaction_folder)
+        if energy_file is None:
+            continue
+
+        with open(energy_file, "r") as f:
+            energy_info = yaml.safe_load(f)
+        energy_info["energy_file"] = os.path.relpath(energy_file, campaign_root)
+
+        results[reaction] = energy_info
+
+    print(f"Harvested {len(results)} reactions from {campaign_root}")
+
+    if output_file is not None:
+        with open(output_file, "w") as f:
+            yaml.dump(results, f, default_flow_style=False)
+
+    return results
+
+
+def find_energy_file(reaction_folder:str):
+    """
+    Find the most recently written energy.yaml file in a reaction folder (refine.py places it
+    in a different subfolder depending on whether the structures were re-optimized)
+    """
+    found = list()
+    for dirpath, _, filenames in os.walk(reaction_folder):
+        if ENERGY_FILENAME in filenames:
+            found.append(os.path.join(dirpath, ENERGY_FILENAME))
+
+    if not found:
+        return None
+
+    return max(found, key=os.path.getmtime)
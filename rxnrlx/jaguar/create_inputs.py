@@ -27,9 +27,10 @@ def create_zmat_section(structure:Molecule):
 
     return "\n".join(zmat_section)
 
-def jaguar_input(file_name:str, structure:Molecule, parameters:dict={}):
+def jaguar_input(file_name:str, structure:Molecule, parameters:dict={}, sections:list[str]=None):
     """
     Create an input file for a simple jaguar job for one structure
+    Additional complete sections (e.g. a &hess section) can be appended after the zmat section
     """
     # Create gen section
     gen_section = create_gen_section(parameters)
@@ -38,7 +39,7 @@ def jaguar_input(file_name:str, structure:Molecule, parameters:dict={}):
     zmat_section = create_zmat_section(structure)
 
     with open(file_name, "w") as f:
-        f.write(f"{gen_section}\n{zmat_section}")
+        f.write("\n".join([gen_section, zmat_section] + list(sections or [])))
     
 
 def multi_species_jaguar_input(structure:list[Molecule], parameters:dict={}):
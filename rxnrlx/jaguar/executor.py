@@ -0,0 +1,323 @@
+"""
+Launch Jaguar jobs, wait for them and reschedule the ones that failed according to the retry policy
+
+When the job context has a scratch folder (info: scratch: $TMPDIR in the config file), every
+attempt runs in its own folder on node-local scratch and only the files the parsers need are
+copied back to the job folder once it finishes. The scratch folder of a job is removed when it
+succeeds and kept for inspection when it fails. While a job runs on scratch, its input and a
+{name}.staged marker holding the path of its scratch folder are kept in the job folder, so
+`rxnrlx status` counts it as running and a node crash still leaves a trace in the campaign.
+"""
+import glob, os, random, shutil, signal, subprocess, tempfile, time
+
+from rxnrlx.common.context import JobContext
+from rxnrlx.common.procstat import ResourceSampler, save_samples
+from rxnrlx.jaguar.create_inputs import jaguar_input
+from rxnrlx.jaguar.read_files import CANCELLED_MARKER, verify_success
+from rxnrlx.jaguar.retry import load_retry_policy, next_attempt
+
+
+# Seconds between checks of running jobs, and given to killed jobs to exit before SIGKILL
+POLL_INTERVAL = 10
+KILL_TIMEOUT = 30
+
+
+def launch_job(
+        name:str, job_prefix:str, num_tasks:int, index:int, context:JobContext, new_session:bool=False
+    ) -> subprocess.Popen:
+    """
+    Start Jaguar on the input file {name}.in of the context folder, writing its output to {name}.out
+    (with new_session, the job gets its own process group so it can be killed with all its children)
+
+    The Jaguar jobname is kept on the process (process.jobname) so the job can be killed through job control
+    """
+    job_id = random.randint(10**8, (10**9)-1)
+    process = subprocess.Popen(
+        f"$SCHRODINGER/jaguar run -jobname {job_prefix}_{job_id} -PARALLEL {num_tasks} {name}.in -W > {name}.out",
+        shell=True,
+        cwd=context.folder,
+        start_new_session=new_session
+    )
+    process.jobname = f"{job_prefix}_{job_id}"
+    print(f"{index}) $SCHRODINGER/jaguar run {name}.in -jobname {job_prefix}_{job_id} -PARALLEL {num_tasks}")
+
+    return process
+
+
+# Files copied back from scratch: outputs, XYZ structures and inputs (including the restart
+# files {name}.01.in, ... holding the last geometry and Hessian)
+STAGED_PATTERNS = ["*.out", "*.xyz", "*.in"]
+
+
+def stage_job(name:str, context:JobContext) -> JobContext:
+    """
+    Create a scratch folder for one attempt of a job (or run it in the job folder if no scratch is set),
+    leaving a {name}.staged marker with the path of the scratch folder in the job folder
+    """
+    if context.scratch is None:
+        return context
+
+    scratch = os.path.expanduser(os.path.expandvars(context.scratch))
+    if not os.path.isdir(scratch):
+        raise Exception(f"Scratch folder '{context.scratch}' ({scratch}) does not exist")
+
+    run_context = JobContext(tempfile.mkdtemp(prefix=f"{name}_", dir=scratch))
+    with open(context.path(f"{name}.staged"), "w") as f:
+        f.write(f"{run_context.folder}\n")
+
+    return run_context
+
+
+def prepare_job(job:dict, context:JobContext) -> JobContext:
+    """
+    Stage a job and write its input file, also into the job folder when it runs on scratch
+    """
+    run_context = stage_job(job["name"], context)
+    jaguar_input(run_context.path(f"{job['name']}.in"), job["structure"], job["parameters"], job.get("sections"))
+    if run_context is not context:
+        shutil.copy2(run_context.path(f"{job['name']}.in"), context.path(f"{job['name']}.in"))
+
+    return run_context
+
+
+def unstage_job(name:str, run_context:JobContext, context:JobContext, success:bool):
+    """
+    Copy the results of a job back from its scratch folder, removing the scratch folder if the job succeeded
+    """
+    if run_context is context:
+        return
+
+    for pattern in STAGED_PATTERNS:
+        for file in glob.glob(run_context.path(pattern)):
+            shutil.copy2(file, context.path(os.path.basename(file)))
+    os.remove(context.path(f"{name}.staged"))
+
+    if success:
+        shutil.rmtree(run_context.folder, ignore_errors=True)
+    else:
+        print(f"Keeping scratch folder of failed job {name}: {run_context.folder}")
+
+
+def start_sampler(process:subprocess.Popen, context:JobContext):
+    """ Start sampling the resources used by a job if the context asks for it """
+    if not context.sample_interval:
+        return None
+    return ResourceSampler(process.pid, context.sample_interval).start()
+
+
+def stop_sampler(sampler:ResourceSampler, name:str, num_tasks:int, context:JobContext):
+    """ Stop sampling a finished job and save its time series next to its output ({name}.resources.npz) """
+    if sampler is None:
+        return
+    samples = sampler.stop()
+    if samples:
+        save_samples(samples, context.path(f"{name}.resources.npz"), name=name, num_tasks=num_tasks)
+
+
+def keep_failed_attempt(name:str, attempt:int, context:JobContext):
+    """
+    Move the files of a failed attempt aside ({name}.out -> {name}.out.{attempt}) so they can still be
+    inspected after the job is retried
+    """
+    for ext in ["in", "out", "resources.npz"]:
+        if os.path.exists(context.path(f"{name}.{ext}")):
+            os.replace(context.path(f"{name}.{ext}"), context.path(f"{name}.{ext}.{attempt}"))
+
+
+def run_jobs(jobs:list[dict], num_tasks:int, retry_policy:dict=None, context:JobContext=None) -> dict:
+    """
+    Run a set of Jaguar jobs concurrently in the context folder, retrying failed jobs
+
+    Inputs:
+    - jobs (list[dict]): Jobs to run, each with the keys
+        name: stem of the input/output files (the output is checked for "Job {name} completed")
+        job_prefix: prefix of the Jaguar jobname
+        structure (Molecule): structure to write into the input file
+        parameters (dict): Jaguar keywords for the gen section
+        sections (list[str]): optional extra input sections (e.g. &hess)
+    - num_tasks (int): Number of cores given to each job
+    - retry_policy (dict): The retry section of the config file (None to run each job once)
+    - context (JobContext): Folder of the jobs (default: the current working directory); with a scratch
+      folder set, the jobs run on scratch and their results are copied back here
+
+    Output:
+    - (dict): Final job specification of every job (by name) with its result under "success"
+    """
+    policy = load_retry_policy(retry_policy)
+    context = context if context is not None else JobContext()
+
+    results = dict()
+    pending = [dict(job, history=list()) for job in jobs]
+    while pending:
+        # Launch every pending job at once
+        processes = list()
+        run_contexts = list()
+        samplers = list()
+        for i, job in enumerate(pending):
+            run_context = prepare_job(job, context)
+            processes.append(launch_job(job["name"], job["job_prefix"], num_tasks, i+1, run_context))
+            run_contexts.append(run_context)
+            samplers.append(start_sampler(processes[-1], context))
+
+        # Stop sampling each job as soon as its own process exits (a job finishing before one launched
+        # earlier would otherwise stay an unreaped zombie and keep being sampled)
+        running = list(zip(pending, processes, samplers))
+        while running:
+            for job, process, sampler in list(running):
+                if process.poll() is not None:
+                    stop_sampler(sampler, job["name"], num_tasks, context)
+                    running.remove((job, process, sampler))
+            if running:
+                time.sleep(POLL_INTERVAL)
+
+        # Reschedule the jobs that failed while the policy allows it
+        retries = list()
+        for job, run_context in zip(pending, run_contexts):
+            success = verify_success(run_context.path(f"{job['name']}.out"), job["name"])
+            unstage_job(job["name"], run_context, context, success)
+            if success:
+                results[job["name"]] = {**job, "success": True}
+                continue
+
+            outfile = context.path(f"{job['name']}.out")
+            retry_job = next_attempt(job, outfile, policy)
+            if retry_job is None:
+                results[job["name"]] = {**job, "success": False}
+            else:
+                keep_failed_attempt(job["name"], len(job["history"]) + 1, context)
+                retries.append(retry_job)
+
+        if retries:
+            print(f"Retrying {len(retries)} failed job(s):")
+        pending = retries
+
+    return results
+
+
+def kill_job(process:subprocess.Popen):
+    """
+    Kill a job launched with new_session=True so its cores are freed right away
+
+    Job control may run the Jaguar backend outside the process group of the launching shell, so the
+    job is killed through `$SCHRODINGER/jobcontrol -kill` first. The process group is then sent
+    SIGTERM, and SIGKILL if it has not exited after KILL_TIMEOUT seconds.
+    """
+    jobname = getattr(process, "jobname", None)
+    if jobname is not None and process.poll() is None:
+        subprocess.run(
+            f"$SCHRODINGER/jobcontrol -kill {jobname}", shell=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            process.wait(timeout=KILL_TIMEOUT)
+            return
+        except subprocess.TimeoutExpired:
+            pass
+
+    for sig in [signal.SIGTERM, signal.SIGKILL]:
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            break
+        try:
+            process.wait(timeout=KILL_TIMEOUT)
+            break
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def mark_cancelled(outfile:str, reason:str):
+    """
+    End the partial output of a killed job with the cancellation marker, so status and archive do
+    not take it for a running job
+    """
+    with open(outfile, "a") as f:
+        f.write(f"\n{CANCELLED_MARKER}: {reason}\n")
+
+
+def race_jobs(
+        jobs:list[dict], num_tasks:int, accept=None, retry_policy:dict=None, context:JobContext=None
+    ) -> tuple[str, dict]:
+    """
+    Run alternative jobs concurrently until one of them succeeds, then kill the others
+
+    Inputs:
+    - jobs (list[dict]): Jobs to race (same keys as in run_jobs)
+    - num_tasks (int): Number of cores shared by all jobs (jobs beyond the core budget wait for a free slot)
+    - accept (callable): Optional check of a successful job output (outfile -> bool) to decide if it wins
+    - retry_policy (dict): The retry section of the config file (None to run each job once)
+    - context (JobContext): Folder of the jobs (default: the current working directory)
+
+    Output:
+    - (str): Name of the winning job (None if no job succeeded)
+    - (dict): Final job specification of every job (by name) with its result under "success"
+      (jobs that were killed have "cancelled": True, their partial outputs are kept and end with
+      the cancellation marker)
+    """
+    policy = load_retry_policy(retry_policy)
+    context = context if context is not None else JobContext()
+
+    num_slots = max(min(len(jobs), num_tasks), 1)
+    tasks_per_job = max(num_tasks // num_slots, 1)
+
+    results = dict()
+    queued = [dict(job, history=list()) for job in jobs]
+    running = dict()
+    winner = None
+    launched = 0
+    try:
+        while (queued or running) and winner is None:
+            # Fill the free slots of the core budget
+            while queued and len(running) < num_slots:
+                job = queued.pop(0)
+                run_context = prepare_job(job, context)
+                launched += 1
+                process = launch_job(job["name"], job["job_prefix"], tasks_per_job, launched, run_context, new_session=True)
+                running[job["name"]] = (job, process, run_context, start_sampler(process, context))
+
+            time.sleep(POLL_INTERVAL)
+
+            for name, (job, process, run_context, sampler) in list(running.items()):
+                if process.poll() is None:
+                    continue
+                del running[name]
+                stop_sampler(sampler, name, tasks_per_job, context)
+
+                success = verify_success(run_context.path(f"{name}.out"), name)
+                unstage_job(name, run_context, context, success)
+                outfile = context.path(f"{name}.out")
+                if success and (accept is None or accept(outfile)):
+                    results[name] = {**job, "success": True}
+                    winner = name
+                    break
+                if success:
+                    print(f"{name} converged but was not accepted")
+                    results[name] = {**job, "success": False}
+                    continue
+
+                retry_job = next_attempt(job, outfile, policy)
+                if retry_job is None:
+                    results[name] = {**job, "success": False}
+                else:
+                    keep_failed_attempt(name, len(job["history"]) + 1, context)
+                    queued.insert(0, retry_job)
+    finally:
+        # Kill the losers (or every job if the driver is interrupted), keeping their partial outputs;
+        # jobs that exited in the meantime keep their own result
+        for name, (job, process, run_context, sampler) in running.items():
+            cancelled = process.poll() is None
+            if cancelled:
+                print(f"Killing {name}")
+                kill_job(process)
+            stop_sampler(sampler, name, tasks_per_job, context)
+
+            success = not cancelled and bool(verify_success(run_context.path(f"{name}.out"), name))
+            unstage_job(name, run_context, context, success)
+            if cancelled:
+                mark_cancelled(context.path(f"{name}.out"), "killed after another job won the race" if winner else "interrupted")
+            results[name] = {**job, "success": success, "cancelled": cancelled}
+
+    for job in queued:
+        results[job["name"]] = {**job, "success": False, "cancelled": True}
+
+    return winner, results
@@ -1,15 +1,29 @@
 from pymatgen.core.structure import Molecule
 
-from rxnrlx.jaguar.create_inputs import jaguar_input
-from rxnrlx.jaguar.read_files import get_energy_from_file, get_mols_from_irc, verify_success, get_mol_from_opt
+from rxnrlx.common.context import JobContext
+from rxnrlx.jaguar.executor import race_jobs, run_jobs
+from rxnrlx.jaguar.trajectory import TRAJECTORY_FILENAME, read_irc_trajectory, write_trajectory
+from rxnrlx.jaguar.read_files import (
+    REUSED_SUFFIX, get_energy_from_file, get_mols_from_irc, get_mol_from_opt, get_hessian_from_restart,
+    count_negative_hessian_eigenvalues, find_output
+)
 from rxnrlx.common.utils import sec_to_str
+from rxnrlx.symmetry import (
+    JAGUAR_NO_SYMMETRY, JAGUAR_USE_SYMMETRY, find_registered, load_registry, load_symmetry_settings, register, symmetrize
+)
 
-import os, random, subprocess
+import glob, os, shutil
 
 import time
 
+# Largest difference (Angstrom) between a structure and the geometry of a restart file for the
+# Hessian of the restart file to still be used
+HESSIAN_GEOMETRY_TOLERANCE = 1e-4
 
-def ts_relax(ts_guess:Molecule, user_parameters:dict, num_tasks:int) -> Molecule:
+
+def ts_relax(
+        ts_guess:Molecule, user_parameters:dict, num_tasks:int, retry_policy:dict=None, context:JobContext=None
+    ) -> Molecule:
     """
     Relaxes provided structure to a valid Transition State
 
@@ -17,6 +31,8 @@ def ts_relax(ts_guess:Molecule, user_parameters:dict, num_tasks:int) -> Molecule
     - ts_guess (Molecule): Pymatgen Molecule holding guess structure
     - user_parameters (dict): Jaguar job specifications provided by user via YAML file
     - num_tasks (int): Number of cores available to parallelize calculation over
+    - retry_policy (dict): Retry section of the config file (None to run the job once)
+    - context (JobContext): Job folder to create the ts_relaxation folder in (default: current directory)
 
     Output:
     - (Molecule): Optimized Transition State
@@ -25,31 +41,27 @@ def ts_relax(ts_guess:Molecule, user_parameters:dict, num_tasks:int) -> Molecule
     - Exception if Transition State relaxation does not converge
     """
     # create new folder for inital TS_relaxation
-    os.mkdir("./ts_relaxation")
-    os.chdir("./ts_relaxation")
+    stage = (context or JobContext()).subcontext("ts_relaxation", exist_ok=True)
 
     # Set necessary parameters for code functionality
     user_parameters["ip175"] = 2 # creates XYZ files
     user_parameters["molchg"] = ts_guess.charge 
     user_parameters["multip"] = ts_guess.spin_multiplicity 
+    user_parameters["isymm"] = JAGUAR_NO_SYMMETRY # the reaction mode usually breaks the symmetry
 
-    # Create input file
-    jaguar_input("ts_opt.in", ts_guess, user_parameters)
-
-    # Submit the job and wait
+    # Submit the job (and its retries) and wait
     start_time = time.time()
-    job_id = random.randint(10**8, (10**9)-1)
-    process = subprocess.Popen(
-        f"$SCHRODINGER/jaguar run -jobname ts_relax_{job_id} -PARALLEL {num_tasks} ts_opt.in -W > ts_opt.out", 
-        shell=True
-    )
     print("\nRunning 1 Transition State Optimization:")
-    print(f"1) $SCHRODINGER/jaguar run ts_opt.in -jobname ts_relax_{job_id} -PARALLEL {num_tasks}")
-    process.wait()
+    results = run_jobs(
+        [{"name": "ts_opt", "job_prefix": "ts_relax", "structure": ts_guess, "parameters": dict(user_parameters)}],
+        num_tasks=num_tasks,
+        retry_policy=retry_policy,
+        context=stage
+    )
     duration = time.time() - start_time
 
     # Print job result
-    if not verify_success("ts_opt.out", "ts_opt"):
+    if not results["ts_opt"]["success"]:
         print(f"TS Relaxation failed after: {sec_to_str(duration)}")
         raise Exception("TS Relaxation did not converge")
     else:
@@ -57,19 +69,88 @@ def ts_relax(ts_guess:Molecule, user_parameters:dict, num_tasks:int) -> Molecule
 
 
     # If the process succeeded, open the optimized TS structure
-    opt_ts = get_mol_from_opt("ts_opt.out", len(ts_guess))
-    opt_ts.set_charge_and_spin(charge=ts_guess.charge, spin_multiplicity=ts_guess._spin_multiplicity)
+    opt_ts = load_transition_state("ts_opt", ts_guess, stage)
     
     # TODO: Check if the process suceeded or failed
     print("TS Relaxation Succeeded \n")
 
-    # Return to main job folder
-    os.chdir("./..")
+    return opt_ts
+
+
+def race_ts_relax(
+        ts_guesses:list[Molecule], user_parameters:dict, num_tasks:int, retry_policy:dict=None, context:JobContext=None
+    ) -> Molecule:
+    """
+    Relaxes several guesses of the same Transition State at once, keeping the first one that converges
+    to a Transition State (a single negative Hessian eigenvalue) and killing the others
+
+    Inputs:
+    - ts_guesses (list[Molecule]): Pymatgen Molecules holding the guess structures
+    - user_parameters (dict): Jaguar job specifications provided by user via YAML file
+    - num_tasks (int): Number of cores available, shared by the guesses running at the same time
+    - retry_policy (dict): Retry section of the config file (None to run each job once)
+    - context (JobContext): Job folder to create the ts_relaxation folder in (default: current directory)
+
+    Output:
+    - (Molecule): Optimized Transition State (its properties hold the index of the guess it came from)
+
+    Raises:
+    - Exception if none of the guesses converges to a Transition State
+    """
+    stage = (context or JobContext()).subcontext("ts_relaxation", exist_ok=True)
+
+    jobs = list()
+    for i, ts_guess in enumerate(ts_guesses):
+        parameters = dict(user_parameters)
+        parameters["ip175"] = 2 # creates XYZ files
+        parameters["molchg"] = ts_guess.charge
+        parameters["multip"] = ts_guess.spin_multiplicity
+        parameters["isymm"] = JAGUAR_NO_SYMMETRY # the reaction mode usually breaks the symmetry
+        jobs.append({"name": f"ts_opt_{i+1}", "job_prefix": f"ts_relax_{i+1}", "structure": ts_guess, "parameters": parameters})
+
+    # Race the jobs (and their retries), the losers are killed but their outputs are kept
+    start_time = time.time()
+    print(f"\nRacing {len(jobs)} Transition State Optimizations:")
+    winner, _ = race_jobs(
+        jobs,
+        num_tasks=num_tasks,
+        accept=lambda outfile: count_negative_hessian_eigenvalues(outfile) == 1,
+        retry_policy=retry_policy,
+        context=stage
+    )
+    duration = time.time() - start_time
+
+    if winner is None:
+        print(f"TS Relaxation failed for every guess after: {sec_to_str(duration)}")
+        raise Exception("TS Relaxation did not converge")
+    print(f"TS Relaxation of {winner} finished first after: {sec_to_str(duration)}")
+
+    index = int(winner.split("_")[-1]) - 1
+    opt_ts = load_transition_state(winner, ts_guesses[index], stage, job_prefix=f"ts_relax_{index+1}")
+    opt_ts.properties["ts_guess_index"] = index
+    print("TS Relaxation Succeeded \n")
+
+    return opt_ts
+
+
+def load_transition_state(name:str, ts_guess:Molecule, context:JobContext, job_prefix:str=None) -> Molecule:
+    """
+    Open the optimized Transition State of a finished TS job, keeping its restart file (final geometry
+    and Hessian) so the IRC can start from the same Hessian
+    """
+    opt_ts = get_mol_from_opt(context.path(f"{name}.out"), len(ts_guess))
+    opt_ts.set_charge_and_spin(charge=ts_guess.charge, spin_multiplicity=ts_guess._spin_multiplicity)
+
+    restart_file = keep_restart_file(name, context, job_prefix)
+    if restart_file is not None:
+        opt_ts.properties["restart_file"] = restart_file
 
     return opt_ts
 
 
-def irc(transition_state:Molecule, user_parameters:dict, num_tasks:int) -> tuple[Molecule, Molecule]:
+def irc(
+        transition_state:Molecule, user_parameters:dict, num_tasks:int, retry_policy:dict=None, context:JobContext=None
+    ) -> tuple[Molecule, Molecule]:
     """
     Performs an IRC calculation in the forward and backward direction starting from provided 
     transition state
@@ -78,6 +159,8 @@ def irc(transition_state:Molecule, user_parameters:dict, num_tasks:int) -> tuple
     - transition_state (Molecule): Pymatgen Molecule holding a relaxed transition state structure
     - user_parameters (dict): Jaguar job specifications provided by user via YAML file
     - num_tasks (int): Number of cores available to parallelize calculation over
+    - retry_policy (dict): Retry section of the config file (None to run the job once)
+    - context (JobContext): Job folder to create the irc_calculation folder in (default: current directory)
 
     Output:
     - (Molecule): Structure perturbed along the positive direction of the negative eigenmode
@@ -85,41 +168,50 @@ def irc(transition_state:Molecule, user_parameters:dict, num_tasks:int) -> tuple
 
     Raises:
     - Exception if IRC calculation does not converge
+
+    If the transition state comes from ts_relax, the Hessian of the TS search is passed to the IRC
+    job (&hess section) so Jaguar does not rebuild it. The Hessian is recomputed as usual (inhess)
+    when the restart file is missing or its geometry differs from the transition state.
     """
     
     # create new folder for inital TS_relaxation
-    os.mkdir("./irc_calculation")
-    os.chdir("./irc_calculation")
+    stage = (context or JobContext()).subcontext("irc_calculation", exist_ok=True)
 
     # Set necessary parameters for code functionality
     user_parameters["babel"] = "xyz" # creates XYZ files
     user_parameters["molchg"] = transition_state.charge 
     user_parameters["multip"] = transition_state.spin_multiplicity 
+    user_parameters["isymm"] = JAGUAR_NO_SYMMETRY # the reaction mode usually breaks the symmetry
     
-    # Create input file
-    jaguar_input("irc.in", transition_state, user_parameters)
-
-    # Submit the job and wait
+    # Reuse the Hessian of the TS optimization when it belongs to this geometry
+    parameters = dict(user_parameters)
+    sections = list()
+    hessian_section = get_ts_hessian(transition_state)
+    if hessian_section is not None:
+        print("Reusing the Hessian of the Transition State Optimization")
+        sections.append(hessian_section)
+        parameters.pop("inhess", None) # Jaguar starts from the &hess section
+    
+    # Submit the job (and its retries) and wait
     start_time = time.time()
-    job_id = random.randint(10**8, (10**9)-1)
-    process = subprocess.Popen(
-        f"$SCHRODINGER/jaguar run -jobname irc_{job_id} -PARALLEL {num_tasks} irc.in -W > irc.out", 
-        shell=True
-    )
     print("Running 1 IRC Job:")
-    print(f"1) $SCHRODINGER/jaguar run irc.in -jobname irc_{job_id} -PARALLEL {num_tasks}")
-    process.wait()
+    results = run_jobs(
+        [{"name": "irc", "job_prefix": "irc", "structure": transition_state, "parameters": parameters, "sections": sections}],
+        num_tasks=num_tasks,
+        retry_policy=retry_policy,
+        context=stage
+    )
     duration = time.time() - start_time
 
     # Print job result
-    if not verify_success("irc.out", "irc"):
+    if not results["irc"]["success"]:
         print(f"IRC Calculation failed after: {sec_to_str(duration)}")
         raise Exception("IRC Calculation did not converge")
     else:
         print(f"IRC Calculation finished successfully after: {sec_to_str(duration)}")
 
     forward_molecule, reverse_molecule = get_mols_from_irc(
-        outfile="irc.out", 
+        outfile=stage.path("irc.out"), 
         num_atoms=len(transition_state)
     )
 
@@ -128,17 +220,83 @@ def irc(transition_state:Molecule, user_parameters:dict, num_tasks:int) -> tuple
     reverse_molecule.set_charge_and_spin(charge=transition_state.charge, spin_multiplicity=transition_state._spin_multiplicity)
 
     # Save structures to assist with manual debugging
-    forward_molecule.to("forward_molecule.xyz")
-    reverse_molecule.to("reverse_molecule.xyz")
+    forward_molecule.to(stage.path("forward_molecule.xyz"))
+    reverse_molecule.to(stage.path("reverse_molecule.xyz"))
 
-    # Return to main job folder
-    os.chdir("./..")
+    # Keep the whole reaction path (energy profile and intermediate frames)
+    try:
+        write_trajectory(read_irc_trajectory(stage.path("irc.out")), stage.path(TRAJECTORY_FILENAME))
+    except Exception as e:
+        print(f"WARNING: could not extract the IRC trajectory: {e}")
 
     return forward_molecule, reverse_molecule
 
+
+def keep_restart_file(name:str, context:JobContext, job_prefix:str=None):
+    """
+    Copy the restart file Jaguar wrote for a job ({name}.01.in, or {jobname}.01.in) to {name}.restart.in
+    so it is not overwritten, returning its absolute path (None if Jaguar did not write one)
+    """
+    if os.path.exists(context.path(f"{name}.01.in")):
+        restart_files = [context.path(f"{name}.01.in")]
+    else:
+        restart_files = glob.glob(context.path(f"{job_prefix}_*.01.in" if job_prefix else "*.01.in"))
+    if not restart_files:
+        return None
+
+    shutil.copyfile(max(restart_files, key=os.path.getmtime), context.path(f"{name}.restart.in"))
+
+    return context.path(f"{name}.restart.in")
+
+
+def use_symmetry(structure:Molecule, parameters:dict, settings:dict, tolerance:float) -> tuple[Molecule, dict, str]:
+    """
+    Symmetrize a structure within tolerance so Jaguar finds its full point group (see rxnrlx.symmetry),
+    returning the structure, keywords and point group of the job (isymm is set back to the Jaguar
+    default in case the config section turns symmetry off)
+    """
+    structure, point_group = symmetrize(structure, tolerance, settings["eigen_tolerance"])
+    if point_group != "C1":
+        parameters = dict(parameters, isymm=JAGUAR_USE_SYMMETRY)
+
+    return structure, parameters, point_group
+
+
+def reuse_output(outfile:str, name:str, context:JobContext):
+    """
+    Record that job name reuses the output of a finished job on an equivalent species, with a
+    {name}.reused pointer to that output instead of {name}.out (see read_files.find_output)
+    """
+    with open(context.path(f"{name}{REUSED_SUFFIX}"), "w") as f:
+        f.write(f"{outfile}\n")
+
+
+def get_ts_hessian(transition_state:Molecule):
+    """
+    Get the &hess section kept by ts_relax for this transition state, or None if there is no usable Hessian
+    (no restart file, no Hessian in it, or a geometry that does not match the transition state)
+    """
+    restart_file = transition_state.properties.get("restart_file")
+    if restart_file is None or not os.path.exists(restart_file):
+        return None
+
+    coords, hessian_section = get_hessian_from_restart(restart_file)
+    if hessian_section is None or len(coords) != len(transition_state):
+        return None
+
+    deviation = max(
+        abs(a - b) for site, xyz in zip(transition_state, coords) for a, b in zip(site.coords, xyz)
+    )
+    if deviation > HESSIAN_GEOMETRY_TOLERANCE:
+        print(f"TS geometry changed by {deviation:.2e} A since the Hessian was computed, it will be recomputed")
+        return None
+
+    return hessian_section
+
+
 def geom_opt(
         forward_molecule:Molecule, reverse_molecule:Molecule, 
-        user_parameters:dict, num_tasks:int
+        user_parameters:dict, num_tasks:int, retry_policy:dict=None, context:JobContext=None, symmetry:dict=None
     ) -> tuple[Molecule, Molecule]:
 
     """
@@ -151,6 +309,9 @@ def geom_opt(
        of the negative eigenmode of the transition state
     - user_parameters (dict): Jaguar job specifications provided by user via YAML file
     - num_tasks (int): Number of cores available to parallelize calculation over
+    - retry_policy (dict): Retry section of the config file (None to run each job once)
+    - context (JobContext): Job folder to create the geometry_optimizations folder in (default: current directory)
+    - symmetry (dict): Symmetry section of the config file (None to optimize the structures as they are)
 
     Output:
     - (Molecule): Optimized Forward Structure
@@ -161,34 +322,30 @@ def geom_opt(
     """
 
     # create new folder for inital TS_relaxation
-    os.mkdir("./geometry_optimizations")
-    os.chdir("./geometry_optimizations")
+    stage = (context or JobContext()).subcontext("geometry_optimizations", exist_ok=True)
 
     # Set necessary parameters for code functionality
     user_parameters["ip175"] = 2 # creates XYZ files
 
+    settings = load_symmetry_settings(symmetry)
+
     # Run a geometry opt for each molecule
     print("Running 2 Optimizations:")
-    processes = list()
+    jobs = list()
     start_time = time.time()
-    for i, (molec, ext) in enumerate(zip([forward_molecule, reverse_molecule], ["fwd", "rev"])):
+    for molec, ext in zip([forward_molecule, reverse_molecule], ["fwd", "rev"]):
         # Set charge and multiplicity
-        user_parameters["molchg"] = molec.charge
-        user_parameters["multip"] = molec.spin_multiplicity
-
-        # Create input file
-        jaguar_input(f"opt_{ext}.in", molec, user_parameters)
-
-        job_id = random.randint(10**8, (10**9)-1)
-        subproc = subprocess.Popen(
-            f"$SCHRODINGER/jaguar run -jobname opt_{ext}_{job_id} -PARALLEL {num_tasks//2} opt_{ext}.in -W > opt_{ext}.out", 
-            shell=True
-        )
-        print(f"{i+1}) $SCHRODINGER/jaguar run opt_{ext}.in -jobname opt_{ext}_{job_id} -PARALLEL {num_tasks//2}")
-        processes.append(subproc)
-    
-    for subp in processes:
-        subp.wait()
+        parameters = dict(user_parameters)
+        parameters["molchg"] = molec.charge
+        parameters["multip"] = molec.spin_multiplicity
+
+        if settings is not None:
+            molec, parameters, point_group = use_symmetry(molec, parameters, settings, settings["tolerance"])
+            print(f"opt_{ext}: point group {point_group}")
+
+        jobs.append({"name": f"opt_{ext}", "job_prefix": f"opt_{ext}", "structure": molec, "parameters": parameters})
+
+    results = run_jobs(jobs, num_tasks=num_tasks//2, retry_policy=retry_policy, context=stage)
 
     duration = time.time() - start_time
 
@@ -196,8 +353,8 @@ def geom_opt(
     print(f"Optimization jobs finished after: {sec_to_str(duration)}")
 
     # Print more specific job results
-    fwd_result = verify_success("opt_fwd.out", "opt_fwd")
-    rev_result = verify_success("opt_rev.out", "opt_rev")
+    fwd_result = results["opt_fwd"]["success"]
+    rev_result = results["opt_rev"]["success"]
     
     print(f"Forward Molecule Optimiation: {'SUCCESSFUL' if fwd_result else 'FAILED'}")
     print(f"Reverse Molecule Optimization: {'SUCCESSFUL' if rev_result else 'FAILED'}")
@@ -208,22 +365,19 @@ def geom_opt(
 
 
     # Read the structures into Molecule objects
-    fwd = get_mol_from_opt("opt_fwd.out", len(forward_molecule))
+    fwd = get_mol_from_opt(stage.path("opt_fwd.out"), len(forward_molecule))
     fwd.set_charge_and_spin(charge=forward_molecule.charge, spin_multiplicity=forward_molecule._spin_multiplicity)
-    rev = get_mol_from_opt("opt_rev.out", len(reverse_molecule))
+    rev = get_mol_from_opt(stage.path("opt_rev.out"), len(reverse_molecule))
     rev.set_charge_and_spin(charge=reverse_molecule.charge, spin_multiplicity=reverse_molecule._spin_multiplicity)
 
     print("Geometry Optimizations Finished\n")
 
-    # Return to folder
-    os.chdir("./..")
-
     return fwd, rev
 
 
 def calculate_gibbs(
         forward_molecule:Molecule, reverse_molecule:Molecule, transition_state:Molecule, 
-        user_parameters:dict, num_tasks:int
+        user_parameters:dict, num_tasks:int, retry_policy:dict=None, context:JobContext=None, symmetry:dict=None
     ) -> dict:
     """
     Performs frequency calculations to calculate Gibbs Free Energy for the 3 points along the reaction
@@ -233,6 +387,10 @@ def calculate_gibbs(
     - reverse_molecule (Molecule): Pymatgen Molecule holding an optimized Reverse Perturbed structure
     - user_parameters (dict): Jaguar job specifications provided by user via YAML file
     - num_tasks (int): Number of cores available to parallelize calculation over
+    - retry_policy (dict): Retry section of the config file (None to run each job once)
+    - context (JobContext): Job folder to create the energy_calculation folder in (default: current directory)
+    - symmetry (dict): Symmetry section of the config file (None to compute the structures as they are);
+      with a registry, species already computed by another reaction are not computed again
 
     Output:
     - (dict): Dictionary holding gibbs free energy values
@@ -241,34 +399,57 @@ def calculate_gibbs(
     - Exception if any of the frequency calculations do not converge
     """
 
-    os.mkdir("./energy_calculation")
-    os.chdir("./energy_calculation")
+    stage = (context or JobContext()).subcontext("energy_calculation", exist_ok=True)
+    settings = load_symmetry_settings(symmetry)
+    registry = load_registry(settings["registry"]) if settings is not None and settings["registry"] else None
 
     # Run a single point calculation for each molecule
-    print("Running 3 Frequency Calculations")
-    processes = list()
-    for i, (molec, ext) in enumerate(zip([forward_molecule, reverse_molecule, transition_state], ["fwd", "rev", "ts"])):
+    jobs = list()
+    reused = dict()
+    for molec, ext in zip([forward_molecule, reverse_molecule, transition_state], ["fwd", "rev", "ts"]):
         # set charge and multiplicity
-        user_parameters["molchg"] = molec.charge
-        user_parameters["multip"] = molec.spin_multiplicity
-
-        # Create input file
-        jaguar_input(f"energy_{ext}.in", molec, user_parameters)
-
-        job_id = random.randint(10**8, (10**9)-1)
-        subproc = subprocess.Popen(
-            f"$SCHRODINGER/jaguar run -jobname energy_{ext}_{job_id} -PARALLEL {num_tasks//3} energy_{ext}.in -W > energy_{ext}.out", 
-            shell=True
-        )
-        print(f"{i+1}) $SCHRODINGER/jaguar run energy_{ext}.in -jobname energy_{ext}_{job_id} -PARALLEL {num_tasks//3}")
-        processes.append(subproc)
-    
-    for subp in processes:
-        subp.wait()
-    
-    fwd_result = verify_success("energy_fwd.out", "energy_fwd")
-    rev_result = verify_success("energy_rev.out", "energy_rev")
-    ts_result = verify_success("energy_ts.out", "energy_ts")
+        parameters = dict(user_parameters)
+        parameters["molchg"] = molec.charge
+        parameters["multip"] = molec.spin_multiplicity
+
+        # Frequency-only structures are only cleaned up within a tight tolerance, so their energies are
+        # not shifted, and the transition state never uses symmetry (the reaction mode usually breaks it)
+        point_group = "C1"
+        if ext == "ts":
+            parameters["isymm"] = JAGUAR_NO_SYMMETRY
+        elif settings is not None:
+            molec, parameters, point_group = use_symmetry(molec, parameters, settings, settings["frequency_tolerance"])
+            print(f"energy_{ext}: point group {point_group}")
+
+        # Species computed by another reaction at the same level of theory (a pointer left by a
+        # previous run is dropped, so a job computed this time is not hidden behind it)
+        if os.path.exists(stage.path(f"energy_{ext}{REUSED_SUFFIX}")):
+            os.remove(stage.path(f"energy_{ext}{REUSED_SUFFIX}"))
+        entry = find_registered(registry, molec, parameters, settings["reuse_tolerance"]) if registry else None
+        if entry is not None:
+            print(f"energy_{ext} is equivalent to {entry['outfile']}, reusing its output")
+            reuse_output(entry["outfile"], f"energy_{ext}", stage)
+            reused[f"energy_{ext}"] = {"success": True, "reused": entry["outfile"]}
+            continue
+
+        jobs.append({
+            "name": f"energy_{ext}", "job_prefix": f"energy_{ext}", "structure": molec, "parameters": parameters,
+            "point_group": point_group
+        })
+
+    print(f"Running {len(jobs)} Frequency Calculations")
+    results = run_jobs(jobs, num_tasks=num_tasks//len(jobs), retry_policy=retry_policy, context=stage) if jobs else dict()
+    results.update(reused)
+
+    if registry is not None:
+        for job in jobs:
+            if results[job["name"]]["success"]:
+                register(settings["registry"], job["structure"], job["parameters"],
+                         stage.path(f"{job['name']}.out"), job["point_group"])
+
+    fwd_result = results["energy_fwd"]["success"]
+    rev_result = results["energy_rev"]["success"]
+    ts_result = results["energy_ts"]["success"]
 
     print(f"Forward Molecule Freqency Calculation: {'SUCCESSFUL' if fwd_result else 'FAILED'}")
     print(f"Reverse Molecule Freqency Calculation: {'SUCCESSFUL' if rev_result else 'FAILED'}")
@@ -277,13 +458,10 @@ def calculate_gibbs(
     if not (fwd_result and rev_result and ts_result):
         raise Exception("At least one frequency calculation failed")
 
-    # Get energetics from each outfile
-    forward_energy = get_energy_from_file("energy_fwd.out")
-    reverse_energy = get_energy_from_file("energy_rev.out")
-    ts_energy = get_energy_from_file("energy_ts.out")
-
-    # Return to main folder
-    os.chdir("..")
+    # Get energetics from each outfile (or the registered output it reused)
+    forward_energy = get_energy_from_file(find_output(stage.path("energy_fwd.out")))
+    reverse_energy = get_energy_from_file(find_output(stage.path("energy_rev.out")))
+    ts_energy = get_energy_from_file(find_output(stage.path("energy_ts.out")))
 
     return {
         "forward": forward_energy,
@@ -1,11 +1,49 @@
-from pymatgen.core.structure import Molecule
+import os, re
+from typing import TYPE_CHECKING
+
+from rxnrlx.common.compression import open_text, read_tail_bytes
+from rxnrlx.common.constants import HARTREE_TO_KCAL
+
+# pymatgen is slow to import, so it is only loaded once a structure is actually read
+if TYPE_CHECKING:
+    from pymatgen.core.structure import Molecule
+
+# Number of bytes read from the end of an output file when only the job result is needed
+# (Jaguar prints ~5 kB of system information after a fatal error)
+TAIL_BYTES = 32768
+
+# Lines printed by Jaguar when it aborts a job
+FAILURE_PATTERNS = ["fatal error", "cannot recover from this error"]
+
+# Last line appended to the output of a job that was killed on purpose (e.g. the losers of a race)
+CANCELLED_MARKER = "Job cancelled by rxnrlx"
+
+# Suffix of the file left instead of {name}.out when a job reuses the output of an equivalent species
+REUSED_SUFFIX = ".reused"
+
+
+def reused_pointer(outfile:str) -> str:
+    """ Path of the file pointing to the output a job reused ({name}.reused next to {name}.out) """
+    return outfile[:-len(".out")] + REUSED_SUFFIX
+
+
+def find_output(outfile:str) -> str:
+    """
+    Output holding the results of a job: the output of the equivalent species it reused (see
+    rxnrlx.symmetry) if there is a {name}.reused pointer next to it, otherwise outfile itself
+    """
+    pointer = reused_pointer(outfile)
+    if not os.path.exists(pointer):
+        return outfile
+
+    with open(pointer, "r") as f:
+        return f.read().strip()
 
-import re
 
 def get_energy_from_file(outfile:str) -> float:
     """ Get value of gibbs energy from energy output file """
 
-    with open(outfile, "r") as f:
+    with open_text(outfile) as f:
         lines = f.readlines()
 
     for line in lines:
@@ -18,10 +56,121 @@ def get_energy_from_file(outfile:str) -> float:
 
 
 
-def get_mols_from_irc(outfile:str, num_atoms:int) -> tuple[Molecule, Molecule]:
+def get_thermo_data_from_file(outfile:str) -> dict:
+    """
+    Get everything needed to recompute the thermochemistry of a species from a frequency job output:
+    electronic energy, harmonic frequencies, rotational temperatures, symmetry number, mass and multiplicity
+
+    The file is streamed line by line since numerical frequency jobs write very large outputs
+    """
+    frequencies = list()
+    scf_energies = list()
+    data = {"rotational_temperatures": [], "symmetry_number": 1, "multiplicity": 1}
+    total_internal_energy = zpe = thermal_energy = None
+
+    with open_text(outfile) as f:
+        for line in f:
+            if line.startswith(" SCFE: SCF energy"):
+                scf_energies.append(float(line.split()[-4]))
+            elif "Number of frequencies:" in line:
+                # only keep the last frequency calculation in the file
+                frequencies = list()
+            elif line.startswith("  frequencies "):
+                frequencies.extend(float(value) for value in line.split()[1:])
+            elif "multiplicity:" in line and not data["rotational_temperatures"]:
+                data["multiplicity"] = int(line.split()[-1])
+            elif "Molecular weight:" in line:
+                data["mass"] = float(line.split()[-2])
+            elif "rotational symmetry number:" in line:
+                data["symmetry_number"] = int(line.split()[-1])
+            elif "rotational temperatures (K):" in line:
+                data["rotational_temperatures"] = [float(value) for value in line.split(":")[1].split()]
+            elif "The zero point energy (ZPE):" in line:
+                zpe = float(line.split()[-2])
+            elif line.startswith("  total  ") and zpe is not None:
+                thermal_energy = float(line.split()[1])
+            elif "Total internal energy, Utot" in line:
+                total_internal_energy = float(line.split()[-2])
+
+    if not frequencies or not scf_energies:
+        raise Exception(f"No frequency calculation found in {outfile}")
+
+    # Numerical frequency jobs print one SCF energy per displaced geometry, so pick the first one matching
+    # the energy Jaguar used for its thermochemistry: Utot = SCFE + (ZPE + U) with ZPE and U in kcal/mol
+    data["electronic_energy"] = scf_energies[-1]
+    if total_internal_energy is not None and thermal_energy is not None:
+        reference = total_internal_energy - (zpe + thermal_energy) / HARTREE_TO_KCAL
+        for energy in scf_energies:
+            if abs(energy - reference) < 1e-5:
+                data["electronic_energy"] = energy
+                break
+
+    data["frequencies"] = frequencies
+
+    return data
+
+
+def get_job_info_from_file(outfile:str) -> dict:
+    """
+    Get the size, settings and timing of a Jaguar job from its output file (used to model job runtimes)
+
+    Output:
+    - (dict): keywords of the &gen section, number of atoms, electrons and basis functions, number of
+      threads, number of optimization steps or IRC points and elapsed time in seconds (None if the
+      job did not finish)
+
+    Every IRC point is also printed as an optimization step, so IRC jobs count their points (the
+    transition state and every "IRC point found") and other jobs count their optimization steps.
+    """
+    info = {
+        "keywords": {}, "num_atoms": None, "num_electrons": None, "num_basis_functions": None,
+        "num_threads": None, "num_steps": 0, "elapsed": None,
+    }
+    num_opt_steps, num_irc_points = 0, 0
+    section = None
+    with open_text(outfile) as f:
+        for line in f:
+            if section == "gen":
+                if "Contents end" in line:
+                    section = None
+                elif "=" in line:
+                    key, value = line.split("=", 1)
+                    info["keywords"][key.strip().lower()] = value.strip()
+            elif section == "geometry":
+                if len(line.split()) == 4:
+                    info["num_atoms"] += 1
+                elif info["num_atoms"]:
+                    section = None
+            elif "Contents start" in line and not info["keywords"]:
+                section = "gen"
+            elif info["num_atoms"] is None and re.search(r"atom\s+x\s+y\s+z", line):
+                info["num_atoms"] = 0
+                section = "geometry"
+            elif info["num_basis_functions"] is None and "number of basis functions" in line:
+                info["num_basis_functions"] = int(line.split()[-1])
+            elif info["num_electrons"] is None and "number of electrons" in line:
+                info["num_electrons"] = int(line.split()[-1])
+            elif info["num_threads"] is None and "Using up to" in line:
+                info["num_threads"] = int(line.split()[3])
+            elif "Geometry optimization step" in line:
+                num_opt_steps += 1
+            elif "IRC point found" in line:
+                num_irc_points += 1
+            elif "Total elapsed time:" in line:
+                info["elapsed"] = float(line.split()[-2])
+
+    if int(info["keywords"].get("irc", 0)):
+        info["num_steps"] = num_irc_points + 1 if num_opt_steps else 0
+    else:
+        info["num_steps"] = num_opt_steps
+
+    return info
+
+
+def get_mols_from_irc(outfile:str, num_atoms:int) -> tuple["Molecule", "Molecule"]:
     """ Get the optimized forward and backward molecules from the transition state """
     
-    with open(outfile, "r") as f:
+    with open_text(outfile) as f:
         lines = f.readlines()
 
     # Get the places to search for the geometry definitions
@@ -40,18 +189,149 @@ def get_mols_from_irc(outfile:str, num_atoms:int) -> tuple[Molecule, Molecule]:
     return forward_molecule, reverse_molecule
 
 
-def get_mol_from_opt(outfile:str, num_atoms:int) -> Molecule:
+def iter_irc_points(outfile:str):
+    """
+    Stream the points of an IRC output one by one, without loading the file into memory
+
+    The geometry and energy of each point are those of the optimization step that found it (the
+    geometry printed before the step header, not the displaced "new geometry" printed after it).
+    The first step is the transition state itself.
+
+    Yields:
+    - (dict): direction ("ts", "forward" or "reverse"), index along the direction, species,
+      coordinates (Angstrom) and total energy (Hartree)
+    """
+    geometry = None
+    reading = None
+    step = None
+    found_ts = False
+    with open_text(outfile) as f:
+        for line in f:
+            if reading is not None:
+                values = line.split()
+                if len(values) == 4:
+                    reading.append(values)
+                    continue
+                geometry = reading
+                reading = None
+
+            if re.search(r"atom\s+x\s+y\s+z", line):
+                reading = list()
+            elif "Geometry optimization step" in line:
+                step = {"geometry": geometry, "energy": None}
+            elif line.strip().startswith("Total energy:") and step is not None and step["energy"] is None:
+                step["energy"] = float(line.split()[2])
+                if not found_ts:
+                    found_ts = True
+                    yield irc_point("ts", 0, step)
+            elif "IRC point found" in line and step is not None:
+                match = re.search(r"(Forward|Reverse)\s+#\s*(\d+)", line)
+                yield irc_point(match.group(1).lower(), int(match.group(2)), step)
+
+
+def irc_point(direction:str, index:int, step:dict) -> dict:
+    """ IRC point yielded by iter_irc_points """
+    return {
+        "direction": direction,
+        "index": index,
+        "species": [re.sub(r"[^a-zA-Z]", "", values[0]) for values in step["geometry"]],
+        "coords": [[float(value) for value in values[1:]] for values in step["geometry"]],
+        "energy": step["energy"],
+    }
+
+
+def get_irc_summary(outfile:str) -> list[tuple[float, float]]:
+    """
+    Reaction coordinate and energy of every point of the "Summary of IRC Reaction Path" table printed at
+    the end of an IRC output (ordered from the reverse end to the forward end), empty if not printed
+    """
+    summary = list()
+    in_table = False
+    for line in read_tail(outfile, TAIL_BYTES * 4):
+        if "Summary of IRC Reaction Path" in line:
+            summary = list()
+            in_table = True
+        elif in_table:
+            values = line.split()
+            if len(values) >= 3 and values[0].isdigit():
+                summary.append((float(values[1]), float(values[2])))
+            elif summary:
+                in_table = False
+
+    return summary
+
+
+def get_mol_from_opt(outfile:str, num_atoms:int) -> "Molecule":
     """ Get Molecule out of a optimizaiton job (TS or Stable Geometry)"""
     
-    with open(outfile, "r") as f:
+    with open_text(outfile) as f:
         lines = f.readlines()
 
     return find_molecule_in_section(lines, len(lines)-1, num_atoms)
 
 
 
-def find_molecule_in_section(lines, starting_place, num_atoms) -> Molecule:
+def count_negative_hessian_eigenvalues(outfile:str):
+    """
+    Number of negative eigenvalues of the last Hessian printed in an optimization output
+    (a converged transition state has exactly one), or None if no Hessian was printed
+    """
+    count = None
+    in_block = False
+    with open_text(outfile) as f:
+        for line in f:
+            if "Hessian eigenvalues:" in line:
+                count = 0
+                in_block = True
+            elif in_block:
+                # the block ends at the first line that is not a row of eigenvalues
+                try:
+                    values = [float(value) for value in line.split()]
+                except ValueError:
+                    values = []
+                if not values:
+                    in_block = False
+                count += sum(1 for value in values if value < 0)
+
+    return count
+
+
+def get_hessian_from_restart(restart_file:str) -> tuple[list, str]:
+    """
+    Get the geometry (&zmat) and the Hessian (&hess section, kept verbatim) out of a Jaguar restart file
+
+    Output:
+    - (list): Cartesian coordinates of each atom
+    - (str): The complete &hess section, or None if the restart file does not hold a Hessian
+    """
+    coords = list()
+    hess_lines = list()
+    section = None
+    with open_text(restart_file) as f:
+        for line in f:
+            stripped = line.strip()
+            if section is None and stripped.startswith("&"):
+                section = stripped[1:].split()[0].lower() if len(stripped) > 1 else None
+                if section == "hess":
+                    hess_lines.append(stripped)
+                continue
+            if stripped.startswith("&"):
+                if section == "hess":
+                    hess_lines.append("&")
+                section = None
+                continue
+
+            if section == "zmat" and stripped:
+                coords.append([float(value) for value in stripped.split()[1:4]])
+            elif section == "hess":
+                hess_lines.append(line.rstrip("\n"))
+
+    return coords, ("\n".join(hess_lines) if hess_lines else None)
+
+
+def find_molecule_in_section(lines, starting_place, num_atoms) -> "Molecule":
     """ Find the first relaxed molecule definition to appear before the given line index """
+    from pymatgen.core.structure import Molecule
 
     # Find the geometry header line
     found = False
@@ -83,14 +363,47 @@ def find_molecule_in_section(lines, starting_place, num_atoms) -> Molecule:
     )
 
 
+def read_tail(outfile:str, num_bytes:int=TAIL_BYTES) -> list[str]:
+    """
+    Read only the last lines of an output file (at most num_bytes from its end) instead of the
+    whole file; Jaguar outputs reach hundreds of MB while job results are printed at the end
+    (compressed outputs cannot be seeked in, so they are streamed through instead)
+    """
+    tail, size = read_tail_bytes(outfile, num_bytes)
+
+    lines = tail.decode("utf-8", errors="replace").splitlines()
+
+    # the first line is most likely cut in half unless the whole file was read
+    if size > num_bytes:
+        lines = lines[1:]
+
+    return lines
+
+
 def verify_success(outfile, name):
     """
     Check the outfile for language that verifies that the job was completed successfully
     """
 
-    with open(outfile, "r") as f:
-        lines = f.readlines()
+    lines = read_tail(outfile)
+    if not lines:
+        return None
 
     success_pattern = re.compile(rf'Job {name} completed on')
 
-    return re.match(success_pattern, lines[-1])
\ No newline at end of file
+    return re.match(success_pattern, lines[-1])
+
+
+def verify_cancelled(outfile) -> bool:
+    """
+    Check the end of the outfile for the marker left when a job was killed on purpose
+    """
+    lines = read_tail(outfile)
+    return bool(lines) and lines[-1].startswith(CANCELLED_MARKER)
+
+
+def verify_failure(outfile) -> bool:
+    """
+    Check the end of the outfile for language that shows Jaguar aborted the job
+    """
+    return any(pattern in line for line in read_tail(outfile) for pattern in FAILURE_PATTERNS)
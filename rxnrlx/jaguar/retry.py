@@ -0,0 +1,164 @@
+"""
+Retry policy for failed Jaguar jobs
+
+When a job fails, the reason is parsed from the end of its output file and the next escalation
+step configured for that failure type is applied to the job before it is run again.
+The policy is read from the optional `retry` section of the config file:
+
+retry:
+  max_attempts: 3                   # total number of runs per job (including the first one)
+  escalation:                       # steps tried in order for each type of failure
+    geometry_convergence: [restart_from_last_geometry, increase_max_iterations, recompute_hessian]
+    scf_convergence: [tighten_scf, increase_max_iterations]
+    unknown: [restart_from_last_geometry]
+  steps:                            # optional: change the Jaguar keywords a built-in step sets
+    tighten_scf: {vshift: 0.5}
+    my_step: {maxitg: 1000}         # or define new steps as plain keyword overrides
+"""
+import copy, re
+
+from rxnrlx.jaguar.read_files import read_tail, get_mol_from_opt
+
+# Types of failure recognized in Jaguar output files (checked in order)
+FAILURE_PATTERNS = {
+    "geometry_convergence": [
+        re.compile(r"maximum number of iterations reached"),
+        re.compile(r"geometry optimization failed to converge"),
+    ],
+    "scf_convergence": [
+        re.compile(r"SCF.*(fail|not).*converge", re.IGNORECASE),
+        re.compile(r"convergence failure", re.IGNORECASE),
+    ],
+}
+
+# Jaguar keyword changes made by the built-in escalation steps (can be overridden in the config)
+DEFAULT_STEPS = {
+    "restart_from_last_geometry": {},
+    "tighten_scf": {"iacc": 2, "vshift": 0.3},
+    # start from a quantum mechanical Hessian and recompute it every 10 geometry steps
+    "recompute_hessian": {"inhess": 4, "nhesref": 10},
+    "increase_max_iterations": {},
+}
+
+DEFAULT_POLICY = {
+    "max_attempts": 3,
+    "escalation": {
+        "geometry_convergence": ["restart_from_last_geometry", "increase_max_iterations", "recompute_hessian"],
+        "scf_convergence": ["tighten_scf", "increase_max_iterations"],
+        "unknown": ["restart_from_last_geometry"],
+    },
+    "steps": {},
+}
+
+# Default values of the iteration limits that increase_max_iterations doubles
+DEFAULT_MAXITG = 100
+DEFAULT_MAXIT = 48
+
+
+def load_retry_policy(retry_config:dict=None) -> dict:
+    """
+    Combine the user-specified retry section with the default policy.
+    Without a retry section, jobs are run exactly once.
+    """
+    if not retry_config:
+        return {**DEFAULT_POLICY, "max_attempts": 1}
+
+    policy = copy.deepcopy(DEFAULT_POLICY)
+    policy["max_attempts"] = retry_config.get("max_attempts", policy["max_attempts"])
+    policy["escalation"].update(retry_config.get("escalation", {}))
+    policy["steps"].update(retry_config.get("steps", {}))
+
+    for failure, steps in policy["escalation"].items():
+        for step in steps:
+            if step not in DEFAULT_STEPS and step not in policy["steps"]:
+                raise Exception(f"Unrecognized retry step '{step}' for failure type '{failure}'")
+
+    return policy
+
+
+def classify_failure(outfile:str) -> str:
+    """
+    Find out why a job failed from the end of its output file
+    """
+    try:
+        lines = read_tail(outfile)
+    except OSError:
+        return "unknown"
+
+    for failure, patterns in FAILURE_PATTERNS.items():
+        for line in lines:
+            if any(re.search(pattern, line) for pattern in patterns):
+                return failure
+
+    return "unknown"
+
+
+def is_optimization(parameters:dict) -> bool:
+    """ Whether a job optimizes its structure (a minimum or a transition state search) """
+    return int(parameters.get("igeopt", 0)) != 0
+
+
+def apply_step(step:str, job:dict, outfile:str, failure:str, policy:dict) -> dict:
+    """
+    Create the next attempt of a job by applying one escalation step to it
+    """
+    parameters = dict(job["parameters"])
+    structure = job["structure"]
+
+    if step == "restart_from_last_geometry" and not is_optimization(parameters):
+        # the last geometry of an IRC is a point of the path, not the TS the job started from
+        print(f"{job['name']} is not a geometry optimization, restarting it from its previous structure")
+
+    elif step == "restart_from_last_geometry":
+        try:
+            last_geometry = get_mol_from_opt(outfile, len(structure))
+        except (IndexError, ValueError, OSError):
+            print(f"No geometry found in {outfile}, restarting {job['name']} from its previous structure")
+        else:
+            last_geometry.set_charge_and_spin(charge=structure.charge, spin_multiplicity=structure.spin_multiplicity)
+            structure = last_geometry
+
+    elif step == "increase_max_iterations":
+        if failure == "scf_convergence":
+            parameters["maxit"] = 2 * int(parameters.get("maxit", DEFAULT_MAXIT))
+        else:
+            parameters["maxitg"] = 2 * int(parameters.get("maxitg", DEFAULT_MAXITG))
+
+    parameters.update(DEFAULT_STEPS.get(step, {}))
+    parameters.update(policy["steps"].get(step, {}))
+
+    # extra input sections (like a Hessian) belong to the previous geometry
+    sections = job.get("sections") if structure is job["structure"] else None
+
+    return {**job, "parameters": parameters, "structure": structure, "sections": sections}
+
+
+def next_attempt(job:dict, outfile:str, policy:dict):
+    """
+    Decide how a failed job should be retried
+
+    Inputs:
+    - job (dict): Job specification (name, structure, parameters and the history of its retries)
+    - outfile (str): Output file of the failed attempt
+    - policy (dict): Retry policy created by load_retry_policy
+
+    Output:
+    - (dict): Job specification for the next attempt, or None if the job should not be retried
+    """
+    history = job.get("history", [])
+    if len(history) + 1 >= policy["max_attempts"]:
+        return None
+
+    failure = classify_failure(outfile)
+    steps = policy["escalation"].get(failure, [])
+    num_tried = sum(1 for previous_failure, _ in history if previous_failure == failure)
+    if num_tried >= len(steps):
+        return None
+
+    step = steps[num_tried]
+    print(f"{job['name']} failed ({failure}), retrying with: {step}")
+
+    retry_job = apply_step(step, job, outfile, failure, policy)
+    retry_job["history"] = history + [(failure, step)]
+
+    return retry_job
@@ -0,0 +1,107 @@
+"""
+Full IRC trajectories: every point of an IRC output as arrays ordered along the reaction path
+
+The points are streamed from the output file (see iter_irc_points) and ordered from the reverse
+end through the transition state to the forward end. The reaction coordinate is taken from the
+summary table Jaguar prints at the end of the job (the cumulative distance between the points, in
+Angstrom, with the transition state at zero is used when the table is missing).
+
+Trajectories are written as NumPy (.npz), HDF5 (.h5/.hdf5, requires h5py) or multi-frame XYZ files.
+"""
+import os
+import numpy as np
+
+from rxnrlx.jaguar.read_files import get_irc_summary, iter_irc_points
+
+# Name of the trajectory written by the irc stage next to irc.out
+TRAJECTORY_FILENAME = "irc_trajectory.npz"
+
+
+def read_irc_trajectory(outfile:str) -> dict:
+    """
+    Read every point of an IRC output into a trajectory
+
+    Output:
+    - (dict): species (list[str]), coords (n_points x n_atoms x 3, Angstrom), energies (Hartree),
+      reaction_coordinate and direction (-1 reverse, 0 transition state, 1 forward) of each point
+    """
+    branches = {"reverse": [], "ts": [], "forward": []}
+    species = None
+    for point in iter_irc_points(outfile):
+        species = species or point["species"]
+        branches[point["direction"]].append(point)
+    if not branches["ts"]:
+        raise Exception(f"No IRC points found in {outfile}")
+
+    path = branches["reverse"][::-1] + branches["ts"][:1] + branches["forward"]
+    direction = np.array([-1] * len(branches["reverse"]) + [0] + [1] * len(branches["forward"]))
+    coords = np.array([point["coords"] for point in path])
+    energies = np.array([point["energy"] for point in path])
+
+    summary = get_irc_summary(outfile)
+    if len(summary) == len(path):
+        reaction_coordinate = np.array([coordinate for coordinate, _ in summary])
+    else:
+        steps = np.sqrt(((coords[1:] - coords[:-1]) ** 2).sum(axis=(1, 2)))
+        distance = np.concatenate([[0.0], np.cumsum(steps)])
+        reaction_coordinate = distance - distance[len(branches["reverse"])]
+
+    return {
+        "species": species,
+        "coords": coords,
+        "energies": energies,
+        "reaction_coordinate": reaction_coordinate,
+        "direction": direction,
+    }
+
+
+def write_trajectory(trajectory:dict, output_file:str):
+    """
+    Write a trajectory, the format is chosen by the extension: .npz, .h5/.hdf5 or .xyz (multi-frame)
+    """
+    extension = os.path.splitext(output_file)[1].lower()
+
+    if extension == ".npz":
+        arrays = {key: np.asarray(value) for key, value in trajectory.items()}
+        with open(output_file, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    elif extension in [".h5", ".hdf5"]:
+        try:
+            import h5py
+        except ImportError:
+            raise Exception("Writing HDF5 trajectories requires h5py (pip install h5py)")
+        with h5py.File(output_file, "w") as f:
+            for key, value in trajectory.items():
+                if key == "species":
+                    f.create_dataset(key, data=np.asarray(value, dtype="S"))
+                else:
+                    f.create_dataset(key, data=np.asarray(value), compression="gzip")
+
+    elif extension == ".xyz":
+        with open(output_file, "w") as f:
+            for i in range(len(trajectory["energies"])):
+                f.write(f"{len(trajectory['species'])}\n")
+                f.write(f"point {i} reaction_coordinate {trajectory['reaction_coordinate'][i]:.5f} "
+                        f"energy {trajectory['energies'][i]:.8f}\n")
+                for element, (x, y, z) in zip(trajectory["species"], trajectory["coords"][i]):
+                    f.write(f"{element:<3s} {x:15.10f} {y:15.10f} {z:15.10f}\n")
+
+    else:
+        raise Exception(f"Unrecognized trajectory format: '{extension}', please choose .npz, .h5 or .xyz")
+
+
+def load_trajectory(trajectory_file:str) -> dict:
+    """ Open a trajectory written by write_trajectory (.npz or HDF5) """
+    if trajectory_file.lower().endswith(".npz"):
+        with np.load(trajectory_file) as data:
+            trajectory = {key: data[key] for key in data.files}
+    else:
+        import h5py
+
+        with h5py.File(trajectory_file, "r") as f:
+            trajectory = {key: f[key][()] for key in f.keys()}
+        trajectory["species"] = trajectory["species"].astype(str)
+
+    trajectory["species"] = trajectory["species"].tolist()
+    return trajectory
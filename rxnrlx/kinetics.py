@@ -0,0 +1,344 @@
+"""
+Rate constants and microkinetic modeling on top of the energetics written by refine.py
+
+Rate constants come from transition state theory (Eyring equation), optionally with a tunneling
+correction computed from the imaginary frequency of the transition state:
+- "wigner": k = 1 + (h nu / kT)^2 / 24
+- "bell": k = (u/2) / sin(u/2) with u = h nu / kT (the truncated Bell correction, valid for u < 2 pi)
+
+As in refine.py, the "forward" reaction of a folder goes from the REVERSE structure (reactant) to the
+FORWARD structure (product). Concentrations in the microkinetic model are in units of the standard
+state the free energies were computed in, so no concentration prefactor is applied to the rates.
+
+--- Example Network File ---
+network:
+    campaign_root: ./campaign           # folder holding the reaction folders referenced below
+    temperature: 298.15
+    time: 3600                          # seconds
+    tunneling: wigner
+    initial:
+        A: 1.0
+        B: 0.5
+    reactions:
+        - folder: rxn1                  # barriers from rxn1/**/energy.yaml
+          reactants: [A, B]
+          products: [C]
+        - reactants: [C]                # or barriers given directly in eV
+          products: [D]
+          forward_barrier: 0.85
+          reverse_barrier: 1.10
+          imaginary_frequency: 1250     # cm^-1, optional (only used for tunneling)
+"""
+import os
+import numpy as np
+
+from rxnrlx.common.compression import exists
+from rxnrlx.common.constants import HARTREE_TO_EV
+from rxnrlx.harvest import harvest
+from rxnrlx.jaguar.read_files import find_output
+from rxnrlx.thermo import SPECIES_OUTFILES, find_energy_folders, load_thermo_data, reaction_thermo
+
+KB_EV = 8.617333262e-5         # eV/K
+KB = 1.380649e-23              # J/K
+H = 6.62607015e-34             # J s
+C = 2.99792458e10              # cm/s
+
+
+def tunneling_correction(method:str, imaginary_frequency, temperatures):
+    """
+    Tunneling transmission coefficient for each (frequency, temperature) pair
+
+    Inputs:
+    - method (str): None, "wigner" or "bell"
+    - imaginary_frequency (float or array): Magnitude of the TS imaginary frequency in cm^-1
+    - temperatures (float or array): Temperatures in K
+    """
+    frequency = np.abs(np.asarray(imaginary_frequency, dtype=float))[..., None]
+    u = H * C * frequency / (KB * np.asarray(temperatures, dtype=float))
+
+    if method is None:
+        return np.ones_like(u)
+    if method == "wigner":
+        return 1 + u**2 / 24
+    if method == "bell":
+        if np.any(u >= 2 * np.pi):
+            raise Exception("The Bell tunneling correction is only valid above T = h nu / (2 pi k)")
+        return (u / 2) / np.sin(u / 2)
+
+    raise Exception(f"Unrecognized tunneling correction: '{method}', please choose 'wigner' or 'bell'")
+
+
+def eyring(barriers, temperatures, tunneling:str=None, imaginary_frequencies=None):
+    """
+    Eyring rate constants (1/s) for a set of free energy barriers over a temperature grid
+
+    Inputs:
+    - barriers (array): Free energy barriers in eV, either one per reaction (n,) or already
+      evaluated on the temperature grid (n, num_temperatures)
+    - temperatures (array): Temperatures in K
+    - tunneling (str): Optional tunneling correction ("wigner" or "bell")
+    - imaginary_frequencies (array): TS imaginary frequency of each reaction in cm^-1 (needed for tunneling)
+
+    Output:
+    - (array): Rate constants of shape (n, num_temperatures)
+    """
+    T = np.atleast_1d(np.asarray(temperatures, dtype=float))
+    barriers = np.asarray(barriers, dtype=float)
+    if barriers.ndim < 2:
+        barriers = np.atleast_1d(barriers)[:, None]
+
+    rates = KB * T / H * np.exp(-barriers / (KB_EV * T))
+
+    if tunneling is not None:
+        if imaginary_frequencies is None:
+            raise Exception("Tunneling corrections need the imaginary frequency of each transition state")
+        rates = rates * tunneling_correction(tunneling, np.atleast_1d(imaginary_frequencies), T)
+
+    return rates
+
+
+def imaginary_frequency(energy_folder:str):
+    """
+    Imaginary frequency (cm^-1, as a positive number) of the transition state of a reaction, or None
+    """
+    ts_outfile = find_output(os.path.join(energy_folder, SPECIES_OUTFILES["transition_state"]))
+    if not exists(ts_outfile):
+        return None
+
+    frequencies = load_thermo_data(ts_outfile)["frequencies"]
+    if not frequencies or min(frequencies) >= 0:
+        return None
+
+    return -min(frequencies)
+
+
+def reaction_rates(
+        campaign_root:str, temperatures, tunneling:str=None, use_thermo:bool=False, qrrho:str=None
+    ) -> dict:
+    """
+    Forward and reverse rate constants of every reaction in a campaign folder
+
+    Inputs:
+    - campaign_root (str): Folder holding one subfolder per reaction
+    - temperatures (array): Temperatures in K
+    - tunneling (str): Optional tunneling correction ("wigner" or "bell")
+    - use_thermo (bool): Recompute the barriers at every temperature from the frequency jobs
+      (see rxnrlx.thermo) instead of using the free energies of energy.yaml at the job temperature
+    - qrrho (str): Quasi-RRHO treatment used when use_thermo is True
+
+    Output:
+    - (dict): For each reaction the forward/reverse barriers (eV) and rate constants (1/s) per temperature
+    """
+    T = np.atleast_1d(np.asarray(temperatures, dtype=float))
+    energy_folders = find_energy_folders(campaign_root)
+
+    barriers = dict()
+    if use_thermo:
+        for reaction, energy_folder in energy_folders.items():
+            try:
+                info = reaction_thermo(energy_folder, T, qrrho=qrrho)["Reaction Info (eV)"]
+            except Exception as e:
+                print(f"WARNING: skipping {reaction}: {e}")
+                continue
+            barriers[reaction] = (info["Forward Activation Barrier"], info["Reverse Activation Barrier"])
+    else:
+        # barriers are recomputed from the free energies in Hartrees rather than read from the eV summary
+        for reaction, energy_info in harvest(campaign_root).items():
+            barriers[reaction] = (
+                (energy_info["transition_state"] - energy_info["reverse"]) * HARTREE_TO_EV,
+                (energy_info["transition_state"] - energy_info["forward"]) * HARTREE_TO_EV,
+            )
+
+    results = dict()
+    for reaction, (forward_barrier, reverse_barrier) in barriers.items():
+        frequency = None
+        if tunneling is not None:
+            frequency = imaginary_frequency(energy_folders[reaction]) if reaction in energy_folders else None
+            if frequency is None:
+                print(f"WARNING: no imaginary frequency found for {reaction}, skipping it")
+                continue
+
+        forward_barrier = np.broadcast_to(forward_barrier, T.shape)
+        reverse_barrier = np.broadcast_to(reverse_barrier, T.shape)
+        results[reaction] = {
+            "temperature": T,
+            "forward_barrier": forward_barrier,
+            "reverse_barrier": reverse_barrier,
+            "forward": eyring(forward_barrier[None, :], T, tunneling, frequency)[0],
+            "reverse": eyring(reverse_barrier[None, :], T, tunneling, frequency)[0],
+            "imaginary_frequency": frequency,
+        }
+
+    return results
+
+
+def rank_reactions(rates:dict, temperature_index:int=0) -> list[tuple]:
+    """
+    Order reactions from the fastest to the slowest forward rate at one temperature of the grid
+    """
+    return sorted(
+        ((reaction, info["forward"][temperature_index]) for reaction, info in rates.items()),
+        key=lambda item: item[1],
+        reverse=True
+    )
+
+
+def build_network(reactions:list[dict], species:list[str]=None) -> dict:
+    """
+    Create the arrays describing a mass action reaction network
+
+    Inputs:
+    - reactions (list[dict]): Each with "reactants" and "products" (lists of species names, repeated
+      for stoichiometric coefficients above one) and the rate constants "kf" and "kr" (1/s)
+    - species (list[str]): Optional ordering of the species (default: order of appearance)
+
+    Output:
+    - (dict): species, padded reactant/product index arrays, rate constants and the sparse
+      stoichiometry matrix (num_species x num_reactions)
+    """
+    from scipy import sparse
+
+    if species is None:
+        species = list(dict.fromkeys(
+            name for reaction in reactions for name in reaction["reactants"] + reaction["products"]
+        ))
+    index = {name: i for i, name in enumerate(species)}
+    num_species = len(species)
+
+    # Pad the participant lists with an index pointing at a constant concentration of one
+    def padded(key):
+        width = max(len(reaction[key]) for reaction in reactions)
+        array = np.full((len(reactions), width), num_species, dtype=int)
+        for j, reaction in enumerate(reactions):
+            array[j, :len(reaction[key])] = [index[name] for name in reaction[key]]
+        return array
+
+    rows, cols, values = list(), list(), list()
+    for j, reaction in enumerate(reactions):
+        for name in reaction["reactants"]:
+            rows.append(index[name]); cols.append(j); values.append(-1.0)
+        for name in reaction["products"]:
+            rows.append(index[name]); cols.append(j); values.append(1.0)
+
+    stoichiometry = sparse.csr_matrix((values, (rows, cols)), shape=(num_species, len(reactions)))
+
+    return {
+        "species": species,
+        "reactants": padded("reactants"),
+        "products": padded("products"),
+        "kf": np.array([reaction["kf"] for reaction in reactions], dtype=float),
+        "kr": np.array([reaction["kr"] for reaction in reactions], dtype=float),
+        "stoichiometry": stoichiometry,
+    }
+
+
+def network_rates(network:dict, concentrations) -> np.ndarray:
+    """
+    Net rate of every reaction of the network for the given concentrations
+    """
+    extended = np.append(concentrations, 1.0)
+    forward = network["kf"] * np.prod(extended[network["reactants"]], axis=1)
+    reverse = network["kr"] * np.prod(extended[network["products"]], axis=1)
+    return forward - reverse
+
+
+def network_jacobian(network:dict, concentrations):
+    """
+    Sparse Jacobian of the species production rates with respect to the concentrations
+    """
+    from scipy import sparse
+
+    num_species = len(network["species"])
+    extended = np.append(concentrations, 1.0)
+
+    rows, cols, values = list(), list(), list()
+    for participants, k, sign in [(network["reactants"], network["kf"], 1.0), (network["products"], network["kr"], -1.0)]:
+        factors = extended[participants]
+        for slot in range(participants.shape[1]):
+            # derivative of k * prod(c) with respect to the species in this slot
+            others = np.prod(np.delete(factors, slot, axis=1), axis=1)
+            mask = participants[:, slot] < num_species
+            rows.append(np.nonzero(mask)[0])
+            cols.append(participants[mask, slot])
+            values.append(sign * (k * others)[mask])
+
+    rate_jacobian = sparse.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(len(network["kf"]), num_species)
+    )
+
+    return network["stoichiometry"] @ rate_jacobian
+
+
+def integrate_network(network:dict, initial:dict, time:float, num_points:int=200, method:str="BDF") -> dict:
+    """
+    Integrate the microkinetic model of a reaction network with a stiff solver
+
+    Inputs:
+    - network (dict): Network created by build_network
+    - initial (dict): Initial concentration of each species (missing species start at zero)
+    - time (float): Length of the simulation in seconds
+    - num_points (int): Number of (log-spaced) output times
+    - method (str): scipy.integrate.solve_ivp method (a stiff method: BDF, Radau or LSODA)
+
+    Output:
+    - (dict): Output times, species names and concentrations (num_species x num_times)
+    """
+    from scipy.integrate import solve_ivp
+
+    y0 = np.array([initial.get(name, 0.0) for name in network["species"]], dtype=float)
+    stoichiometry = network["stoichiometry"]
+
+    times = np.concatenate([[0.0], np.geomspace(time * 1e-9, time, num_points - 1)])
+    solution = solve_ivp(
+        lambda t, y: stoichiometry @ network_rates(network, y),
+        (0.0, time), y0, method=method, t_eval=times,
+        jac=lambda t, y: network_jacobian(network, y),
+        rtol=1e-6, atol=1e-12
+    )
+    if not solution.success:
+        raise Exception(f"Microkinetic integration failed: {solution.message}")
+
+    return {
+        "time": solution.t,
+        "species": network["species"],
+        "concentrations": solution.y,
+    }
+
+
+def run_network(network_config:dict) -> dict:
+    """
+    Build and integrate the microkinetic model described in the network section of a config file
+    """
+    temperature = network_config.get("temperature", 298.15)
+    tunneling = network_config.get("tunneling")
+
+    rates = dict()
+    if any("folder" in reaction for reaction in network_config["reactions"]):
+        rates = reaction_rates(
+            network_config["campaign_root"], [temperature], tunneling=tunneling,
+            use_thermo=network_config.get("use_thermo", False), qrrho=network_config.get("qrrho", "truhlar")
+        )
+
+    reactions = list()
+    for reaction in network_config["reactions"]:
+        if "folder" in reaction:
+            if reaction["folder"] not in rates:
+                raise Exception(f"No energetics found for reaction folder '{reaction['folder']}'")
+            kf = rates[reaction["folder"]]["forward"][0]
+            kr = rates[reaction["folder"]]["reverse"][0]
+        else:
+            frequency = reaction.get("imaginary_frequency")
+            kf, kr = eyring(
+                [reaction["forward_barrier"], reaction["reverse_barrier"]], [temperature],
+                tunneling if frequency is not None else None,
+                None if frequency is None else [frequency, frequency]
+            )[:, 0]
+        reactions.append({"reactants": reaction["reactants"], "products": reaction["products"], "kf": kf, "kr": kr})
+
+    network = build_network(reactions)
+
+    return integrate_network(
+        network, network_config.get("initial", {}), network_config["time"],
+        num_points=network_config.get("num_points", 200)
+    )
@@ -4,32 +4,51 @@ The options for this file should be as follow:
 - Reoptimize the molecules with a new functional/basis set
 - Calculate Gibbs Free Energies
 """
-from pymatgen.core.structure import Molecule
 
-from rxnrlx.common.constants import FWD_FILENAME, REV_FILENAME, TS_FILENAME
+from rxnrlx.common.compression import read_molecule
+from rxnrlx.common.constants import FWD_FILENAME, HARTREE_TO_EV, REV_FILENAME, TS_FILENAME
+from rxnrlx.common.context import JobContext
+from rxnrlx.common.results import ReactionResult, ResultWriter, save, write_energy_file, write_structures
+from rxnrlx.common.utils import load_config
+from rxnrlx.symmetry import load_symmetry_settings
 
-import os, sys, yaml
+import sys, time
 
-def refine(config):
+def refine(config, context:JobContext=None, reaction:ReactionResult=None, writer:ResultWriter=None) -> ReactionResult:
     """
     The options for this file should be as follow:
     - Reoptimize the molecules with a new functional/basis set
     - Calculate Gibbs Free Energies
+
+    Paths in the config are relative to the context folder (default: current working directory)
+
+    The structures are taken from the result of ts2rxn if one is given (the info section then needs
+    neither old_job_folder nor structure files). Returns the reaction with its energies; the refined
+    structures and energy.yaml are written through the writer (default: right away)
     """ 
+    context = context if context is not None else JobContext()
 
-    # User has the option to specify the old job folder or individual molecules
+    # User has the option to pass the result of ts2rxn, specify the old job folder or individual molecules
     # If they specify the old_job_folder, this program will grab the species from the final_structures subfolder
-    if "old_job_folder" in config["info"]:
-        os.chdir(config["info"]["old_job_folder"])
-        forward_molecule = Molecule.from_file(f'./final_structures/{FWD_FILENAME}')
-        reverse_molecule = Molecule.from_file(f'./final_structures/{REV_FILENAME}')
-        transition_state = Molecule.from_file(f'./final_structures/{TS_FILENAME}')
+    if reaction is not None:
+        job_folder = reaction.context
+        # copies, since the charge and multiplicity are set below
+        forward_molecule = reaction.structures["forward"].copy()
+        reverse_molecule = reaction.structures["reverse"].copy()
+        transition_state = reaction.structures["transition_state"].copy()
+
+    elif "old_job_folder" in config["info"]:
+        job_folder = JobContext(context.path(config["info"]["old_job_folder"]))
+        forward_molecule = read_molecule(job_folder.path("final_structures", FWD_FILENAME))
+        reverse_molecule = read_molecule(job_folder.path("final_structures", REV_FILENAME))
+        transition_state = read_molecule(job_folder.path("final_structures", TS_FILENAME))
 
     else: # In the event they did not specify the job folder, they should have specified 3 file locations where the molecules are located
         if ("forward" in config["info"]) and ("reverse" in config["info"]) and ("transition_state" in config["info"]):
-            forward_molecule = Molecule.from_file(config["info"]["forward"])
-            reverse_molecule = Molecule.from_file(config["info"]["reverse"])
-            transition_state = Molecule.from_file(config["info"]["transition_state"])
+            job_folder = context
+            forward_molecule = read_molecule(context.path(config["info"]["forward"]))
+            reverse_molecule = read_molecule(context.path(config["info"]["reverse"]))
+            transition_state = read_molecule(context.path(config["info"]["transition_state"]))
 
         else:
             raise Exception("The info section of the config file should contain either {\'old_job_folder\'} or {\'forward\', \'reverse\', and \'transition_state\'}")
@@ -47,19 +66,32 @@ def refine(config):
     else:
         raise NotImplementedError()
     
-    os.mkdir("./refine_structures")
-    os.chdir("./refine_structures")
+    # Optional symmetry analysis (the species registry is shared by the reactions of a campaign)
+    symmetry = load_symmetry_settings(config.get("symmetry"))
+    if symmetry is not None and symmetry["registry"]:
+        symmetry["registry"] = context.path(symmetry["registry"])
+
+    # an existing folder is only reused when resuming (e.g. a task re-run after its worker crashed)
+    refine_folder = job_folder.subcontext(
+        "refine_structures", exist_ok=config["info"].get("resume", False),
+        scratch=config["info"].get("scratch"), sample_interval=config["info"].get("resource_interval")
+    )
+    energy_folder = refine_folder
+    timings = dict(reaction.timings) if reaction is not None else dict()
 
     # If user requests re-optimization of the inputs:
     if config["info"]["reoptimize"]:
         stable_refined = False
         ts_refined = False
+        start_time = time.time()
         try:
             # Relax TS with new level of theory
             transition_state = ts_relax(
                 ts_guess=transition_state, 
                 user_parameters=config.get("ts_relax", {}),
-                num_tasks=config["info"].get("ntasks", 2)
+                num_tasks=config["info"].get("ntasks", 2),
+                retry_policy=config.get("retry"),
+                context=refine_folder
             )
         except:
             if config["info"].get("die_on_ts_failure", True):
@@ -68,14 +100,19 @@ def refine(config):
                 print("TS Optimization failed, keeping original geometry for energy calculation")
         else:
             ts_refined = True # New TS was optimized with this level of theory
+        timings["refine/ts_relax"] = time.time() - start_time
         
         # Optimize stable reactant and product with new level of theory 
+        start_time = time.time()
         try:
             forward_molecule, reverse_molecule = geom_opt(
                 forward_molecule=forward_molecule,
                 reverse_molecule=reverse_molecule,
                 user_parameters=config.get("geom_opt", {}),
-                num_tasks=config["info"].get("ntasks", 2)
+                num_tasks=config["info"].get("ntasks", 2),
+                retry_policy=config.get("retry"),
+                context=refine_folder,
+                symmetry=symmetry
             )
         except:
             if config["info"].get("die_on_ts_failure", True):
@@ -84,29 +121,35 @@ def refine(config):
                 print("Stable Geometry Optimizations Failed, keeping original geometries for energy calculation")
         else:
             stable_refined = True # New stable geometries optimized with this level of theory
+        timings["refine/geom_opt"] = time.time() - start_time
 
         ## Save refined structures
-        os.mkdir("./final_structures")
-        os.chdir("./final_structures")
+        energy_folder = refine_folder.subcontext("final_structures", exist_ok=True)
+        refined = dict()
         if stable_refined:
-            forward_molecule.to(FWD_FILENAME)
-            reverse_molecule.to(REV_FILENAME)
+            refined.update(forward=forward_molecule, reverse=reverse_molecule)
         if ts_refined:
-            transition_state.to(TS_FILENAME)
+            refined["transition_state"] = transition_state
+        save(writer, write_structures, refined, energy_folder.folder)
 
     # Next run the energetic calculations
+    start_time = time.time()
     energy_info = calculate_gibbs(
         forward_molecule=forward_molecule, 
         reverse_molecule=reverse_molecule, 
         transition_state=transition_state, 
         user_parameters=config.get("energy"), 
-        num_tasks=config["info"].get("ntasks")
+        num_tasks=config["info"].get("ntasks"),
+        retry_policy=config.get("retry"),
+        context=energy_folder,
+        symmetry=symmetry
         )
+    timings["refine/calculate_gibbs"] = time.time() - start_time
     
     # Get reaction energetic information in electron Volts (eV)
-    dG = (energy_info["forward"] - energy_info["reverse"]) * 27.114 
-    barrier = (energy_info["transition_state"] - energy_info["reverse"]) * 27.114 
-    reverse_barrier = (energy_info["transition_state"] - energy_info["forward"]) * 27.114 
+    dG = (energy_info["forward"] - energy_info["reverse"]) * HARTREE_TO_EV
+    barrier = (energy_info["transition_state"] - energy_info["reverse"]) * HARTREE_TO_EV
+    reverse_barrier = (energy_info["transition_state"] - energy_info["forward"]) * HARTREE_TO_EV
 
     energy_info["Reaction Info (eV)"] = {
         "Delta G": dG, 
@@ -114,25 +157,28 @@ def refine(config):
         "Reverse Activation Barrier": reverse_barrier
         }
 
+    save(writer, write_energy_file, energy_info, energy_folder.path("energy.yaml"))
 
+    paths = dict(reaction.paths) if reaction is not None else {"job_folder": job_folder.folder}
+    paths.update(refine_folder=refine_folder.folder, energy_file=energy_folder.path("energy.yaml"))
+    if config["info"]["reoptimize"]:
+        paths["refined_structures"] = energy_folder.folder
 
-    with open("energy.yaml", 'w') as f:
-        yaml.dump(energy_info, f, default_flow_style=False)
+    return ReactionResult(
+        structures={"forward": forward_molecule, "reverse": reverse_molecule, "transition_state": transition_state},
+        context=job_folder,
+        energies=energy_info,
+        timings=timings,
+        paths=paths
+    )
 
 
 if __name__ == "__main__":
-    """ Read in Command Line Arguments """
-    if len(sys.argv) == 2:
-        print(f"Configuration File: {sys.argv[1]}")
-        try:
-            with open(sys.argv[1], "r") as f:
-                config = yaml.safe_load(f)
-        except:
-            raise Exception("Invalid File Specified")
-    else:
+    """ Read in Command Line Arguments (equivalent to `rxnrlx refine <config_file.yaml>`) """
+    if len(sys.argv) != 2:
         error_message = [f"Invalid number of arguments ({len(sys.argv)}).",
-                         "Use format: ts2rxn.py <config_file.yaml>"]
+                         "Use format: refine.py <config_file.yaml>"]
         raise Exception("\n".join(error_message))
-        
+
     # Run main code
-    refine(config)
\ No newline at end of file
+    refine(load_config(sys.argv[1]))
\ No newline at end of file
@@ -0,0 +1,326 @@
+"""
+Predict the runtime of Jaguar jobs from the timings of finished jobs in previous campaigns
+
+The runtime of a job is modelled as (number of steps) x (time per step):
+- the time per step is a least squares fit in log space, shared by all job types, of
+      log(elapsed / steps) = c_type + a log(basis functions) + b log(electrons) + c log(atoms) + d log(threads)
+- the number of steps (optimization steps or IRC points, 1 for other jobs) of a job type is
+  predicted by its geometric mean over the training jobs
+
+Upcoming jobs have no output yet, so their number of basis functions is estimated from the
+number of basis functions per electron seen for the same basis set.
+
+The job outputs are parsed once and cached in the campaign folder (.rxnrlx_timings.json).
+"""
+import json, os
+import numpy as np
+
+from rxnrlx.common.compression import file_stat, list_files
+from rxnrlx.jaguar.read_files import get_job_info_from_file, verify_success
+
+CACHE_FILENAME = ".rxnrlx_timings.json"
+CACHE_VERSION = 2
+
+# Workflow stage running each type of job
+JOB_TYPES = ["ts_relax", "irc", "geom_opt", "calculate_gibbs", "single_point"]
+
+# Config section holding the Jaguar keywords of each stage
+CONFIG_SECTIONS = {
+    "ts_relax": "ts_relax",
+    "irc": "irc",
+    "geom_opt": "geom_opt",
+    "calculate_gibbs": "energy",
+}
+
+
+def job_type(keywords:dict) -> str:
+    """ Classify a job from the keywords of its &gen section """
+    if int(keywords.get("irc", 0)):
+        return "irc"
+    if int(keywords.get("igeopt", 0)) == 2:
+        return "ts_relax"
+    if int(keywords.get("igeopt", 0)) == 1:
+        return "geom_opt"
+    if int(keywords.get("ifreq", 0)):
+        return "calculate_gibbs"
+    return "single_point"
+
+
+def timing_record(outfile:str) -> dict:
+    """
+    Features and runtime of a finished job, or None if the job did not complete
+    """
+    name = os.path.basename(outfile)[:-len(".out")]
+    if not verify_success(outfile, name):
+        return None
+
+    info = get_job_info_from_file(outfile)
+    if None in [info["elapsed"], info["num_basis_functions"], info["num_electrons"], info["num_atoms"], info["num_threads"]]:
+        return None
+
+    return {
+        "job_type": job_type(info["keywords"]),
+        "basis": info["keywords"].get("basis", "").lower(),
+        "num_atoms": info["num_atoms"],
+        "num_electrons": info["num_electrons"],
+        "num_basis_functions": info["num_basis_functions"],
+        "num_threads": info["num_threads"],
+        "num_steps": max(info["num_steps"], 1),
+        "elapsed": info["elapsed"],
+    }
+
+
+def collect_timings(campaign_root:str, use_cache:bool=True) -> list[dict]:
+    """
+    Timing records of every finished job in a campaign folder (archived outputs included),
+    only parsing the outputs that changed since the last call
+    """
+    cache_file = os.path.join(campaign_root, CACHE_FILENAME)
+    cache = {"version": CACHE_VERSION, "jobs": {}}
+    if use_cache and os.path.exists(cache_file):
+        with open(cache_file, "r") as f:
+            cached = json.load(f)
+        if cached.get("version") == CACHE_VERSION:
+            cache = cached
+
+    jobs = dict()
+    for dirpath, filenames in list_files(campaign_root).items():
+        for filename in filenames:
+            if not filename.endswith(".out"):
+                continue
+            outfile = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(outfile, campaign_root)
+            stat = file_stat(outfile)
+
+            job = cache["jobs"].get(rel_path)
+            if job is None or job["mtime"] != stat.st_mtime_ns or job["size"] != stat.st_size:
+                job = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "record": timing_record(outfile)}
+            jobs[rel_path] = job
+
+    if use_cache:
+        try:
+            with open(cache_file, "w") as f:
+                json.dump({"version": CACHE_VERSION, "jobs": jobs}, f)
+        except OSError:
+            print(f"WARNING: could not write timing cache {cache_file}")
+
+    return [dict(job["record"], outfile=rel_path) for rel_path, job in sorted(jobs.items()) if job["record"] is not None]
+
+
+def design_matrix(records:list[dict], job_types:list[str]) -> np.ndarray:
+    """ Features of the time per step model (one row per job) """
+    X = np.zeros((len(records), len(job_types) + 4))
+    for i, record in enumerate(records):
+        X[i, job_types.index(record["job_type"])] = 1
+        X[i, len(job_types):] = np.log([
+            record["num_basis_functions"], record["num_electrons"], record["num_atoms"], record["num_threads"]
+        ])
+    return X
+
+
+def fit(records:list[dict]) -> dict:
+    """
+    Fit the runtime model to timing records (see collect_timings)
+
+    Output:
+    - (dict): The model (JSON serializable)
+    """
+    if not records:
+        raise Exception("No finished jobs to fit the runtime model to")
+
+    job_types = [job for job in JOB_TYPES if any(record["job_type"] == job for record in records)]
+    X = design_matrix(records, job_types)
+    y = np.log([record["elapsed"] / record["num_steps"] for record in records])
+    coefficients, *_ = np.linalg.lstsq(X, y, rcond=None)
+    residuals = y - X @ coefficients
+
+    steps = dict()
+    for job in job_types:
+        log_steps = np.log([record["num_steps"] for record in records if record["job_type"] == job])
+        steps[job] = float(np.exp(log_steps.mean()))
+
+    basis_ratio = dict()
+    for basis in {record["basis"] for record in records}:
+        basis_ratio[basis] = float(np.mean([
+            record["num_basis_functions"] / record["num_electrons"] for record in records if record["basis"] == basis
+        ]))
+
+    return {
+        "job_types": job_types,
+        "coefficients": coefficients.tolist(),
+        "log_residual_std": float(residuals.std()),
+        "steps": steps,
+        "basis_functions_per_electron": basis_ratio,
+        "num_records": len(records),
+    }
+
+
+def predict(
+        model:dict, job_type:str, num_atoms:int, num_electrons:int, num_threads:int,
+        num_basis_functions:int=None, basis:str=None, num_steps:int=None
+    ) -> float:
+    """
+    Predict the runtime (seconds) of a job
+
+    Inputs:
+    - model (dict): Model created by fit
+    - job_type (str): One of JOB_TYPES
+    - num_atoms, num_electrons (int): Size of the molecule
+    - num_threads (int): Number of cores the job runs on
+    - num_basis_functions (int): Number of basis functions (estimated from the basis set if not given)
+    - basis (str): Basis set (only used to estimate the number of basis functions)
+    - num_steps (int): Number of steps (default: typical number of steps of this job type)
+    """
+    if job_type not in model["job_types"]:
+        raise Exception(f"The runtime model has not seen any '{job_type}' job (known: {model['job_types']})")
+
+    if num_basis_functions is None:
+        ratios = model["basis_functions_per_electron"]
+        ratio = ratios.get((basis or "").lower(), float(np.mean(list(ratios.values()))))
+        num_basis_functions = ratio * num_electrons
+
+    record = {
+        "job_type": job_type, "num_basis_functions": num_basis_functions, "num_electrons": num_electrons,
+        "num_atoms": num_atoms, "num_threads": num_threads,
+    }
+    time_per_step = np.exp(design_matrix([record], model["job_types"]) @ np.asarray(model["coefficients"]))[0]
+    num_steps = num_steps if num_steps is not None else model["steps"][job_type]
+
+    return float(time_per_step * num_steps)
+
+
+def predict_ts2rxn(model:dict, config:dict, molecule, num_frequency_jobs:int=3) -> dict:
+    """
+    Predict the runtime (seconds) of each stage of ts2rxn and refine for a reaction, following the way
+    the stages split the cores (2 geometry optimizations, the frequency jobs at once)
+
+    Inputs:
+    - model (dict): Model created by fit
+    - config (dict): Config file of the reaction (ntasks and the Jaguar keywords of each stage)
+    - molecule (Molecule): TS guess of the reaction
+    - num_frequency_jobs (int): Number of frequency jobs calculate_gibbs launches (fewer than 3 when
+      species are reused from the symmetry registry, 0 if all of them are)
+    """
+    num_tasks = config["info"].get("ntasks", 2)
+    stages = {
+        "ts_relax": num_tasks,
+        "irc": num_tasks,
+        "geom_opt": max(num_tasks // 2, 1),
+    }
+    if num_frequency_jobs > 0:
+        stages["calculate_gibbs"] = max(num_tasks // num_frequency_jobs, 1)
+
+    predictions = dict()
+    for stage, num_threads in stages.items():
+        if stage in model["job_types"]:
+            predictions[stage] = predict(
+                model, stage, len(molecule), molecule.nelectrons, num_threads,
+                basis=(config.get(CONFIG_SECTIONS[stage]) or {}).get("basis")
+            )
+    predictions["total"] = sum(predictions.values())
+
+    return predictions
+
+
+def schedule(predictions:dict, num_slots:int) -> tuple[list[list[str]], float]:
+    """
+    Pack jobs into parallel slots of an allocation, longest predicted job first
+
+    Inputs:
+    - predictions (dict): Predicted runtime (seconds) of each job by name
+    - num_slots (int): Number of jobs that can run at the same time
+
+    Output:
+    - (list[list[str]]): Jobs of each slot, in the order they should be started
+    - (float): Predicted time (seconds) until every job is done (the walltime to request)
+    """
+    slots = [[] for _ in range(num_slots)]
+    loads = np.zeros(num_slots)
+    for job in sorted(predictions, key=predictions.get, reverse=True):
+        slot = int(np.argmin(loads))
+        slots[slot].append(job)
+        loads[slot] += predictions[job]
+
+    return slots, float(loads.max())
+
+
+def accuracy_report(records:list[dict], test_fraction:float=0.2, seed:int=0) -> dict:
+    """
+    Fit the model on part of the records and measure its accuracy on the held-out rest
+
+    Output:
+    - (dict): Per job type (and "all"): number of test jobs, median absolute percentage error and
+      fraction of jobs predicted within a factor of 2, with the true and with the predicted number of steps
+    """
+    order = np.random.default_rng(seed).permutation(len(records))
+    num_test = max(int(round(test_fraction * len(records))), 1)
+    test = [records[i] for i in order[:num_test]]
+    model = fit([records[i] for i in order[num_test:]])
+    test = [record for record in test if record["job_type"] in model["job_types"]]
+
+    def summary(subset, known_steps):
+        actual = np.array([record["elapsed"] for record in subset])
+        predicted = np.array([
+            predict(model, record["job_type"], record["num_atoms"], record["num_electrons"], record["num_threads"],
+                    num_basis_functions=record["num_basis_functions"],
+                    num_steps=record["num_steps"] if known_steps else None)
+            for record in subset
+        ])
+        ratio = predicted / actual
+        return {
+            "median_abs_pct_error": float(np.median(np.abs(ratio - 1)) * 100),
+            "within_factor_2": float(np.mean((ratio > 0.5) & (ratio < 2))),
+        }
+
+    report = dict()
+    for job in ["all"] + model["job_types"]:
+        subset = [record for record in test if job in ["all", record["job_type"]]]
+        if subset:
+            report[job] = {
+                "num_test": len(subset),
+                "known_steps": summary(subset, True),
+                "predicted_steps": summary(subset, False),
+            }
+
+    return report
+
+
+def print_report(report:dict):
+    """ Print the held-out accuracy of the runtime model """
+    print(f"{'job type':<16s} {'jobs':>5s}  {'median error':>12s} {'within 2x':>10s}  "
+          f"{'median error':>12s} {'within 2x':>10s}")
+    print(f"{'':<16s} {'':>5s}  {'(known number of steps)':>23s}  {'(predicted number of steps)':>27s}")
+    for job, info in report.items():
+        known, predicted = info["known_steps"], info["predicted_steps"]
+        print(f"{job:<16s} {info['num_test']:>5d}  {known['median_abs_pct_error']:>11.1f}% {known['within_factor_2']:>10.0%}  "
+              f"{predicted['median_abs_pct_error']:>11.1f}% {predicted['within_factor_2']:>10.0%}")
+
+
+def train(campaign_roots:list[str], output_file:str=None, test_fraction:float=0.2) -> dict:
+    """
+    Collect the timings of every finished job in the campaign folders, report the held-out accuracy
+    of the runtime model and fit it on all jobs
+
+    Output:
+    - (dict): The runtime model (also written to output_file as JSON if given)
+    """
+    records = list()
+    for campaign_root in campaign_roots:
+        records.extend(collect_timings(campaign_root))
+    print(f"Collected the timings of {len(records)} finished jobs")
+
+    if len(records) >= 5 and test_fraction > 0:
+        print_report(accuracy_report(records, test_fraction))
+
+    model = fit(records)
+    if output_file is not None:
+        with open(output_file, "w") as f:
+            json.dump(model, f, indent=2)
+
+    return model
+
+
+def load_model(model_file:str) -> dict:
+    """ Open a runtime model written by train """
+    with open(model_file, "r") as f:
+        return json.load(f)
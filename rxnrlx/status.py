@@ -0,0 +1,215 @@
+"""
+Report the progress of every reaction in a campaign folder by looking at the Jaguar
+input and output files written by the job stages (jobs running on node-local scratch are
+found through the {name}.staged marker left in their job folder)
+
+Scans are incremental so they are cheap enough to repeat every minute on a login node:
+- directory listings are reused while the directory mtime is unchanged
+- output files are only re-read when their size or mtime changed, and then only their tail
+The results of the previous scan are kept in a cache file at the root of the campaign folder.
+"""
+import json, os, time
+
+from rxnrlx.common.compression import PACK_FILENAME, strip_suffix
+from rxnrlx.common.utils import sec_to_str
+from rxnrlx.jaguar.read_files import verify_cancelled, verify_success, verify_failure
+
+CACHE_FILENAME = ".rxnrlx_status.json"
+CACHE_VERSION = 2
+
+
+def job_state(outfile:str) -> str:
+    """
+    Classify a single Jaguar job from the end of its output file: 'completed', 'failed', 'cancelled'
+    (killed on purpose, e.g. the losers of a race) or 'running'
+    """
+    name = os.path.basename(outfile)[:-len(".out")]
+    if verify_success(outfile, name):
+        return "completed"
+    if verify_failure(outfile):
+        return "failed"
+    if verify_cancelled(outfile):
+        return "cancelled"
+
+    return "running"
+
+
+def scan_directory(path:str, rel_path:str, dir_cache:dict) -> dict:
+    """
+    List the subfolders, input files, output files and scratch markers of a directory,
+    reusing the cached listing if the directory has not changed since the last scan
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = dir_cache.get(rel_path)
+    if cached is not None and cached["mtime"] == mtime:
+        return cached
+
+    listing = {"mtime": mtime, "subdirs": [], "inputs": {}, "outputs": [], "staged": {}, "archived": False}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                listing["subdirs"].append(entry.name)
+            elif entry.name.endswith(".in"):
+                listing["inputs"][entry.name] = entry.stat().st_mtime
+            elif entry.name.endswith(".out"):
+                listing["outputs"].append(entry.name)
+            elif entry.name.endswith(".staged"):
+                listing["staged"][entry.name] = entry.stat().st_mtime
+            elif entry.name == PACK_FILENAME or strip_suffix(entry.name) != entry.name:
+                # outputs compressed by `rxnrlx archive` belong to finished jobs
+                listing["archived"] = True
+
+    dir_cache[rel_path] = listing
+    return listing
+
+
+def update_job(path:str, rel_path:str, job_cache:dict) -> dict:
+    """
+    Get the state of a job, only reading the output file if it changed since the last scan
+    """
+    stat = os.stat(path)
+    cached = job_cache.get(rel_path)
+    if cached is not None and cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+        return cached
+
+    job = {
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "modified": stat.st_mtime,
+        "state": job_state(path),
+    }
+    job_cache[rel_path] = job
+    return job
+
+
+def reaction_status(campaign_root:str, reaction:str, cache:dict) -> dict:
+    """
+    Summarize one reaction folder (stage, running jobs, failures and elapsed time)
+    """
+    jobs = dict()
+    first_input = None
+    archived = False
+
+    # walk the reaction folder using the cached listings wherever possible
+    pending = [reaction]
+    while pending:
+        rel_dir = pending.pop()
+        try:
+            listing = scan_directory(os.path.join(campaign_root, rel_dir), rel_dir, cache["dirs"])
+        except FileNotFoundError:
+            cache["dirs"].pop(rel_dir, None)
+            continue
+
+        pending.extend(os.path.join(rel_dir, subdir) for subdir in listing["subdirs"])
+        archived = archived or listing.get("archived", False)
+
+        for mtime in listing["inputs"].values():
+            first_input = mtime if first_input is None else min(first_input, mtime)
+
+        for filename in listing["outputs"]:
+            rel_path = os.path.join(rel_dir, filename)
+            try:
+                jobs[os.path.relpath(rel_path, reaction)] = update_job(
+                    os.path.join(campaign_root, rel_path), rel_path, cache["jobs"]
+                )
+            except FileNotFoundError:
+                cache["jobs"].pop(rel_path, None)
+
+        # jobs running on scratch have no output in the job folder until they finish
+        for filename, mtime in listing["staged"].items():
+            outfile = filename[:-len(".staged")] + ".out"
+            if outfile not in listing["outputs"]:
+                jobs[os.path.relpath(os.path.join(rel_dir, outfile), reaction)] = {"modified": mtime, "state": "running"}
+
+    running = sorted(job for job, info in jobs.items() if info["state"] == "running")
+    failed = sorted(job for job, info in jobs.items() if info["state"] == "failed")
+
+    if jobs:
+        latest_job = max(jobs, key=lambda job: jobs[job]["modified"])
+        stage = os.path.dirname(latest_job) or "."
+        last_output = jobs[latest_job]["modified"]
+    else:
+        stage = "archived" if archived else "not started"
+        last_output = None
+
+    if first_input is None:
+        elapsed = 0.0
+    elif running:
+        elapsed = time.time() - first_input
+    else:
+        elapsed = max(last_output or first_input, first_input) - first_input
+
+    return {
+        "stage": stage,
+        "running": running,
+        "failed": failed,
+        "elapsed": elapsed,
+    }
+
+
+def load_cache(campaign_root:str) -> dict:
+    """
+    Open the results of the previous scan of this campaign (or start an empty cache)
+    """
+    try:
+        with open(os.path.join(campaign_root, CACHE_FILENAME), "r") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+
+    return {"version": CACHE_VERSION, "dirs": {}, "jobs": {}}
+
+
+def save_cache(campaign_root:str, cache:dict):
+    """
+    Write the scan cache atomically so a concurrent scan never reads half of it
+    """
+    cache_file = os.path.join(campaign_root, CACHE_FILENAME)
+    try:
+        with open(f"{cache_file}.{os.getpid()}.tmp", "w") as f:
+            json.dump(cache, f)
+        os.replace(f"{cache_file}.{os.getpid()}.tmp", cache_file)
+    except OSError:
+        print(f"WARNING: could not write status cache to {cache_file}")
+
+
+def campaign_status(campaign_root:str, use_cache:bool=True) -> dict:
+    """
+    Get the status of every reaction folder inside a campaign folder
+    """
+    cache = load_cache(campaign_root) if use_cache else {"version": CACHE_VERSION, "dirs": {}, "jobs": {}}
+
+    statuses = dict()
+    root_listing = scan_directory(campaign_root, ".", cache["dirs"])
+    for reaction in sorted(root_listing["subdirs"]):
+        statuses[reaction] = reaction_status(campaign_root, reaction, cache)
+
+    # forget reactions that were removed from the campaign
+    cache["dirs"] = {
+        path: listing for path, listing in cache["dirs"].items()
+        if path == "." or path.split(os.sep)[0] in statuses
+    }
+    cache["jobs"] = {path: job for path, job in cache["jobs"].items() if path.split(os.sep)[0] in statuses}
+
+    if use_cache:
+        save_cache(campaign_root, cache)
+
+    return statuses
+
+
+def print_status(statuses:dict):
+    """
+    Print a status table for the reactions in a campaign
+    """
+    print(f"{'reaction':<30s} {'stage':<45s} {'elapsed':>16s}  running/failed")
+    for reaction, info in statuses.items():
+        print(f"{reaction:<30s} {info['stage']:<45s} {sec_to_str(int(info['elapsed'])):>16s}  "
+              f"{len(info['running'])}/{len(info['failed'])}")
+        for job in info["failed"]:
+            print(f"    FAILED: {job}")
+
+    num_running = sum(1 for info in statuses.values() if info["running"])
+    num_failed = sum(1 for info in statuses.values() if info["failed"])
+    print(f"\n{len(statuses)} reactions: {num_running} running, {num_failed} with failures")
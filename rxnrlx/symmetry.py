@@ -0,0 +1,259 @@
+"""
+Point group analysis of the structures of a workflow, used to cut the cost of Jaguar jobs
+
+With the optional `symmetry` section of the config file, structures are symmetrized before the
+geometry optimizations and frequency calculations. Jaguar already uses the point group it detects in
+its input structure by default (isymm=8), so the saving comes from the symmetrized geometry, in which
+Jaguar finds the full point group; isymm=8 is only set on these jobs to override an `isymm: 0` of the
+config sections (as in the example configs). Structures whose largest displacement would exceed the
+tolerance keep their geometry. Only structures that are optimized afterwards are symmetrized with the
+(loose) tolerance; the structures of frequency-only jobs are at a stationary point already and are only
+cleaned up within a tight tolerance, so their energies are not shifted. Transition states, TS searches
+and IRC jobs always run with isymm=0 (whether or not the section is given), since the reaction mode
+usually breaks the symmetry.
+
+symmetry:
+  tolerance: 0.1                    # largest displacement (Angstrom) before a geometry optimization
+  frequency_tolerance: 0.001        # largest displacement (Angstrom) before a frequency-only job
+  reuse_tolerance: 0.001            # largest difference of interatomic distances (Angstrom) to reuse a job
+  eigen_tolerance: 0.01             # tolerance on the moments of inertia (see PointGroupAnalyzer)
+  registry: ../species.json         # optional: reuse the frequency jobs of equivalent species across reactions
+
+Species are equivalent when they have the same composition, charge and multiplicity and the same
+interatomic distances (within the reuse tolerance), which does not depend on the orientation or atom
+order. The reuse tolerance is much tighter than the symmetry tolerance so that distinct conformers are
+never merged. A reused job leaves a {name}.reused file pointing to the registered output instead of
+an output of its own (see rxnrlx.jaguar.read_files.find_output). The registry is a JSON file shared by
+the reactions of a campaign; it is read and rewritten as a whole, so two reactions registering a
+species at the same moment may both compute it.
+"""
+import hashlib, json, os
+import numpy as np
+
+from rxnrlx.common.compression import exists, list_files, read_molecule
+from rxnrlx.common.constants import FWD_FILENAME, REV_FILENAME, TS_FILENAME
+
+DEFAULT_SETTINGS = {
+    "tolerance": 0.1,
+    "frequency_tolerance": 1e-3,
+    "reuse_tolerance": 1e-3,
+    "eigen_tolerance": 0.01,
+    "registry": None,
+}
+
+REGISTRY_VERSION = 1
+
+# Jaguar values of isymm: use the point group of the input structure (the Jaguar default) or no symmetry
+JAGUAR_USE_SYMMETRY = 8
+JAGUAR_NO_SYMMETRY = 0
+
+# Symmetrizing averages equivalent atoms with operations that are only approximate for the input
+# structure, so it is repeated until the structure stops moving (Angstrom)
+SYMMETRIZE_CONVERGENCE = 1e-7
+SYMMETRIZE_MAX_ITERATIONS = 50
+
+
+def load_symmetry_settings(symmetry_config:dict=None) -> dict:
+    """
+    Combine the user-specified symmetry section with the defaults (None if there is no section,
+    in which case structures are used as they are)
+    """
+    if not symmetry_config:
+        return None
+
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(symmetry_config if isinstance(symmetry_config, dict) else {})
+
+    return settings
+
+
+def symmetrize(molecule, tolerance:float=0.1, eigen_tolerance:float=0.01) -> tuple["Molecule", str]:
+    """
+    Find the point group of a molecule and symmetrize it
+
+    Output:
+    - (Molecule): The symmetrized molecule (centered on its center of mass), or the original molecule
+      if it has no symmetry or symmetrizing would move an atom by more than the tolerance
+    - (str): Schoenflies symbol of the point group (C1 if the molecule was kept)
+    """
+    from pymatgen.core.structure import Molecule
+    from pymatgen.symmetry.analyzer import PointGroupAnalyzer
+
+    analyzer = PointGroupAnalyzer(molecule, tolerance=tolerance, eigen_tolerance=eigen_tolerance)
+    point_group = analyzer.sch_symbol
+    if point_group == "C1" or len(molecule) < 2:
+        return molecule, "C1"
+
+    symmetrized = analyzer.symmetrize_molecule()["sym_mol"]
+    for _ in range(SYMMETRIZE_MAX_ITERATIONS):
+        previous = symmetrized
+        symmetrized = PointGroupAnalyzer(previous, tolerance, eigen_tolerance).symmetrize_molecule()["sym_mol"]
+        if np.abs(symmetrized.cart_coords - previous.cart_coords).max() < SYMMETRIZE_CONVERGENCE:
+            break
+
+    displacement = np.linalg.norm(symmetrized.cart_coords - analyzer.centered_mol.cart_coords, axis=1).max()
+    if displacement > tolerance:
+        return molecule, "C1"
+
+    symmetrized = Molecule(
+        molecule.species, symmetrized.cart_coords,
+        charge=molecule.charge, spin_multiplicity=molecule.spin_multiplicity
+    )
+
+    return symmetrized, point_group
+
+
+def fingerprint(molecule) -> tuple[list[str], np.ndarray]:
+    """
+    Interatomic distances of a molecule labelled by the elements of each pair and sorted,
+    which is the same for any orientation and ordering of the atoms
+    """
+    species = [site.species_string for site in molecule]
+    coords = molecule.cart_coords
+    pairs = list()
+    for i in range(len(species)):
+        for j in range(i + 1, len(species)):
+            pairs.append(("-".join(sorted([species[i], species[j]])), float(np.linalg.norm(coords[i] - coords[j]))))
+    pairs.sort()
+
+    return [label for label, _ in pairs], np.array([distance for _, distance in pairs])
+
+
+def equivalent(molecule_a, molecule_b, tolerance:float=1e-3) -> bool:
+    """ Whether two molecules are the same species (composition, charge, multiplicity and geometry) """
+    if (molecule_a.composition != molecule_b.composition or molecule_a.charge != molecule_b.charge
+            or molecule_a.spin_multiplicity != molecule_b.spin_multiplicity):
+        return False
+
+    labels_a, distances_a = fingerprint(molecule_a)
+    labels_b, distances_b = fingerprint(molecule_b)
+
+    return labels_a == labels_b and bool(np.all(np.abs(distances_a - distances_b) <= tolerance))
+
+
+def equivalent_groups(molecules:dict, tolerance:float=1e-3) -> list[list[str]]:
+    """
+    Group molecules (by name) into sets of equivalent species, keeping the first name of each group
+    as its representative
+    """
+    groups = list()
+    for name, molecule in molecules.items():
+        for group in groups:
+            if equivalent(molecule, molecules[group[0]], tolerance):
+                group.append(name)
+                break
+        else:
+            groups.append([name])
+
+    return groups
+
+
+def parameters_key(parameters:dict) -> str:
+    """ Short hash of the Jaguar keywords of a job (only jobs at the same level of theory are reused) """
+    return hashlib.sha1(json.dumps(parameters, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def load_registry(registry_file:str) -> list[dict]:
+    """ Species registered by previous jobs (empty if the registry does not exist yet) """
+    if not os.path.exists(registry_file):
+        return list()
+
+    with open(registry_file, "r") as f:
+        registry = json.load(f)
+    if registry.get("version") != REGISTRY_VERSION:
+        return list()
+
+    return registry["species"]
+
+
+def find_registered(registry:list[dict], molecule, parameters:dict, tolerance:float=1e-3) -> dict:
+    """
+    Registry entry of an equivalent species computed with the same keywords whose output still exists
+    """
+    from pymatgen.core.structure import Molecule
+
+    key = parameters_key(parameters)
+    for entry in registry:
+        if entry["parameters"] != key or not exists(entry["outfile"]):
+            continue
+        registered = Molecule(entry["species"], entry["coords"], charge=entry["charge"],
+                              spin_multiplicity=entry["multiplicity"])
+        if equivalent(molecule, registered, tolerance):
+            return entry
+
+    return None
+
+
+def register(registry_file:str, molecule, parameters:dict, outfile:str, point_group:str):
+    """ Add the output of a job to the registry """
+    registry = load_registry(registry_file)
+    registry.append({
+        "formula": molecule.composition.formula,
+        "charge": molecule.charge,
+        "multiplicity": molecule.spin_multiplicity,
+        "species": [site.species_string for site in molecule],
+        "coords": molecule.cart_coords.tolist(),
+        "parameters": parameters_key(parameters),
+        "point_group": point_group,
+        "outfile": os.path.abspath(outfile),
+    })
+
+    # write under a temporary name so other reactions never read a half written registry
+    tmp_file = f"{registry_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump({"version": REGISTRY_VERSION, "species": registry}, f)
+    os.replace(tmp_file, registry_file)
+
+
+def campaign_species(
+        campaign_root:str, tolerance:float=0.1, eigen_tolerance:float=0.01, reuse_tolerance:float=1e-3
+    ) -> dict:
+    """
+    Point group of every final structure in a campaign folder (ts2rxn and refine final_structures)
+    and the groups of equivalent species across reactions (within the reuse tolerance)
+
+    Output:
+    - (dict): "species" (point group of each structure by path) and "equivalent" (groups of paths
+      holding the same species, only groups of more than one)
+    """
+    molecules = dict()
+    point_groups = dict()
+    for dirpath, filenames in sorted(list_files(campaign_root).items()):
+        if os.path.basename(dirpath) != "final_structures":
+            continue
+        for filename in [FWD_FILENAME, REV_FILENAME, TS_FILENAME]:
+            if filename not in filenames:
+                continue
+            path = os.path.relpath(os.path.join(dirpath, filename), campaign_root)
+            molecules[path] = read_molecule(os.path.join(dirpath, filename))
+            point_groups[path] = symmetrize(molecules[path], tolerance, eigen_tolerance)[1]
+
+    groups = [group for group in equivalent_groups(molecules, reuse_tolerance) if len(group) > 1]
+
+    return {"species": point_groups, "equivalent": groups}
+
+
+def symmetry(campaign_root:str, tolerance:float=0.1, output_file:str=None, reuse_tolerance:float=1e-3) -> dict:
+    """
+    Print the point groups of the final structures of a campaign and the species it computes more
+    than once, optionally writing the report to YAML
+    """
+    report = campaign_species(campaign_root, tolerance, reuse_tolerance=reuse_tolerance)
+
+    symmetric = {path: group for path, group in report["species"].items() if group != "C1"}
+    print(f"{len(report['species'])} structures, {len(symmetric)} with symmetry (tolerance {tolerance} A)")
+    for path, group in symmetric.items():
+        print(f"  {group:<5s} {path}")
+
+    if report["equivalent"]:
+        print(f"\n{len(report['equivalent'])} species found in several reactions:")
+        for group in report["equivalent"]:
+            print("  " + "\n    = ".join(group))
+
+    if output_file is not None:
+        import yaml
+
+        with open(output_file, "w") as f:
+            yaml.dump(report, f, default_flow_style=False)
+
+    return report
@@ -0,0 +1,226 @@
+"""
+Recompute thermochemistry from finished frequency jobs without running them again
+
+The frequencies, rotational temperatures and electronic energy of each species are parsed once
+from its energy_*.out file (or the output of an equivalent species it reused, see rxnrlx.symmetry)
+and cached next to it ({outfile}.thermo.json). Gibbs free energies are
+then evaluated with the ideal gas / rigid rotor / harmonic oscillator model as NumPy arrays over
+whole temperature grids, optionally with a quasi-RRHO treatment of low frequency modes:
+- "truhlar": frequencies below the cutoff are raised to the cutoff (what Jaguar does by default)
+- "grimme": vibrational entropy is interpolated towards a free rotor below the cutoff
+"""
+import json, os
+import numpy as np
+
+from rxnrlx.common.compression import file_stat, list_files
+from rxnrlx.common.constants import HARTREE_TO_EV
+from rxnrlx.jaguar.read_files import find_output, get_thermo_data_from_file, reused_pointer
+
+# Physical constants (SI)
+KB = 1.380649e-23               # J/K
+H = 6.62607015e-34              # J s
+C = 2.99792458e10               # cm/s
+NA = 6.02214076e23              # 1/mol
+AMU = 1.66053906660e-27         # kg
+ATM = 101325.0                  # Pa
+R = KB * NA                     # J/(mol K)
+HARTREE = 4.3597447222071e-18   # J
+
+# Moment of inertia used to limit the free rotor entropy of very low frequency modes (Grimme, 2012)
+AVERAGE_MOMENT = 1e-44          # kg m^2
+
+CACHE_SUFFIX = ".thermo.json"
+
+# Names of the frequency job outputs written by calculate_gibbs
+SPECIES_OUTFILES = {
+    "forward": "energy_fwd.out",
+    "reverse": "energy_rev.out",
+    "transition_state": "energy_ts.out",
+}
+
+
+def load_thermo_data(outfile:str, use_cache:bool=True) -> dict:
+    """
+    Get the parsed thermochemistry inputs of a frequency job, parsing the output file only if
+    it has changed since the cache next to it was written (the output file may be archived)
+    """
+    stat = file_stat(outfile)
+    cache_file = f"{outfile}{CACHE_SUFFIX}"
+
+    if use_cache and os.path.exists(cache_file):
+        with open(cache_file, "r") as f:
+            cache = json.load(f)
+        if cache["mtime"] == stat.st_mtime_ns and cache["size"] == stat.st_size:
+            return cache["data"]
+
+    data = get_thermo_data_from_file(outfile)
+
+    if use_cache:
+        try:
+            with open(cache_file, "w") as f:
+                json.dump({"mtime": stat.st_mtime_ns, "size": stat.st_size, "data": data}, f)
+        except OSError:
+            print(f"WARNING: could not write thermochemistry cache {cache_file}")
+
+    return data
+
+
+def thermochemistry(
+        data:dict, temperatures, pressure:float=1.0, qrrho:str=None, cutoff:float=100.0
+    ) -> dict:
+    """
+    Evaluate the thermochemistry of one species over a grid of temperatures
+
+    Inputs:
+    - data (dict): Parsed frequency job (see get_thermo_data_from_file)
+    - temperatures (float or array): Temperatures in K
+    - pressure (float): Pressure in atm
+    - qrrho (str): Low frequency treatment: None or "harmonic", "truhlar" or "grimme"
+    - cutoff (float): Frequency (cm^-1) below which the quasi-RRHO treatment applies
+
+    Output:
+    - (dict): Arrays (one value per temperature) of the zero point energy, enthalpy and Gibbs free
+      energy in Hartrees and the entropy in Hartrees/K
+    """
+    T = np.atleast_1d(np.asarray(temperatures, dtype=float))[:, None]
+
+    # imaginary modes (negative frequencies) are not vibrations of the species
+    frequencies = np.asarray(data["frequencies"], dtype=float)
+    frequencies = frequencies[frequencies > 0]
+    if qrrho == "truhlar":
+        frequencies = np.maximum(frequencies, cutoff)
+    elif qrrho not in [None, "harmonic", "grimme"]:
+        raise Exception(f"Unrecognized quasi-RRHO treatment: '{qrrho}', please choose 'truhlar', 'grimme' or 'harmonic'")
+
+    # Translation
+    mass = data["mass"] * AMU
+    q_trans = (2 * np.pi * mass * KB * T / H**2) ** 1.5 * KB * T / (pressure * ATM)
+    s_trans = R * (np.log(q_trans) + 2.5)
+    h_trans = 2.5 * R * T
+
+    # Rotation (rotational temperatures of zero belong to the axis of a linear molecule)
+    theta_rot = np.asarray([theta for theta in data["rotational_temperatures"] if theta > 0])
+    sigma = data["symmetry_number"]
+    if len(theta_rot) == 0:
+        s_rot = np.zeros_like(T)
+        e_rot = np.zeros_like(T)
+    elif len(theta_rot) < 3:
+        s_rot = R * (np.log(T / (sigma * theta_rot[0])) + 1)
+        e_rot = R * T
+    else:
+        s_rot = R * (np.log(np.sqrt(np.pi) / sigma * T**1.5 / np.sqrt(np.prod(theta_rot))) + 1.5)
+        e_rot = 1.5 * R * T
+
+    # Vibration
+    theta_vib = H * C * frequencies / KB
+    x = theta_vib / T
+    zpe = R * np.sum(theta_vib) / 2
+    e_vib = zpe + R * np.sum(theta_vib / np.expm1(x), axis=1, keepdims=True)
+    s_vib_modes = R * (x / np.expm1(x) - np.log1p(-np.exp(-x)))
+    if qrrho == "grimme":
+        # free rotor entropy of each mode and the damping function weighting the two models
+        moment = H / (8 * np.pi**2 * C * frequencies)
+        reduced_moment = moment * AVERAGE_MOMENT / (moment + AVERAGE_MOMENT)
+        s_rotor = R * (0.5 + np.log(np.sqrt(8 * np.pi**3 * reduced_moment * KB * T / H**2)))
+        weight = 1 / (1 + (cutoff / frequencies) ** 4)
+        s_vib_modes = weight * s_vib_modes + (1 - weight) * s_rotor
+    s_vib = np.sum(s_vib_modes, axis=1, keepdims=True)
+
+    # Electronic
+    s_elec = R * np.log(data["multiplicity"])
+
+    to_hartree = 1 / (HARTREE * NA)
+    enthalpy = data["electronic_energy"] + (e_vib + e_rot + h_trans) * to_hartree
+    entropy = (s_trans + s_rot + s_vib + s_elec) * to_hartree
+
+    return {
+        "temperature": T[:, 0],
+        "zpe": np.full(T.shape[0], zpe * to_hartree),
+        "enthalpy": enthalpy[:, 0],
+        "entropy": entropy[:, 0],
+        "gibbs": (enthalpy - T * entropy)[:, 0],
+    }
+
+
+def gibbs_free_energy(outfile:str, temperatures, pressure:float=1.0, qrrho:str=None, cutoff:float=100.0):
+    """
+    Gibbs free energy (Hartrees) of the species in a frequency job output over a temperature grid
+    """
+    return thermochemistry(load_thermo_data(outfile), temperatures, pressure, qrrho, cutoff)["gibbs"]
+
+
+def reaction_thermo(
+        energy_folder:str, temperatures, pressure:float=1.0, qrrho:str=None, cutoff:float=100.0
+    ) -> dict:
+    """
+    Gibbs free energies of the three points of a reaction (the energy_calculation folder written by
+    calculate_gibbs) with the reaction energy and barriers in eV, over a temperature grid
+    """
+    energies = dict()
+    for species, outfile in SPECIES_OUTFILES.items():
+        energies[species] = gibbs_free_energy(
+            find_output(os.path.join(energy_folder, outfile)), temperatures, pressure, qrrho, cutoff
+        )
+
+    energies["Reaction Info (eV)"] = {
+        "Delta G": (energies["forward"] - energies["reverse"]) * HARTREE_TO_EV,
+        "Forward Activation Barrier": (energies["transition_state"] - energies["reverse"]) * HARTREE_TO_EV,
+        "Reverse Activation Barrier": (energies["transition_state"] - energies["forward"]) * HARTREE_TO_EV,
+    }
+    energies["temperature"] = np.atleast_1d(np.asarray(temperatures, dtype=float))
+
+    return energies
+
+
+def find_energy_folders(campaign_root:str) -> dict:
+    """
+    Find the most recent folder holding all three frequency jobs in each reaction of a campaign
+    """
+    folders = dict()
+    for reaction in sorted(os.listdir(campaign_root)):
+        reaction_folder = os.path.join(campaign_root, reaction)
+        if not os.path.isdir(reaction_folder):
+            continue
+
+        found = [
+            dirpath for dirpath, filenames in list_files(reaction_folder).items()
+            if all(outfile in filenames or reused_pointer(outfile) in filenames for outfile in SPECIES_OUTFILES.values())
+        ]
+        if found:
+            folders[reaction] = max(found, key=os.path.getmtime)
+
+    return folders
+
+
+def campaign_thermo(
+        campaign_root:str, temperatures, pressure:float=1.0, qrrho:str=None, cutoff:float=100.0,
+        output_file:str=None
+    ) -> dict:
+    """
+    Temperature sweep of the reaction energetics of every reaction in a campaign folder
+    """
+    results = dict()
+    for reaction, energy_folder in find_energy_folders(campaign_root).items():
+        try:
+            results[reaction] = reaction_thermo(energy_folder, temperatures, pressure, qrrho, cutoff)
+        except Exception as e:
+            print(f"WARNING: skipping {reaction}: {e}")
+
+    print(f"Computed thermochemistry of {len(results)} reactions from {campaign_root}")
+
+    if output_file is not None:
+        import yaml
+
+        with open(output_file, "w") as f:
+            yaml.dump(to_builtin(results), f, default_flow_style=None)
+
+    return results
+
+
+def to_builtin(value):
+    """ Convert the NumPy arrays in a (nested) result dictionary to lists so it can be written to YAML """
+    if isinstance(value, dict):
+        return {key: to_builtin(item) for key, item in value.items()}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
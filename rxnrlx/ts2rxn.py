@@ -1,49 +1,80 @@
 from pymatgen.core.structure import Molecule
-import os, sys, yaml
+import sys, time
 
-from rxnrlx.common.constants import FWD_FILENAME, REV_FILENAME, TS_FILENAME
+from rxnrlx.common.context import JobContext
+from rxnrlx.common.results import ReactionResult, ResultWriter, save, write_structures
+from rxnrlx.common.utils import load_config
 
-def ts2rxn(config:dict={}):
+def ts2rxn(config:dict={}, context:JobContext=None, writer:ResultWriter=None) -> ReactionResult:
     """
     This function orchestrates a workflow that takes a ts_guess and turns it into a reaction pathway.
     Steps
-    - Optimize TS Guess
+    - Optimize TS Guess (or race several guesses of the same TS, keeping the first one to converge)
     - Perform IRC Analysis on optimized TS
     - Perform geometry optimizations on the forward and reverse IRC structures
     - Output a diagram that shows the energetic pathway of the reaction (reactant, TS, product)
         - assume the reactant is the "reverse" direction from IRC
+
+    Paths in the config are relative to the context folder (default: current working directory),
+    which is where the job folder is created
+
+    Returns the structures, timings and paths of the reaction, which refine accepts directly; the
+    final structures are written through the writer (default: right away)
     """
-    # Get filename from config
-    ts_guess_file = config["info"]["ts_guess_filename"]
+    context = context if context is not None else JobContext()
+
+    # Get filename from config (a list of files races the guesses against each other)
+    ts_guess_files = config["info"]["ts_guess_filename"]
+    if isinstance(ts_guess_files, str):
+        ts_guess_files = [ts_guess_files]
     
-    # open xyz file from args
-    ts_guess = Molecule.from_file(ts_guess_file)
-    ts_guess.set_charge_and_spin(
-        charge=config["info"].get("charge", 0),
-        spin_multiplicity=config["info"].get("multiplicity", 1)
-        )
+    # open xyz files from args
+    ts_guesses = list()
+    for ts_guess_file in ts_guess_files:
+        ts_guess = Molecule.from_file(context.path(ts_guess_file))
+        ts_guess.set_charge_and_spin(
+            charge=config["info"].get("charge", 0),
+            spin_multiplicity=config["info"].get("multiplicity", 1)
+            )
+        ts_guesses.append(ts_guess)
+    ts_guess = ts_guesses[0]
 
-    # create folder for job to be run in and move into the directory
+    # create folder for job to be run in
     job_name = config["info"]["job_name"]
-    os.makedirs(f"./{job_name}")
-    os.chdir(f"./{job_name}")
-
-    job_folder = os.getcwd()
+    # an existing job folder is only reused when resuming (e.g. a task re-run after its worker crashed)
+    job_folder = context.subcontext(
+        job_name, exist_ok=config["info"].get("resume", False),
+        scratch=config["info"].get("scratch"), sample_interval=config["info"].get("resource_interval")
+    )
 
     # implementation
     if config["info"]["software"] == "jaguar": 
-        from rxnrlx.jaguar.jaguar_jobs import ts_relax, irc, geom_opt
+        from rxnrlx.jaguar.jaguar_jobs import ts_relax, race_ts_relax, irc, geom_opt
     else:
         raise NotImplementedError()
 
 
+    timings = dict()
+
     # Perform Transition State Optimization
+    start_time = time.time()
     try:
-        transition_state = ts_relax(
-            ts_guess=ts_guess, 
-            user_parameters=config.get("ts_relax", {}), 
-            num_tasks=config["info"].get("ntasks", 2)
-        )
+        if len(ts_guesses) > 1:
+            transition_state = race_ts_relax(
+                ts_guesses=ts_guesses,
+                user_parameters=config.get("ts_relax", {}),
+                num_tasks=config["info"].get("ntasks", 2),
+                retry_policy=config.get("retry"),
+                context=job_folder
+            )
+        else:
+            transition_state = ts_relax(
+                ts_guess=ts_guess, 
+                user_parameters=config.get("ts_relax", {}), 
+                num_tasks=config["info"].get("ntasks", 2),
+                retry_policy=config.get("retry"),
+                context=job_folder
+            )
     except Exception as e:
         # If TS optimization fails, still keep the program going with the guess as the transition state
         if not config["info"].get("die_on_ts_failure", True):
@@ -53,53 +84,62 @@ def ts2rxn(config:dict={}):
             raise e
 
 
+    timings["ts2rxn/ts_relax"] = time.time() - start_time
+
     # Perform IRC Analysis
+    start_time = time.time()
     try:
         forward_molecule, reverse_molecule = irc(
             transition_state=transition_state, 
             user_parameters=config.get("irc", {}), 
-            num_tasks=config["info"].get("ntasks", 2)
+            num_tasks=config["info"].get("ntasks", 2),
+            retry_policy=config.get("retry"),
+            context=job_folder
         )
     except Exception as e:
         print("IRC Job Failed")
         raise e
 
 
+    timings["ts2rxn/irc"] = time.time() - start_time
+
     # Optimize Forward and Reverse Molecules (reactants and products)
+    start_time = time.time()
     try:
         forward_optimized, reverse_optimized = geom_opt(
             forward_molecule=forward_molecule, 
             reverse_molecule=reverse_molecule,
             user_parameters=config.get("geom_opt", {}), 
-            num_tasks=config["info"].get("ntasks", 2)
+            num_tasks=config["info"].get("ntasks", 2),
+            retry_policy=config.get("retry"),
+            context=job_folder,
+            symmetry=config.get("symmetry")
         )
     except Exception as e:
         print("Geometry Optimizations Failed")
+    timings["ts2rxn/geom_opt"] = time.time() - start_time
     
     # save the 3 molecules (forward, backward, and TS) in a dedicated folder
-    os.mkdir("./final_structures")
-    os.chdir("./final_structures")
-    forward_optimized.to(FWD_FILENAME)
-    reverse_optimized.to(REV_FILENAME)
-    transition_state.to(TS_FILENAME)
+    structures = {"forward": forward_optimized, "reverse": reverse_optimized, "transition_state": transition_state}
+    save(writer, write_structures, structures, job_folder.path("final_structures"))
 
     print("Program Finished Gracefully.\nHave a Nice Day :)")
 
+    return ReactionResult(
+        structures=structures,
+        context=job_folder,
+        timings=timings,
+        paths={"job_folder": job_folder.folder, "final_structures": job_folder.path("final_structures")}
+    )
+
 
 
 if __name__ == "__main__":
-    """ Read in Command Line Arguments """
-    if len(sys.argv) == 2:
-        print(f"Configuration File: {sys.argv[1]}")
-        try:
-            with open(sys.argv[1], "r") as f:
-                config = yaml.safe_load(f)
-        except:
-            raise Exception("Invalid File Specified")
-    else:
+    """ Read in Command Line Arguments (equivalent to `rxnrlx ts2rxn <config_file.yaml>`) """
+    if len(sys.argv) != 2:
         error_message = [f"Invalid number of arguments ({len(sys.argv)}).",
                          "Use format: ts2rxn.py <config_file.yaml>"]
         raise Exception("\n".join(error_message))
-        
+
     # Run main code
-    ts2rxn(config)
\ No newline at end of file
+    ts2rxn(load_config(sys.argv[1]))
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Work queue shared by driver processes on any number of nodes, backed only by a shared filesystem
+
+Each task (one workflow, ts2rxn or refine, on one config file) is a small JSON file that moves
+between the folders of the queue:
+
+    <queue>/pending/<task>.json             waiting to be claimed
+    <queue>/claimed/<task>.json@<worker>    claimed by a worker (host-pid), the mtime is its heartbeat
+    <queue>/done/<task>.json                finished
+    <queue>/failed/<task>.json              raised an exception (the error is saved in <task>.json.err)
+
+Claiming is a rename from pending/ to claimed/, which is atomic on a shared filesystem, so only one
+worker gets each task. Workers touch their claimed file while the task runs; a claim whose
+heartbeat is older than the lease timeout belongs to a crashed node and is moved back to pending/.
+Released tasks count how often they were released, and their re-runs resume in the job folder
+the crashed worker left behind (info: resume) instead of failing because it already exists.
+"""
+import importlib, json, os, socket, threading, time, traceback
+
+from rxnrlx.common.context import JobContext
+
+QUEUE_FOLDERS = ["pending", "claimed", "done", "failed"]
+
+# Function running each workflow (imported when a task is run)
+WORKFLOWS = {
+    "ts2rxn": "rxnrlx.ts2rxn:ts2rxn",
+    "refine": "rxnrlx.refine:refine",
+}
+
+DEFAULT_HEARTBEAT = 60            # seconds between heartbeats of a running task
+DEFAULT_LEASE_TIMEOUT = 900       # seconds without heartbeat after which a claim is released
+DEFAULT_POLL = 30                 # seconds between checks of the queue while waiting for tasks
+
+
+def worker_id() -> str:
+    """ Name of this driver process in the queue (host and pid) """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def init_queue(queue_dir:str):
+    """ Create the folders of a queue """
+    for folder in QUEUE_FOLDERS:
+        os.makedirs(os.path.join(queue_dir, folder), exist_ok=True)
+
+
+def enqueue(queue_dir:str, workflow:str, config_files:list[str], folder:str=None) -> list[str]:
+    """
+    Add one task per config file to the queue
+
+    Inputs:
+    - queue_dir (str): Folder of the queue (created if needed)
+    - workflow (str): Workflow run on each config file ("ts2rxn" or "refine")
+    - config_files (list[str]): Config files
+    - folder (str): Folder the paths in the configs are relative to (default: current working directory)
+
+    Output:
+    - (list[str]): Names of the new tasks
+    """
+    if workflow not in WORKFLOWS:
+        raise Exception(f"Unrecognized workflow: '{workflow}', please choose from {list(WORKFLOWS)}")
+    init_queue(queue_dir)
+    folder = os.path.abspath(folder if folder is not None else os.getcwd())
+
+    tasks = list()
+    for i, config_file in enumerate(config_files):
+        stem = os.path.splitext(os.path.basename(config_file))[0]
+        task = f"{time.time_ns()}_{i:04d}_{workflow}_{stem}.json"
+        spec = {"workflow": workflow, "config": os.path.abspath(config_file), "folder": folder}
+
+        # write under a temporary name so workers never read a half written task
+        tmp_file = os.path.join(queue_dir, f".{task}.{worker_id()}.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(spec, f)
+        os.replace(tmp_file, os.path.join(queue_dir, "pending", task))
+        tasks.append(task)
+
+    print(f"Added {len(tasks)} {workflow} tasks to {queue_dir}")
+
+    return tasks
+
+
+def claim(queue_dir:str, worker:str):
+    """
+    Atomically claim the oldest pending task
+
+    Output:
+    - (str): Path of the claimed task file, or None if no task is pending
+    """
+    for task in sorted(os.listdir(os.path.join(queue_dir, "pending"))):
+        pending_file = os.path.join(queue_dir, "pending", task)
+        claimed_file = os.path.join(queue_dir, "claimed", f"{task}@{worker}")
+        try:
+            # refresh the enqueue time first, so the claim never looks stale to other workers
+            os.utime(pending_file)
+            os.rename(pending_file, claimed_file)
+        except FileNotFoundError:
+            # another worker claimed it first (or released it as stale in between)
+            continue
+        return claimed_file
+
+    return None
+
+
+def release_stale(queue_dir:str, lease_timeout:float=DEFAULT_LEASE_TIMEOUT) -> list[str]:
+    """
+    Move the tasks of workers that stopped sending heartbeats back to pending/
+    """
+    released = list()
+    claimed_folder = os.path.join(queue_dir, "claimed")
+    for claimed in os.listdir(claimed_folder):
+        claimed_file = os.path.join(claimed_folder, claimed)
+        try:
+            if time.time() - os.stat(claimed_file).st_mtime < lease_timeout:
+                continue
+            task, worker = claimed.rsplit("@", 1)
+            # take the claim out of claimed/ before counting the release, then hand it back
+            releasing_file = os.path.join(queue_dir, f".{task}.{worker_id()}.releasing")
+            os.rename(claimed_file, releasing_file)
+        except FileNotFoundError:
+            continue
+
+        with open(releasing_file, "r") as f:
+            spec = json.load(f)
+        spec["released"] = spec.get("released", 0) + 1
+        with open(releasing_file, "w") as f:
+            json.dump(spec, f)
+        os.rename(releasing_file, os.path.join(queue_dir, "pending", task))
+
+        print(f"Released stale task {task} of worker {worker}")
+        released.append(task)
+
+    return released
+
+
+def finish(queue_dir:str, claimed_file:str, error:str=None) -> bool:
+    """
+    Move a claimed task to done/ (or failed/ with its error), returning False if the claim was lost
+    """
+    task = os.path.basename(claimed_file).rsplit("@", 1)[0]
+    destination = "done" if error is None else "failed"
+    try:
+        os.rename(claimed_file, os.path.join(queue_dir, destination, task))
+    except FileNotFoundError:
+        print(f"WARNING: lost the claim on {task} (released as stale), it may be run again")
+        return False
+
+    if error is not None:
+        with open(os.path.join(queue_dir, destination, f"{task}.err"), "w") as f:
+            f.write(error)
+
+    return True
+
+
+class Heartbeat:
+    """ Background thread touching a claimed task file while its task runs """
+
+    def __init__(self, claimed_file:str, interval:float=DEFAULT_HEARTBEAT):
+        self.claimed_file = claimed_file
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                os.utime(self.claimed_file)
+            except FileNotFoundError:
+                print(f"WARNING: {self.claimed_file} disappeared, the task was released by another worker")
+                return
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+
+def run_task(spec:dict):
+    """ Run the workflow of a task on its config file """
+    from rxnrlx.common.utils import load_config
+
+    module_name, function_name = WORKFLOWS[spec["workflow"]].split(":")
+    workflow = getattr(importlib.import_module(module_name), function_name)
+
+    config = load_config(spec["config"])
+    if spec.get("released"):
+        # a crashed worker left the job folder behind
+        config["info"]["resume"] = True
+    workflow(config, JobContext(spec["folder"]))
+
+
+def queue_counts(queue_dir:str) -> dict:
+    """ Number of tasks in each folder of the queue """
+    return {
+        folder: sum(1 for name in os.listdir(os.path.join(queue_dir, folder)) if not name.endswith(".err"))
+        for folder in QUEUE_FOLDERS
+    }
+
+
+def work(
+        queue_dir:str, max_tasks:int=None, heartbeat:float=DEFAULT_HEARTBEAT,
+        lease_timeout:float=DEFAULT_LEASE_TIMEOUT, poll:float=DEFAULT_POLL
+    ) -> dict:
+    """
+    Claim and run tasks until the queue is drained
+
+    Workers keep polling while other workers hold claims (which are released back to the queue
+    if those workers crash) and exit once nothing is pending or claimed anymore.
+
+    Inputs:
+    - queue_dir (str): Folder of the queue
+    - max_tasks (int): Stop after this many tasks (default: no limit)
+    - heartbeat (float): Seconds between heartbeats of the running task
+    - lease_timeout (float): Seconds without heartbeat after which a claim is considered stale
+    - poll (float): Seconds between checks of the queue while waiting for tasks
+
+    Output:
+    - (dict): Number of tasks this worker finished and failed
+    """
+    init_queue(queue_dir)
+    worker = worker_id()
+    summary = {"done": 0, "failed": 0}
+
+    while max_tasks is None or summary["done"] + summary["failed"] < max_tasks:
+        release_stale(queue_dir, lease_timeout)
+        claimed_file = claim(queue_dir, worker)
+        if claimed_file is None:
+            if queue_counts(queue_dir)["claimed"] == 0:
+                break
+            time.sleep(poll)
+            continue
+
+        with open(claimed_file, "r") as f:
+            spec = json.load(f)
+        print(f"[{worker}] Running {spec['workflow']} on {spec['config']}")
+
+        error = None
+        with Heartbeat(claimed_file, heartbeat):
+            try:
+                run_task(spec)
+            except Exception:
+                error = traceback.format_exc()
+                print(f"[{worker}] {spec['config']} failed:\n{error}")
+
+        finish(queue_dir, claimed_file, error)
+        summary["done" if error is None else "failed"] += 1
+
+    counts = queue_counts(queue_dir)
+    print(f"[{worker}] Finished {summary['done']} tasks ({summary['failed']} failed); queue: "
+          + ", ".join(f"{count} {folder}" for folder, count in counts.items()))
+
+    return summary
@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_namespace_packages
 
 setup(
    name='rxnrlx',
@@ -6,5 +6,8 @@ setup(
    description='Module to create a reaction pathway',
    author='Oliver Hvidsten',
    author_email='oliverhvidsten@gmail.com',
-   packages=find_packages(),
-)
\ No newline at end of file
+   packages=find_namespace_packages(include=['rxnrlx', 'rxnrlx.*']),
+   entry_points={
+      'console_scripts': ['rxnrlx=rxnrlx.cli:main'],
+   },
+)
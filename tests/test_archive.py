@@ -0,0 +1,84 @@
+import os, shutil
+
+from rxnrlx.archive import archive
+from rxnrlx.common.compression import PACK_FILENAME, exists, list_files
+from rxnrlx.jaguar.read_files import get_energy_from_file, get_mols_from_irc, read_tail, verify_success
+from rxnrlx.status import campaign_status
+
+DIR_PATH = os.path.dirname(__file__)
+INPUTS = os.path.join(DIR_PATH, "test_jaguar", "inputs")
+
+
+def make_campaign(root):
+    """ Campaign with one finished reaction (IRC and frequency job) """
+    irc_folder = os.path.join(root, "rxn1", "irc")
+    energy_folder = os.path.join(root, "rxn1", "refine_structures", "energy_calculation")
+    os.makedirs(irc_folder)
+    os.makedirs(energy_folder)
+    shutil.copy(os.path.join(INPUTS, "irc.out"), irc_folder)
+    shutil.copy(os.path.join(INPUTS, "energy_rev.out"), energy_folder)
+
+    return os.path.join(irc_folder, "irc.out"), os.path.join(energy_folder, "energy_rev.out")
+
+
+def test_archive__compressed_in_place(tmp_path):
+    irc_out, energy_out = make_campaign(str(tmp_path))
+    forward, reverse = get_mols_from_irc(irc_out, 7)
+    tail = read_tail(irc_out)
+
+    results = archive(str(tmp_path))
+
+    assert results["rxn1"]["files"] == 2
+    assert results["rxn1"]["archived_size"] < results["rxn1"]["original_size"] / 2
+    assert not os.path.exists(irc_out) and os.path.exists(irc_out + ".gz")
+
+    # the readers find the compressed files under their original names
+    assert get_mols_from_irc(irc_out, 7)[0] == forward
+    assert get_mols_from_irc(irc_out, 7)[1] == reverse
+    assert read_tail(irc_out) == tail
+    assert verify_success(irc_out, "irc")
+    assert get_energy_from_file(energy_out) == -799.720018
+
+
+def test_archive__twice(tmp_path):
+    """
+    Archiving a folder again should not compress the already compressed outputs a second time
+    """
+    irc_out, energy_out = make_campaign(str(tmp_path))
+    shutil.copy(energy_out, energy_out + ".1")
+
+    archive(str(tmp_path))
+    results = archive(str(tmp_path))
+
+    assert results.get("rxn1", {}).get("files", 0) == 0
+    assert sorted(os.listdir(os.path.dirname(energy_out))) == ["energy_rev.out.1.gz", "energy_rev.out.gz"]
+    assert get_energy_from_file(energy_out + ".1") == -799.720018
+    assert verify_success(irc_out, "irc")
+
+
+def test_archive__packed(tmp_path):
+    irc_out, energy_out = make_campaign(str(tmp_path))
+
+    archive(str(tmp_path), pack=True)
+
+    assert os.path.exists(os.path.join(str(tmp_path), "rxn1", PACK_FILENAME))
+    assert not os.path.exists(irc_out + ".gz")
+    assert exists(irc_out) and not exists(irc_out + ".missing")
+    assert "energy_rev.out" in list_files(str(tmp_path))[os.path.dirname(energy_out)]
+    assert get_energy_from_file(energy_out) == -799.720018
+    assert verify_success(irc_out, "irc")
+
+    assert campaign_status(str(tmp_path), use_cache=False)["rxn1"]["stage"] == "archived"
+
+
+def test_archive__skips_running_jobs(tmp_path):
+    irc_out, _ = make_campaign(str(tmp_path))
+    with open(irc_out, "r") as f:
+        lines = f.readlines()
+    with open(irc_out, "w") as f:
+        f.writelines(lines[:-1])
+
+    results = archive(str(tmp_path))
+
+    assert results["rxn1"]["files"] == 1
+    assert os.path.exists(irc_out)
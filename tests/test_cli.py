@@ -0,0 +1,65 @@
+from rxnrlx.cli import build_parser
+import subprocess, sys, time
+import pytest
+
+HEAVY_MODULES = ["pymatgen", "matplotlib", "energydiagram", "numpy", "scipy"]
+
+# Generous ceiling on the time `rxnrlx --help` may take on top of the bare interpreter
+STARTUP_BUDGET = 0.5
+
+
+def test_parser__subcommands():
+    """
+    Ensure every subcommand is registered with the entry point
+    """
+    parser = build_parser()
+    args = parser.parse_args(["diagram", "config.yaml"])
+    assert args.config == "config.yaml"
+
+    for command in ["ts2rxn", "refine"]:
+        args = parser.parse_args([command, "a.yaml", "b.yaml", "-j", "2"])
+        assert args.command == command and args.config == ["a.yaml", "b.yaml"] and args.max_concurrent == 2
+
+    # several reactions at once would oversubscribe the cores unless asked for
+    assert parser.parse_args(["ts2rxn", "a.yaml", "b.yaml"]).max_concurrent == 1
+
+    args = parser.parse_args(["harvest", "campaign", "-o", "summary.yaml"])
+    assert args.campaign_root == "campaign" and args.output == "summary.yaml"
+
+    args = parser.parse_args(["status", "campaign"])
+    assert args.campaign_root == "campaign"
+
+
+@pytest.mark.parametrize("module", ["rxnrlx.cli", "rxnrlx.status", "rxnrlx.harvest"])
+def test_startup__no_heavy_imports(module):
+    """
+    The entry point and the light subcommands (status, harvest) should not import any heavy dependency
+    """
+    code = (
+        "import sys\n"
+        f"import {module}\n"
+        f"print('LOADED:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "LOADED:"
+
+
+def time_command(command:list, num_runs:int=5) -> float:
+    """ Fastest wall time of several runs of a command """
+    durations = list()
+    for _ in range(num_runs):
+        start_time = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        durations.append(time.perf_counter() - start_time)
+    return min(durations)
+
+
+def test_startup__time():
+    """
+    Guard against regressions in the start up time of the entry point
+    """
+    baseline = time_command([sys.executable, "-c", "pass"])
+    startup = time_command([sys.executable, "-m", "rxnrlx", "--help"])
+
+    assert startup - baseline < STARTUP_BUDGET
@@ -0,0 +1,13 @@
+import os
+
+from rxnrlx.common.context import JobContext
+
+
+def test_subcontext(tmp_path):
+    context = JobContext(str(tmp_path))
+    stage = context.subcontext("ts_relax")
+
+    assert os.path.isdir(stage.folder)
+    assert stage.path("ts.out") == os.path.join(str(tmp_path), "ts_relax", "ts.out")
+    assert os.getcwd() != stage.folder
+    assert not os.path.exists(context.subcontext("missing", create=False).folder)
@@ -0,0 +1,43 @@
+import os, shutil, subprocess, sys
+
+from rxnrlx.common.procstat import ResourceSampler, save_samples
+from rxnrlx.efficiency import campaign_efficiency, size_bin
+
+DIR_PATH = os.path.dirname(__file__)
+INPUTS = os.path.join(DIR_PATH, "test_jaguar", "inputs")
+
+
+def test_sampler_follows_children():
+    # a shell running a busy child, like `sh -c "$SCHRODINGER/jaguar run ..."`
+    process = subprocess.Popen(
+        f"{sys.executable} -c 'import time; start = time.time()\nwhile time.time() - start < 0.5: pass'",
+        shell=True
+    )
+    sampler = ResourceSampler(process.pid, 0.05).start()
+    process.wait()
+    samples = sampler.stop()
+
+    assert len(samples) >= 3
+    assert max(sample["num_processes"] for sample in samples) >= 1
+    assert samples[-1]["cpu_seconds"] > 0.2
+    assert max(sample["rss_bytes"] for sample in samples) > 0
+
+
+def test_campaign_efficiency(tmp_path):
+    reaction = tmp_path / "rxn1"
+    reaction.mkdir()
+    shutil.copy(os.path.join(INPUTS, "irc.out"), reaction)
+
+    # 100 s of wall time using 16 of the 32 cores the job was given
+    samples = [
+        {"time": t, "cpu_seconds": 16 * t, "rss_bytes": 2e9, "read_bytes": 0, "write_bytes": 1e6 * t, "num_processes": 3}
+        for t in [0, 50, 100]
+    ]
+    save_samples(samples, str(reaction / "irc.resources.npz"), name="irc", num_tasks=32)
+
+    report = campaign_efficiency(str(tmp_path))
+    usage = report["jobs"][os.path.join("rxn1", "irc.resources.npz")]
+
+    assert usage["job_type"] == "irc" and usage["num_basis_functions"] == 45
+    assert usage["efficiency"] == 0.5
+    assert report["groups"][("irc", size_bin(45), 32)]["num_jobs"] == 1
@@ -0,0 +1,45 @@
+import os
+
+from rxnrlx.common.utils import load_config
+from rxnrlx.jaguar.retry import load_retry_policy
+from rxnrlx.symmetry import load_symmetry_settings
+
+DIR_PATH = os.path.dirname(__file__)
+CONFIG_DIR = os.path.join(DIR_PATH, "..", "rxnrlx", "example_configs", "jaguar")
+
+
+def check_common_sections(config):
+    """ Keys every workflow reads from the config file """
+    assert config["info"]["software"] == "jaguar"
+    assert isinstance(config["info"].get("ntasks", 2), int)
+    assert isinstance(config["info"].get("charge", 0), int)
+    assert isinstance(config["info"].get("multiplicity", 1), int)
+    load_retry_policy(config.get("retry"))
+    load_symmetry_settings(config.get("symmetry"))
+
+
+def test_ts2rxn_config():
+    """
+    The example ts2rxn config should hold every key ts2rxn reads
+    """
+    config = load_config(os.path.join(CONFIG_DIR, "config.yaml"))
+    check_common_sections(config)
+
+    assert config["info"]["ts_guess_filename"]
+    assert config["info"]["job_name"]
+    for section in ["ts_relax", "irc", "geom_opt"]:
+        assert isinstance(config.get(section, {}), dict)
+
+
+def test_refine_config():
+    """
+    The example refine config should hold every key refine reads
+    """
+    config = load_config(os.path.join(CONFIG_DIR, "config-refine.yaml"))
+    check_common_sections(config)
+
+    assert "old_job_folder" in config["info"]
+    assert config["info"]["reoptimize"] is True
+    for section in ["ts_relax", "geom_opt", "energy"]:
+        assert isinstance(config.get(section, {}), dict)
+    assert "reoptimize" not in config.get("retry", {})
@@ -0,0 +1,149 @@
+import os, stat, time
+
+from pymatgen.core.structure import Molecule
+
+from rxnrlx.archive import finished_outputs
+from rxnrlx.common.context import JobContext
+from rxnrlx.status import campaign_status, job_state
+from rxnrlx.jaguar import executor
+from rxnrlx.jaguar.executor import run_jobs
+
+# Stand-in for $SCHRODINGER/jaguar: jobs whose name starts with "ok" succeed
+FAKE_JAGUAR = """#!/bin/sh
+name=$(basename "$6" .in)
+echo "xyz" > "$name.xyz"
+echo "scratch" > "$name.log"
+case "$name" in
+    ok*) echo "Job $name completed on node" ;;
+    *) echo "ERROR 7019: fatal error" ;;
+esac
+"""
+
+
+def fake_schrodinger(tmp_path, monkeypatch):
+    schrodinger = tmp_path / "schrodinger"
+    schrodinger.mkdir()
+    jaguar = schrodinger / "jaguar"
+    jaguar.write_text(FAKE_JAGUAR)
+    jaguar.chmod(jaguar.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("SCHRODINGER", str(schrodinger))
+
+
+def test_run_jobs_on_scratch(tmp_path, monkeypatch):
+    fake_schrodinger(tmp_path, monkeypatch)
+    (tmp_path / "scratch").mkdir()
+    monkeypatch.setenv("RXNRLX_TEST_SCRATCH", str(tmp_path / "scratch"))
+    monkeypatch.setattr(executor, "POLL_INTERVAL", 0.1)
+
+    context = JobContext(str(tmp_path / "job"), scratch="$RXNRLX_TEST_SCRATCH").subcontext("stage", exist_ok=True)
+    molecule = Molecule(["H", "H"], [[0, 0, 0], [0, 0, 0.74]])
+    jobs = [
+        {"name": name, "job_prefix": "test", "structure": molecule, "parameters": {}}
+        for name in ["ok_job", "failed_job"]
+    ]
+
+    # while the jobs run on scratch, the job folder holds their inputs and status counts them as running
+    running = list()
+    launch_job = executor.launch_job
+    def launch_and_scan(name, *args, **kwargs):
+        running.append(campaign_status(str(tmp_path), use_cache=False)["job"]["running"])
+        with open(context.path(f"{name}.staged"), "r") as f:
+            assert f.read().strip().startswith(str(tmp_path / "scratch"))
+        return launch_job(name, *args, **kwargs)
+    monkeypatch.setattr(executor, "launch_job", launch_and_scan)
+
+    results = run_jobs(jobs, num_tasks=1, context=context)
+
+    assert results["ok_job"]["success"] and not results["failed_job"]["success"]
+    assert running[-1] == ["stage/failed_job.out", "stage/ok_job.out"]
+    assert not any(name.endswith(".staged") for name in os.listdir(context.folder))
+
+    # outputs are copied back, other scratch files are not
+    for name in ["ok_job", "failed_job"]:
+        for ext in ["in", "out", "xyz"]:
+            assert os.path.exists(context.path(f"{name}.{ext}"))
+        assert not os.path.exists(context.path(f"{name}.log"))
+
+    # only the scratch folder of the failed job is kept
+    kept = os.listdir(tmp_path / "scratch")
+    assert len(kept) == 1 and kept[0].startswith("failed_job_")
+
+
+TIMED_JAGUAR = """#!/bin/sh
+name=$(basename "$6" .in)
+case "$name" in
+    ok_slow*) sleep 3 ;;
+    *) sleep 0.5 ;;
+esac
+echo "Job $name completed on node"
+"""
+
+
+def test_run_jobs__sampled_wall_time(tmp_path, monkeypatch):
+    """
+    Each job should only be sampled until its own process exits, even if a job launched earlier is still running
+    """
+    import numpy as np
+
+    fake_schrodinger(tmp_path, monkeypatch)
+    (tmp_path / "schrodinger" / "jaguar").write_text(TIMED_JAGUAR)
+    monkeypatch.setattr(executor, "POLL_INTERVAL", 0.1)
+
+    context = JobContext(str(tmp_path), sample_interval=0.05).subcontext("job")
+    molecule = Molecule(["H", "H"], [[0, 0, 0], [0, 0, 0.74]])
+    jobs = [
+        {"name": name, "job_prefix": "test", "structure": molecule, "parameters": {}}
+        for name in ["ok_slow_job", "ok_fast_job"]
+    ]
+    results = run_jobs(jobs, num_tasks=1, context=context)
+    assert results["ok_slow_job"]["success"] and results["ok_fast_job"]["success"]
+
+    wall_times = dict()
+    for name in ["ok_slow_job", "ok_fast_job"]:
+        with np.load(context.path(f"{name}.resources.npz")) as data:
+            wall_times[name] = data["time"][-1] - data["time"][0]
+    assert wall_times["ok_fast_job"] < 1.0
+    assert wall_times["ok_slow_job"] > 2.5
+
+
+RACING_JAGUAR = """#!/bin/sh
+name=$(basename "$6" .in)
+echo "Starting $name"
+case "$name" in
+    fast*) echo "Job $name completed on node" ;;
+    *) sleep 60; echo "Job $name completed on node" ;;
+esac
+"""
+
+
+def test_race_jobs(tmp_path, monkeypatch):
+    fake_schrodinger(tmp_path, monkeypatch)
+    (tmp_path / "schrodinger" / "jaguar").write_text(RACING_JAGUAR)
+    jobcontrol = tmp_path / "schrodinger" / "jobcontrol"
+    jobcontrol.write_text('#!/bin/sh\necho "$@" >> "$SCHRODINGER/jobcontrol.log"\n')
+    jobcontrol.chmod(jobcontrol.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(executor, "POLL_INTERVAL", 0.5)
+    monkeypatch.setattr(executor, "KILL_TIMEOUT", 1)
+
+    context = JobContext(str(tmp_path)).subcontext("job")
+    molecule = Molecule(["H", "H"], [[0, 0, 0], [0, 0, 0.74]])
+    jobs = [
+        {"name": name, "job_prefix": "test", "structure": molecule, "parameters": {}}
+        for name in ["slow_job", "fast_job", "fast_other_job", "queued_job"]
+    ]
+    start = time.time()
+    winner, results = executor.race_jobs(jobs, num_tasks=3, context=context)
+
+    assert winner == "fast_job"
+    assert time.time() - start < 30
+    assert results["slow_job"]["cancelled"] and results["queued_job"]["cancelled"]
+
+    # a job that finished in the same poll is not cancelled
+    assert results["fast_other_job"]["success"] and not results["fast_other_job"]["cancelled"]
+
+    # the loser is killed through job control, its partial output is kept and marked as cancelled
+    assert (tmp_path / "schrodinger" / "jobcontrol.log").read_text().startswith("-kill test_")
+    with open(context.path("slow_job.out"), "r") as f:
+        assert "Starting slow_job" in f.read()
+    assert job_state(context.path("slow_job.out")) == "cancelled"
+    assert finished_outputs(context.folder, os.listdir(context.folder)) == ["fast_job.out", "fast_other_job.out", "slow_job.out"]
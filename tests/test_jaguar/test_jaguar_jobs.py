@@ -0,0 +1,70 @@
+from rxnrlx.common.context import JobContext
+from rxnrlx.jaguar.jaguar_jobs import calculate_gibbs, get_ts_hessian
+from rxnrlx.jaguar.create_inputs import jaguar_input
+from rxnrlx.jaguar.read_files import find_output, get_energy_from_file
+from rxnrlx.symmetry import register
+from pymatgen.core.structure import Molecule
+import os, shutil
+
+DIR_PATH = os.path.dirname(__file__)
+
+HESSIAN = "&hess\n   1   1  0.5\n   2   1  0.1\n   2   2  0.4\n&"
+
+
+def make_restart_file(path, structure):
+    """ Write a restart file in the Jaguar input format holding a Hessian """
+    jaguar_input(path, structure, {"igeopt": 2}, [HESSIAN])
+
+
+def test_get_ts_hessian__matching_geometry(tmp_path):
+    """
+    The Hessian of the restart file should be reused for the same geometry
+    """
+    ts = Molecule(["H", "H"], [[0.0, 0.0, 0.0], [0.0, 0.0, 0.74]])
+    make_restart_file(f"{tmp_path}/ts_opt.restart.in", ts)
+    ts.properties["restart_file"] = f"{tmp_path}/ts_opt.restart.in"
+
+    assert get_ts_hessian(ts) == HESSIAN
+
+
+def test_get_ts_hessian__fallback(tmp_path):
+    """
+    Without a restart file, or once the geometry changed, the Hessian should be recomputed
+    """
+    ts = Molecule(["H", "H"], [[0.0, 0.0, 0.0], [0.0, 0.0, 0.74]])
+    assert get_ts_hessian(ts) is None
+
+    make_restart_file(f"{tmp_path}/ts_opt.restart.in", ts)
+    moved = Molecule(["H", "H"], [[0.0, 0.0, 0.0], [0.0, 0.0, 0.80]])
+    moved.properties["restart_file"] = f"{tmp_path}/ts_opt.restart.in"
+    assert get_ts_hessian(moved) is None
+
+
+def test_calculate_gibbs__reuse_equivalent_species(tmp_path):
+    """
+    Species registered by another reaction at the same level of theory should not be computed again
+    (symmetric species override isymm: 0 of the config, the transition state always runs with isymm=0)
+    """
+    water = Molecule(["O", "H", "H"], [[0.0, 0.0, 0.0], [0.757, 0.586, 0.0], [-0.757, 0.586, 0.0]])
+    registry_file = str(tmp_path / "species.json")
+    outfile = f"{DIR_PATH}/inputs/energy_rev.out"
+    parameters = {"ifreq": 1, "molchg": water.charge, "multip": water.spin_multiplicity}
+    register(registry_file, water, dict(parameters, isymm=8), outfile, "C2v")
+    ts_outfile = str(tmp_path / "energy_ts_no_symmetry.out")
+    shutil.copyfile(outfile, ts_outfile)
+    register(registry_file, water, dict(parameters, isymm=0), ts_outfile, "C1")
+
+    # the same species in another orientation (no job can be launched here, so every species must be reused)
+    rotated = Molecule(["H", "O", "H"], [[0.586, 0.757, 0.0], [0.0, 0.0, 0.0], [0.586, -0.757, 0.0]])
+    energies = calculate_gibbs(
+        water, rotated, water, {"ifreq": 1, "isymm": 0}, num_tasks=3,
+        context=JobContext(str(tmp_path)), symmetry={"registry": registry_file}
+    )
+
+    assert energies["forward"] == energies["transition_state"] == get_energy_from_file(outfile)
+
+    # the reuse is recorded with a pointer to the registered output, no output is made up
+    stage = tmp_path / "energy_calculation"
+    assert not any(name.endswith(".out") for name in os.listdir(stage))
+    assert find_output(str(stage / "energy_rev.out")) == outfile
+    assert find_output(str(stage / "energy_ts.out")) == ts_outfile
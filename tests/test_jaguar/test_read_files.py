@@ -1,4 +1,4 @@
-from rxnrlx.jaguar.read_files import get_mols_from_irc, get_energy_from_file, verify_success
+from rxnrlx.jaguar.read_files import get_mols_from_irc, get_energy_from_file, verify_success, verify_failure, read_tail, count_negative_hessian_eigenvalues
 import os
 
 DIR_PATH = os.path.dirname(__file__)
@@ -38,4 +38,32 @@ def test_verify_success__failed_job():
     """
     Given an outfile of a failed job, ensure that the function returns a False value
     """
-    assert not verify_success(f"{DIR_PATH}/inputs/ts.out", "ts")
\ No newline at end of file
+    assert not verify_success(f"{DIR_PATH}/inputs/ts.out", "ts")
+
+def test_verify_failure():
+    """
+    Only the output of the job that Jaguar aborted should be reported as failed
+    """
+    assert verify_failure(f"{DIR_PATH}/inputs/ts.out")
+    assert not verify_failure(f"{DIR_PATH}/inputs/irc.out")
+
+
+def test_read_tail__last_line():
+    """
+    The tail of the file should end with the same line as the full file
+    """
+    with open(f"{DIR_PATH}/inputs/irc.out", "r") as f:
+        lines = f.read().splitlines()
+
+    tail = read_tail(f"{DIR_PATH}/inputs/irc.out", num_bytes=1000)
+
+    assert tail == lines[-len(tail):]
+
+
+def test_count_negative_hessian_eigenvalues():
+    """
+    The TS optimization in ts.out ends on a Hessian with two negative eigenvalues (not a valid TS),
+    frequency jobs do not print optimization Hessians
+    """
+    assert count_negative_hessian_eigenvalues(f"{DIR_PATH}/inputs/ts.out") == 2
+    assert count_negative_hessian_eigenvalues(f"{DIR_PATH}/inputs/energy_rev.out") is None
@@ -0,0 +1,63 @@
+from rxnrlx.jaguar.retry import classify_failure, load_retry_policy, next_attempt
+from pymatgen.core.structure import Molecule
+import os
+import pytest
+
+DIR_PATH = os.path.dirname(__file__)
+
+
+def make_job():
+    """ Job specification for the failed TS search in ts.out """
+    structure = Molecule(["He"]*21, [[0.0, 0.0, float(i)] for i in range(21)])
+    return {"name": "ts", "structure": structure, "parameters": {"igeopt": 2, "maxitg": 300}, "history": []}
+
+
+def test_classify_failure():
+    """
+    The TS search in ts.out ran out of geometry steps
+    """
+    assert classify_failure(f"{DIR_PATH}/inputs/ts.out") == "geometry_convergence"
+
+
+def test_next_attempt__escalation():
+    """
+    Each retry should apply the next escalation step configured for the failure type
+    """
+    policy = load_retry_policy({"max_attempts": 4})
+    job = make_job()
+
+    retry = next_attempt(job, f"{DIR_PATH}/inputs/ts.out", policy)
+    assert retry["history"] == [("geometry_convergence", "restart_from_last_geometry")]
+    assert "Li" in [site.species_string for site in retry["structure"]]
+
+    retry = next_attempt(retry, f"{DIR_PATH}/inputs/ts.out", policy)
+    assert retry["parameters"]["maxitg"] == 600
+
+    retry = next_attempt(retry, f"{DIR_PATH}/inputs/ts.out", policy)
+    assert retry["parameters"]["nhesref"] == 10
+
+    assert next_attempt(retry, f"{DIR_PATH}/inputs/ts.out", policy) is None
+
+
+def test_next_attempt__irc_keeps_structure():
+    """
+    IRC jobs should be restarted from their TS, not from the last point of the path they printed
+    """
+    job = dict(make_job(), name="irc", parameters={"irc": 1})
+    job["structure"] = Molecule(["He"]*8, [[0.0, 0.0, float(i)] for i in range(8)])
+
+    retry = next_attempt(job, f"{DIR_PATH}/inputs/irc.out", load_retry_policy({"max_attempts": 2}))
+    assert retry["history"] == [("unknown", "restart_from_last_geometry")]
+    assert retry["structure"] is job["structure"]
+
+
+def test_next_attempt__no_policy():
+    """
+    Without a retry section jobs should only be run once
+    """
+    assert next_attempt(make_job(), f"{DIR_PATH}/inputs/ts.out", load_retry_policy(None)) is None
+
+
+def test_load_retry_policy__unknown_step():
+    with pytest.raises(Exception):
+        load_retry_policy({"escalation": {"scf_convergence": ["not_a_step"]}})
@@ -0,0 +1,48 @@
+import os
+import numpy as np
+
+from rxnrlx.jaguar.read_files import get_mols_from_irc, iter_irc_points
+from rxnrlx.jaguar.trajectory import load_trajectory, read_irc_trajectory, write_trajectory
+
+DIR_PATH = os.path.dirname(__file__)
+IRC_OUT = f"{DIR_PATH}/inputs/irc.out"
+
+
+def test_iter_irc_points():
+    points = list(iter_irc_points(IRC_OUT))
+
+    assert len(points) == 79
+    assert (points[0]["direction"], points[0]["energy"]) == ("ts", -786.23687214778)
+    assert (points[1]["direction"], points[1]["index"]) == ("forward", 1)
+    assert sum(point["direction"] == "reverse" for point in points) == 40
+    assert points[0]["species"] == ["P", "O", "F", "F", "F", "Li", "O", "H"]
+
+
+def test_read_irc_trajectory():
+    trajectory = read_irc_trajectory(IRC_OUT)
+
+    assert trajectory["coords"].shape == (79, 8, 3)
+    # ordered from the reverse end to the forward end, as in Jaguar's summary table
+    assert trajectory["reaction_coordinate"][0] == -3.98816 and trajectory["reaction_coordinate"][-1] == 3.36946
+    assert trajectory["direction"][40] == 0 and trajectory["reaction_coordinate"][40] == 0
+    assert abs(trajectory["energies"][0] - -786.285220) < 1e-6
+
+    # the endpoints are the structures found by get_mols_from_irc
+    forward, reverse = get_mols_from_irc(IRC_OUT, 8)
+    assert np.allclose(trajectory["coords"][-1], forward.cart_coords)
+    assert np.allclose(trajectory["coords"][0], reverse.cart_coords)
+
+
+def test_write_trajectory(tmp_path):
+    trajectory = read_irc_trajectory(IRC_OUT)
+
+    write_trajectory(trajectory, str(tmp_path / "irc.npz"))
+    loaded = load_trajectory(str(tmp_path / "irc.npz"))
+    assert loaded["species"] == trajectory["species"]
+    assert np.array_equal(loaded["energies"], trajectory["energies"])
+
+    write_trajectory(trajectory, str(tmp_path / "irc.xyz"))
+    with open(tmp_path / "irc.xyz", "r") as f:
+        lines = f.readlines()
+    assert len(lines) == 79 * 10
+    assert lines[1].startswith("point 0 reaction_coordinate -3.98816")
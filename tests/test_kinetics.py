@@ -0,0 +1,72 @@
+from rxnrlx.kinetics import (
+    eyring, tunneling_correction, build_network, network_rates, network_jacobian, integrate_network, reaction_rates
+)
+import os, shutil
+import numpy as np
+
+
+def test_eyring__prefactor():
+    """
+    Without a barrier the rate constant is the kT/h prefactor, and each barrier/temperature pair is evaluated
+    """
+    rates = eyring([0.0, 0.5], [298.15, 400.0])
+
+    assert rates.shape == (2, 2)
+    assert np.isclose(rates[0, 0], 6.2124e12, rtol=1e-4)
+    assert rates[1, 0] < rates[1, 1]
+
+
+def test_tunneling_correction__wigner():
+    """
+    Wigner correction for a 1000 cm^-1 imaginary mode at room temperature
+    """
+    kappa = tunneling_correction("wigner", [1000.0], [298.15])
+
+    assert np.isclose(kappa[0, 0], 1 + (1000 * 1.438777 / 298.15)**2 / 24, rtol=1e-5)
+
+
+def test_integrate_network__first_order():
+    """
+    A <-> B should follow the analytic solution of a reversible first order reaction
+    """
+    network = build_network([{"reactants": ["A"], "products": ["B"], "kf": 2.0, "kr": 1.0}])
+    result = integrate_network(network, {"A": 1.0}, time=5.0, num_points=50)
+
+    expected_a = 1/3 + 2/3 * np.exp(-3.0 * result["time"])
+    assert np.allclose(result["concentrations"][0], expected_a, atol=1e-5)
+    assert np.allclose(result["concentrations"].sum(axis=0), 1.0)
+
+
+def test_network_jacobian__finite_difference():
+    """
+    The analytic sparse Jacobian should match finite differences of the production rates
+    """
+    network = build_network([
+        {"reactants": ["A", "B"], "products": ["C"], "kf": 3.0, "kr": 0.5},
+        {"reactants": ["C", "C"], "products": ["D"], "kf": 1.5, "kr": 0.1},
+    ])
+    y = np.array([0.7, 0.4, 0.3, 0.2])
+
+    def production(y):
+        return network["stoichiometry"] @ network_rates(network, y)
+
+    numerical = np.array([(production(y + dy) - production(y - dy)) / 2e-6 for dy in 1e-6 * np.eye(4)]).T
+
+    assert np.allclose(network_jacobian(network, y).toarray(), numerical, atol=1e-6)
+
+
+def test_reaction_rates__skips_failed_frequency_jobs(tmp_path):
+    """
+    A reaction whose frequency outputs cannot be read should be skipped without aborting the ranking
+    """
+    energy_file = os.path.join(os.path.dirname(__file__), "test_jaguar", "inputs", "energy_rev.out")
+    for reaction in ["rxn_ok", "rxn_failed"]:
+        folder = tmp_path / reaction / "energy_calculation"
+        folder.mkdir(parents=True)
+        for outfile in ["energy_fwd.out", "energy_rev.out", "energy_ts.out"]:
+            shutil.copy(energy_file, folder / outfile)
+    (tmp_path / "rxn_failed" / "energy_calculation" / "energy_ts.out").write_text("ERROR 7019: fatal error\n")
+
+    rates = reaction_rates(str(tmp_path), [298.15], use_thermo=True)
+
+    assert list(rates) == ["rxn_ok"]
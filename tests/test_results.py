@@ -0,0 +1,94 @@
+import os, time
+import pytest
+import yaml
+from pymatgen.core.structure import Molecule
+
+from rxnrlx.common.context import JobContext
+from rxnrlx.common.results import ReactionResult, ResultWriter, write_energy_file, write_structures
+from rxnrlx.jaguar.read_files import get_energy_from_file
+from rxnrlx.refine import refine
+from rxnrlx.symmetry import register
+
+DIR_PATH = os.path.dirname(__file__)
+
+WATER = Molecule(["O", "H", "H"], [[0.0, 0.0, 0.0], [0.757, 0.586, 0.0], [-0.757, 0.586, 0.0]])
+
+
+def slow_write(path, content):
+    time.sleep(0.2)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_result_writer(tmp_path):
+    """
+    Files are written in the background and are all there after flush
+    """
+    writer = ResultWriter()
+    writer.submit(slow_write, str(tmp_path / "a.txt"), "a")
+    writer.submit(write_structures, {"forward": WATER, "product": WATER}, str(tmp_path / "structures"))
+    assert not os.path.exists(tmp_path / "a.txt")
+
+    writer.flush()
+    assert (tmp_path / "a.txt").read_text() == "a"
+    assert sorted(os.listdir(tmp_path / "structures")) == ["FORWARD.xyz", "product.xyz"]
+
+    # errors of the background thread are raised by flush
+    writer.submit(write_energy_file, {"forward": -1.0}, str(tmp_path / "missing" / "deeper" / "energy.yaml"))
+    writer.submit(slow_write, str(tmp_path / "missing_folder" / "b.txt"), "b")
+    with pytest.raises(Exception, match="could not be written"):
+        writer.close()
+
+    # disabled writers do not write anything
+    with ResultWriter(enabled=False) as writer:
+        writer.submit(slow_write, str(tmp_path / "c.txt"), "c")
+    assert not os.path.exists(tmp_path / "c.txt")
+
+
+def test_reaction_result__energies_before_refine(tmp_path):
+    """
+    A ts2rxn result has no energies, asking for them should say that refine has to run first
+    """
+    reaction = ReactionResult(
+        structures={"forward": WATER, "reverse": WATER, "transition_state": WATER},
+        context=JobContext(str(tmp_path)).subcontext("rxn1"),
+    )
+    with pytest.raises(Exception, match="Has refine been run"):
+        reaction.require_energies()
+
+    reaction.energies = {"forward": -76.0}
+    assert reaction.require_energies() == {"forward": -76.0}
+
+
+def test_refine__chained_reaction(tmp_path):
+    """
+    refine should take its structures from the result of ts2rxn and return the energies in memory
+    (every frequency job is reused from the species registry, so no Jaguar job is launched)
+    """
+    outfile = f"{DIR_PATH}/test_jaguar/inputs/energy_rev.out"
+    registry_file = str(tmp_path / "species.json")
+    for parameters in [{"ifreq": 1, "molchg": 0, "multip": 1, "isymm": 0}, {"ifreq": 1, "molchg": 0, "multip": 1, "isymm": 8}]:
+        register(registry_file, WATER, parameters, outfile, "C2v")
+
+    config = {
+        "info": {"software": "jaguar", "reoptimize": False, "ntasks": 3},
+        "energy": {"ifreq": 1},
+        "symmetry": {"registry": registry_file},
+    }
+    context = JobContext(str(tmp_path))
+    reaction = ReactionResult(
+        structures={"forward": WATER, "reverse": WATER, "transition_state": WATER},
+        context=context.subcontext("rxn1"),
+        timings={"ts2rxn/irc": 10.0},
+    )
+
+    with ResultWriter() as writer:
+        refined = refine(config, context, reaction=reaction, writer=writer)
+
+    assert refined.energies["forward"] == get_energy_from_file(outfile)
+    assert refined.energies["Reaction Info (eV)"]["Delta G"] == 0
+    assert set(refined.timings) == {"ts2rxn/irc", "refine/calculate_gibbs"}
+    assert refined.structures["forward"] is not WATER and WATER.charge == 0
+
+    with open(refined.paths["energy_file"], "r") as f:
+        assert yaml.safe_load(f) == refined.energies
@@ -0,0 +1,98 @@
+import os, shutil
+import numpy as np
+
+from pymatgen.core.structure import Molecule
+
+from rxnrlx.runtime_model import accuracy_report, collect_timings, fit, predict, predict_ts2rxn, schedule
+
+DIR_PATH = os.path.dirname(__file__)
+INPUTS = os.path.join(DIR_PATH, "test_jaguar", "inputs")
+
+
+def synthetic_records(num_records, seed=0):
+    """ Jobs whose time per step grows as basis functions^2.5 / threads^0.8 (with 10% noise) """
+    rng = np.random.default_rng(seed)
+    records = list()
+    for i in range(num_records):
+        job_type = ["ts_relax", "irc", "geom_opt"][i % 3]
+        num_atoms = int(rng.integers(5, 60))
+        num_electrons = 4 * num_atoms
+        num_basis_functions = 10 * num_atoms
+        num_threads = int(rng.choice([8, 16, 32, 64]))
+        num_steps = int(rng.integers(20, 60)) * (i % 3 + 1)
+        time_per_step = 1e-4 * num_basis_functions**2.5 / num_threads**0.8 * np.exp(rng.normal(0, 0.1))
+        records.append({
+            "job_type": job_type, "basis": "def2-svpd", "num_atoms": num_atoms, "num_electrons": num_electrons,
+            "num_basis_functions": num_basis_functions, "num_threads": num_threads, "num_steps": num_steps,
+            "elapsed": time_per_step * num_steps,
+        })
+    return records
+
+
+def test_fit_and_predict():
+    model = fit(synthetic_records(60))
+
+    expected = 1e-4 * 300**2.5 / 16**0.8 * 40
+    predicted = predict(model, "ts_relax", 30, 120, 16, num_basis_functions=300, num_steps=40)
+    assert abs(predicted / expected - 1) < 0.15
+
+    # without the basis functions, they are estimated from the basis set
+    assert abs(predict(model, "ts_relax", 30, 120, 16, basis="DEF2-SVPD", num_steps=40) / predicted - 1) < 1e-6
+
+
+def test_predict_ts2rxn__stage_sections():
+    """
+    The frequency jobs should be predicted with the basis set of the energy section
+    """
+    records = synthetic_records(30)
+    for record in synthetic_records(10, seed=1):
+        records.append(dict(record, job_type="calculate_gibbs", basis="def2-tzvpd",
+                            num_basis_functions=3 * record["num_basis_functions"]))
+    model = fit(records)
+
+    molecule = Molecule(["O", "H", "H"], [[0.0, 0.0, 0.0], [0.757, 0.586, 0.0], [-0.757, 0.586, 0.0]])
+    config = {"info": {"ntasks": 12}, "geom_opt": {"basis": "def2-svpd"}, "energy": {"basis": "def2-tzvpd"}}
+    predictions = predict_ts2rxn(model, config, molecule)
+
+    expected = predict(model, "calculate_gibbs", 3, 10, 4, basis="def2-tzvpd")
+    assert abs(predictions["calculate_gibbs"] / expected - 1) < 1e-9
+    assert abs(predict(model, "calculate_gibbs", 3, 10, 4) / expected - 1) > 0.1
+
+    # frequency jobs reused from the registry leave their cores to the others
+    predictions = predict_ts2rxn(model, config, molecule, num_frequency_jobs=2)
+    assert abs(predictions["calculate_gibbs"] / predict(model, "calculate_gibbs", 3, 10, 6, basis="def2-tzvpd") - 1) < 1e-9
+    assert "calculate_gibbs" not in predict_ts2rxn(model, config, molecule, num_frequency_jobs=0)
+
+
+def test_accuracy_report():
+    report = accuracy_report(synthetic_records(100), test_fraction=0.2)
+
+    assert report["all"]["num_test"] == 20
+    assert report["all"]["known_steps"]["median_abs_pct_error"] < 20
+    assert report["all"]["known_steps"]["within_factor_2"] == 1.0
+
+
+def test_collect_timings(tmp_path):
+    reaction = tmp_path / "rxn1"
+    reaction.mkdir()
+    shutil.copy(os.path.join(INPUTS, "irc.out"), reaction)
+    shutil.copy(os.path.join(INPUTS, "energy_rev.out"), reaction)
+    shutil.copy(os.path.join(INPUTS, "ts.out"), reaction)
+
+    records = {record["outfile"]: record for record in collect_timings(str(tmp_path))}
+
+    # the failed TS optimization is not used
+    assert set(records) == {os.path.join("rxn1", "irc.out"), os.path.join("rxn1", "energy_rev.out")}
+    irc = records[os.path.join("rxn1", "irc.out")]
+    assert irc["job_type"] == "irc" and irc["num_steps"] == 79 and irc["elapsed"] == 611
+    assert records[os.path.join("rxn1", "energy_rev.out")]["job_type"] == "calculate_gibbs"
+
+    # cached the second time
+    assert collect_timings(str(tmp_path)) == list(records.values())
+
+
+def test_schedule():
+    slots, walltime = schedule({"a": 10, "b": 7, "c": 5, "d": 4}, num_slots=2)
+
+    assert slots == [["a", "d"], ["b", "c"]]
+    assert walltime == 14
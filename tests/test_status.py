@@ -0,0 +1,57 @@
+from rxnrlx import status
+from rxnrlx.status import campaign_status
+import os, shutil
+
+DIR_PATH = os.path.dirname(__file__)
+INPUTS = f"{DIR_PATH}/test_jaguar/inputs"
+
+
+def make_campaign(root):
+    """ Build a small campaign with a finished, a failed and a running reaction """
+    os.makedirs(f"{root}/rxn_done/irc_calculation")
+    shutil.copy(f"{INPUTS}/irc.out", f"{root}/rxn_done/irc_calculation/irc.out")
+
+    os.makedirs(f"{root}/rxn_failed/ts_relaxation")
+    shutil.copy(f"{INPUTS}/ts.out", f"{root}/rxn_failed/ts_relaxation/ts.out")
+
+    os.makedirs(f"{root}/rxn_running/geometry_optimizations")
+    with open(f"{root}/rxn_running/geometry_optimizations/opt_fwd.in", "w") as f:
+        f.write("&gen\n&")
+    with open(f"{root}/rxn_running/geometry_optimizations/opt_fwd.out", "w") as f:
+        f.write("  start of program pre\n")
+
+
+def test_campaign_status(tmp_path):
+    """
+    Ensure each reaction is given the right stage, running jobs and failures
+    """
+    make_campaign(tmp_path)
+
+    statuses = campaign_status(str(tmp_path))
+
+    assert statuses["rxn_done"]["stage"] == "irc_calculation"
+    assert statuses["rxn_done"]["running"] == [] and statuses["rxn_done"]["failed"] == []
+    assert statuses["rxn_failed"]["failed"] == ["ts_relaxation/ts.out"]
+    assert statuses["rxn_running"]["running"] == ["geometry_optimizations/opt_fwd.out"]
+
+
+def test_campaign_status__incremental(tmp_path, monkeypatch):
+    """
+    A second scan should only re-read the output files that changed
+    """
+    make_campaign(tmp_path)
+    campaign_status(str(tmp_path))
+
+    read_files = list()
+    job_state = status.job_state
+    monkeypatch.setattr(status, "job_state", lambda outfile: read_files.append(outfile) or job_state(outfile))
+
+    campaign_status(str(tmp_path))
+    assert read_files == []
+
+    with open(f"{tmp_path}/rxn_running/geometry_optimizations/opt_fwd.out", "a") as f:
+        f.write("\nJob opt_fwd completed on node at Wed Sep 24 00:41:48 2025\n")
+
+    statuses = campaign_status(str(tmp_path))
+    assert read_files == [f"{tmp_path}/rxn_running/geometry_optimizations/opt_fwd.out"]
+    assert statuses["rxn_running"]["running"] == []
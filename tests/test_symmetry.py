@@ -0,0 +1,111 @@
+import numpy as np
+from pymatgen.core.structure import Molecule
+
+from rxnrlx.symmetry import (
+    campaign_species, equivalent, equivalent_groups, find_registered, load_registry, load_symmetry_settings, register,
+    symmetrize
+)
+
+WATER = [[0.0, 0.0, 0.0], [0.757, 0.586, 0.0], [-0.757, 0.586, 0.0]]
+
+
+def water(coords=WATER, charge=0):
+    return Molecule(["O", "H", "H"], coords, charge=charge)
+
+
+def test_symmetrize():
+    """
+    Near-symmetric structures are symmetrized within the tolerance, others are kept as they are
+    """
+    distorted = water([[0.0, 0.0, 0.0], [0.757, 0.586, 0.0], [-0.760, 0.580, 0.01]])
+    symmetrized, point_group = symmetrize(distorted, tolerance=0.1)
+    assert point_group == "C2v"
+    distances = symmetrized.distance_matrix
+    assert abs(distances[0, 1] - distances[0, 2]) < 1e-6
+
+    skewed = Molecule(["N", "H", "H", "H"], [[0.0, 0.0, 0.0], [1.0, 0.1, -0.3], [-0.3, 0.9, -0.5], [-0.6, -0.8, -0.2]])
+    kept, point_group = symmetrize(skewed, tolerance=0.1)
+    assert point_group == "C1" and kept is skewed
+
+    assert load_symmetry_settings(None) is None
+    assert load_symmetry_settings({"tolerance": 0.05}) == {
+        "tolerance": 0.05, "frequency_tolerance": 1e-3, "reuse_tolerance": 1e-3, "eigen_tolerance": 0.01, "registry": None
+    }
+
+    # frequency-only structures are only cleaned up within a tight tolerance
+    cleaned, point_group = symmetrize(distorted, tolerance=1e-3)
+    assert point_group != "C2v"
+    assert np.linalg.norm(cleaned.cart_coords - cleaned.center_of_mass - distorted.cart_coords
+                          + distorted.center_of_mass, axis=1).max() < 1e-3
+
+
+def test_equivalent():
+    """
+    Equivalence should not depend on orientation or atom order, but on charge and geometry
+    """
+    rotation = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+    rotated = Molecule(["H", "O", "H"], np.array([WATER[1], WATER[0], WATER[2]]) @ rotation.T + 3.0)
+
+    assert equivalent(water(), rotated)
+    assert not equivalent(water(), water(charge=1))
+    assert not equivalent(water(), water([[0.0, 0.0, 0.0], [0.957, 0.0, 0.0], [-0.957, 0.0, 0.0]]))
+
+    groups = equivalent_groups({"a": water(), "b": water(charge=1), "c": rotated})
+    assert groups == [["a", "c"], ["b"]]
+
+
+def test_equivalent__distinct_conformers():
+    """
+    Two conformers of the same molecule should not be merged, even when they are within the symmetry tolerance
+    """
+    # methanol with the hydroxyl hydrogen staggered or rotated by 10 degrees
+    atoms = ["C", "O", "H", "H", "H", "H"]
+    frame = [[0.0, 0.0, 0.0], [1.43, 0.0, 0.0], [-0.36, 1.03, 0.0], [-0.36, -0.51, 0.89], [-0.36, -0.51, -0.89]]
+    angle = np.radians(10)
+    staggered = Molecule(atoms, frame + [[1.75, -0.91, 0.0]])
+    rotated = Molecule(atoms, frame + [[1.75, -0.91 * np.cos(angle), 0.91 * np.sin(angle)]])
+
+    assert equivalent(staggered, rotated, tolerance=0.1)
+    assert not equivalent(staggered, rotated)
+    assert equivalent_groups({"a": staggered, "b": rotated}) == [["a"], ["b"]]
+
+
+def test_registry(tmp_path):
+    """
+    Registered outputs are found for equivalent species computed with the same keywords
+    """
+    registry_file = str(tmp_path / "species.json")
+    outfile = tmp_path / "energy_fwd.out"
+    outfile.write_text("output")
+
+    assert load_registry(registry_file) == []
+    register(registry_file, water(), {"basis": "def2-svpd"}, str(outfile), "C2v")
+    registry = load_registry(registry_file)
+
+    assert find_registered(registry, water(), {"basis": "def2-svpd"})["outfile"] == str(outfile)
+    assert find_registered(registry, water(), {"basis": "def2-tzvpd"}) is None
+    assert find_registered(registry, water(charge=1), {"basis": "def2-svpd"}) is None
+    stretched = water([[0.0, 0.0, 0.0], [0.767, 0.586, 0.0], [-0.757, 0.586, 0.0]])
+    assert find_registered(registry, stretched, {"basis": "def2-svpd"}) is None
+
+    outfile.unlink()
+    assert find_registered(registry, water(), {"basis": "def2-svpd"}) is None
+
+
+def test_campaign_species(tmp_path):
+    """
+    Species found in the final structures of several reactions should be grouped together
+    """
+    for reaction, product in [("rxn_a", water()), ("rxn_b", Molecule(["H", "H"], [[0, 0, 0], [0, 0, 0.74]]))]:
+        folder = tmp_path / reaction / "final_structures"
+        folder.mkdir(parents=True)
+        water().to(str(folder / "REVERSE.xyz"))
+        product.to(str(folder / "FORWARD.xyz"))
+
+    report = campaign_species(str(tmp_path))
+
+    assert report["species"]["rxn_a/final_structures/REVERSE.xyz"] == "C2v"
+    assert report["species"]["rxn_b/final_structures/FORWARD.xyz"] == "D*h"
+    assert sorted(report["equivalent"][0]) == [
+        "rxn_a/final_structures/FORWARD.xyz", "rxn_a/final_structures/REVERSE.xyz", "rxn_b/final_structures/REVERSE.xyz"
+    ]
@@ -0,0 +1,83 @@
+from rxnrlx.thermo import find_energy_folders, load_thermo_data, reaction_thermo, thermochemistry, gibbs_free_energy
+from rxnrlx.cli import build_parser, parse_temperatures
+import os, shutil
+import numpy as np
+
+DIR_PATH = os.path.dirname(__file__)
+ENERGY_FILE = f"{DIR_PATH}/test_jaguar/inputs/energy_rev.out"
+
+
+def test_thermochemistry__matches_jaguar():
+    """
+    At the temperature and pressure of the job, the free energy should match the one Jaguar printed
+    """
+    data = load_thermo_data(ENERGY_FILE, use_cache=False)
+    result = thermochemistry(data, 298.15, qrrho="truhlar")
+
+    assert abs(result["gibbs"][0] - (-799.720018)) < 2e-6
+    assert abs(result["zpe"][0] * 627.5095 - 18.558) < 1e-3
+
+
+def test_thermochemistry__default_treatment():
+    """
+    The thermo and kinetics commands should default to the treatment of Jaguar, with harmonic as an explicit option
+    """
+    parser = build_parser()
+    assert parser.parse_args(["thermo", "campaign"]).qrrho == "truhlar"
+    assert parser.parse_args(["kinetics", "campaign"]).qrrho == "truhlar"
+    assert parser.parse_args(["thermo", "campaign", "--qrrho", "harmonic"]).qrrho == "harmonic"
+
+    # with a mode below the cutoff, only the harmonic treatment leaves it as it is
+    data = load_thermo_data(ENERGY_FILE, use_cache=False)
+    data = dict(data, frequencies=list(data["frequencies"]) + [50.0])
+    harmonic = thermochemistry(data, 298.15, qrrho="harmonic")["gibbs"][0]
+    assert harmonic == thermochemistry(data, 298.15, qrrho=None)["gibbs"][0]
+    assert harmonic != thermochemistry(data, 298.15, qrrho="truhlar")["gibbs"][0]
+
+
+def test_thermochemistry__temperature_grid():
+    """
+    Evaluating a grid at once should give the same values as one temperature at a time
+    """
+    data = load_thermo_data(ENERGY_FILE, use_cache=False)
+    temperatures = np.linspace(200, 500, 7)
+
+    grid = thermochemistry(data, temperatures, qrrho="grimme")["gibbs"]
+    single = [thermochemistry(data, T, qrrho="grimme")["gibbs"][0] for T in temperatures]
+
+    assert np.allclose(grid, single)
+    assert np.all(np.diff(grid) < 0)
+
+
+def test_load_thermo_data__cache(tmp_path):
+    """
+    The parsed data should be written next to the output file and reused
+    """
+    outfile = f"{tmp_path}/energy_rev.out"
+    shutil.copy(ENERGY_FILE, outfile)
+
+    first = gibbs_free_energy(outfile, [298.15])
+    assert os.path.exists(f"{outfile}.thermo.json")
+
+    assert np.allclose(gibbs_free_energy(outfile, [298.15]), first)
+
+
+def test_reaction_thermo__reused_outputs(tmp_path):
+    """
+    Frequency jobs reused from an equivalent species should be read from the output they point to
+    """
+    folder = tmp_path / "rxn1" / "energy_calculation"
+    folder.mkdir(parents=True)
+    shutil.copy(ENERGY_FILE, folder / "energy_fwd.out")
+    shutil.copy(ENERGY_FILE, tmp_path / "registered.out")
+    for name in ["energy_rev", "energy_ts"]:
+        (folder / f"{name}.reused").write_text(f"{tmp_path / 'registered.out'}\n")
+
+    assert find_energy_folders(str(tmp_path)) == {"rxn1": str(folder)}
+    energies = reaction_thermo(str(folder), [298.15], qrrho="truhlar")
+    assert np.allclose(energies["transition_state"], energies["forward"])
+
+
+def test_parse_temperatures():
+    assert parse_temperatures("250:300:25") == [250.0, 275.0, 300.0]
+    assert parse_temperatures("273.15,298.15") == [273.15, 298.15]
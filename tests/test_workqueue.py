@@ -0,0 +1,94 @@
+import json, os, time
+import yaml
+from pymatgen.core.structure import Molecule
+
+from rxnrlx import workqueue
+from rxnrlx.symmetry import register
+
+DIR_PATH = os.path.dirname(__file__)
+
+
+def test_claim_is_exclusive(tmp_path):
+    queue = str(tmp_path / "queue")
+    tasks = workqueue.enqueue(queue, "ts2rxn", ["a.yaml", "b.yaml"], folder=str(tmp_path))
+
+    first = workqueue.claim(queue, "node1-1")
+    second = workqueue.claim(queue, "node2-1")
+
+    assert os.path.basename(first) == f"{tasks[0]}@node1-1"
+    assert os.path.basename(second) == f"{tasks[1]}@node2-1"
+    assert workqueue.claim(queue, "node3-1") is None
+
+    assert workqueue.finish(queue, first)
+    assert workqueue.finish(queue, second, error="Traceback")
+    assert workqueue.queue_counts(queue) == {"pending": 0, "claimed": 0, "done": 1, "failed": 1}
+
+
+def test_release_stale(tmp_path):
+    queue = str(tmp_path / "queue")
+    task, = workqueue.enqueue(queue, "refine", ["a.yaml"], folder=str(tmp_path))
+    claimed = workqueue.claim(queue, "crashed-1")
+
+    assert workqueue.release_stale(queue, lease_timeout=60) == []
+
+    old = time.time() - 120
+    os.utime(claimed, (old, old))
+    assert workqueue.release_stale(queue, lease_timeout=60) == [task]
+
+    # the crashed worker cannot complete the task anymore, another one claims it
+    assert not workqueue.finish(queue, claimed)
+    assert workqueue.claim(queue, "node2-1") is not None
+
+
+def test_release_stale__rerun_resumes(tmp_path):
+    """
+    A task released after its worker crashed should run again in the folder the worker left behind
+    (refine reuses every frequency job from the species registry here, so no Jaguar job is launched)
+    """
+    water = Molecule(["O", "H", "H"], [[0.0, 0.0, 0.0], [0.757, 0.586, 0.0], [-0.757, 0.586, 0.0]])
+    os.makedirs(tmp_path / "rxn1" / "final_structures")
+    for filename in ["FORWARD.xyz", "REVERSE.xyz", "TRANSITION_STATE.xyz"]:
+        water.to(str(tmp_path / "rxn1" / "final_structures" / filename))
+
+    outfile = f"{DIR_PATH}/test_jaguar/inputs/energy_rev.out"
+    for parameters in [{"ifreq": 1, "molchg": 0, "multip": 1, "isymm": 0}, {"ifreq": 1, "molchg": 0, "multip": 1, "isymm": 8}]:
+        register(str(tmp_path / "species.json"), water, parameters, outfile, "C2v")
+    config = {
+        "info": {"software": "jaguar", "reoptimize": False, "ntasks": 3, "old_job_folder": "rxn1"},
+        "energy": {"ifreq": 1},
+        "symmetry": {"registry": "species.json"},
+    }
+    with open(tmp_path / "refine.yaml", "w") as f:
+        yaml.dump(config, f)
+
+    queue = str(tmp_path / "queue")
+    workqueue.enqueue(queue, "refine", [str(tmp_path / "refine.yaml")], folder=str(tmp_path))
+    claimed = workqueue.claim(queue, "crashed-1")
+
+    # the worker crashed in the middle of the frequency jobs
+    os.makedirs(tmp_path / "rxn1" / "refine_structures" / "energy_calculation")
+    (tmp_path / "rxn1" / "refine_structures" / "energy_calculation" / "energy_fwd.out").write_text("partial")
+    old = time.time() - 120
+    os.utime(claimed, (old, old))
+    workqueue.release_stale(queue, lease_timeout=60)
+
+    claimed = workqueue.claim(queue, "node2-1")
+    with open(claimed, "r") as f:
+        spec = json.load(f)
+    assert spec["released"] == 1
+
+    workqueue.run_task(spec)
+    assert os.path.exists(tmp_path / "rxn1" / "refine_structures" / "energy.yaml")
+
+
+def test_work(tmp_path, monkeypatch):
+    queue = str(tmp_path / "queue")
+    workqueue.enqueue(queue, "ts2rxn", ["a.yaml", "b.yaml", "c.yaml"], folder=str(tmp_path))
+
+    def run_task(spec):
+        if spec["config"].endswith("b.yaml"):
+            raise Exception("TS Relaxation did not converge")
+    monkeypatch.setattr(workqueue, "run_task", run_task)
+
+    assert workqueue.work(queue, heartbeat=0.01) == {"done": 2, "failed": 1}
+    assert workqueue.queue_counts(queue)["done"] == 2